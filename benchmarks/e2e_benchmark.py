@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark against the local mock Glassdoor server (no network access needed)
+Usage:
+  python benchmarks/e2e_benchmark.py --urls 10 --mode single batch
+  python benchmarks/e2e_benchmark.py --urls 50 --mode batch --parse-workers 4 --latency 0.3 --challenge-rate 0.05
+
+Needs Chrome and the scraper's dependencies installed. Outputs go to a temp folder that is removed afterwards.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCHMARK_DIR), 'code'))
+
+from mock_glassdoor_server import MockGlassdoorServer, MockServerConfig, DEFAULT_EMPLOYERS, interview_path
+from rate_limiter import AdaptiveRateLimiter
+from browser_session import BrowserSessionStore
+
+def benchmark_urls(count, pages):
+    """Real-looking Glassdoor URLs; the scraper's base-URL override sends them to the mock server"""
+    urls = []
+    for page_number in range(1, pages + 1):
+        for company, employer_id, positions in DEFAULT_EMPLOYERS:
+            for position in positions:
+                urls.append('https://www.glassdoor.com' + interview_path(company, employer_id, position, page_number))
+                if len(urls) == count:
+                    return urls
+    return urls
+
+def make_scraper(base_dir, base_url, args):
+    from universal_interview_scraper import UniversalInterviewScraper
+
+    # The limiter is opened up so the benchmark measures the pipeline, not our politeness delays
+    rate_limiter = AdaptiveRateLimiter(initial_rate=args.rate, max_rate=args.rate, min_rate=args.rate / 10,
+                                       base_backoff=args.challenge_backoff, max_backoff=args.challenge_backoff)
+    session_store = BrowserSessionStore(os.path.join(base_dir, 'scraped_data', 'browser_sessions.json'))
+    return UniversalInterviewScraper(rate_limiter=rate_limiter, render_wait=args.render_wait, base_dir=base_dir,
+                                     session_store=session_store, base_url=base_url)
+
+def run_single(urls, base_url, base_dir, args):
+    """scrape_and_generate_docx once per URL, each with its own browser (like run_scraper.py)"""
+    from scrape_any_link import scrape_and_generate_docx
+
+    succeeded = 0
+    for url in urls:
+        scraper = make_scraper(base_dir, base_url, args)
+        if scrape_and_generate_docx(url, scraper=scraper):
+            succeeded += 1
+    return succeeded
+
+def run_batch(urls, base_url, base_dir, args):
+    """One browser fetching every URL, parse workers, then JSON and DOCX per shard"""
+    scraper = make_scraper(base_dir, base_url, args)
+    try:
+        if not scraper.setup_driver():
+            print("❌ Failed to setup Chrome driver")
+            return 0
+
+        results = scraper.scrape_urls(urls, parse_workers=args.parse_workers)
+        for json_file in scraper.save_shards().values():
+            scraper.process_and_generate_docx(json_file)
+        return sum(1 for result in results if result)
+    finally:
+        scraper.close()
+
+MODES = {
+    'single': run_single,
+    'batch': run_batch
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end throughput against the mock Glassdoor server')
+    parser.add_argument('--mode', nargs='+', choices=sorted(MODES), default=['batch'])
+    parser.add_argument('--urls', type=int, default=10, help='Number of interview URLs to scrape')
+    parser.add_argument('--reviews-per-page', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=5, help='Result pages per position')
+    parser.add_argument('--latency', type=float, default=0.1, help='Server latency per response (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--padding-kb', type=int, default=0)
+    parser.add_argument('--challenge-rate', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--parse-workers', type=int, default=0, help='Parse worker processes for batch mode')
+    parser.add_argument('--rate', type=float, default=50.0, help='Requests per second allowed by the limiter')
+    parser.add_argument('--challenge-backoff', type=float, default=0.5)
+    parser.add_argument('--render-wait', type=float, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = MockServerConfig(args.reviews_per_page, args.pages, args.latency, args.jitter, args.padding_kb,
+                              args.challenge_rate, args.error_rate, seed=args.seed)
+    urls = benchmark_urls(args.urls, args.pages)
+    rows = []
+
+    with MockGlassdoorServer(config=config) as server:
+        print(f"🧪 Mock Glassdoor on {server.base_url}; {len(urls)} URLs")
+        for mode in args.mode:
+            base_dir = tempfile.mkdtemp(prefix=f'glassdoor_e2e_{mode}_')
+            before = server.stats_snapshot()
+            started = time.perf_counter()
+            try:
+                succeeded = MODES[mode](urls, server.base_url, base_dir, args)
+            finally:
+                elapsed = time.perf_counter() - started
+                shutil.rmtree(base_dir, ignore_errors=True)
+
+            after = server.stats_snapshot()
+            served = {key: after.get(key, 0) - before.get(key, 0) for key in ('pages', 'challenges', 'errors')}
+            rows.append((mode, succeeded, elapsed, served))
+
+    print(f"\n{'mode':8} {'ok':>5} {'seconds':>9} {'pages/s':>8} {'served':>7} {'challenges':>11} {'errors':>7}")
+    for mode, succeeded, elapsed, served in rows:
+        print(f"{mode:8} {succeeded:5} {elapsed:9.1f} {succeeded / elapsed if elapsed else 0:8.2f} "
+              f"{served['pages']:7} {served['challenges']:11} {served['errors']:7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmarks against synthetic Glassdoor-like pages
+Usage:
+  python benchmarks/run_benchmarks.py                 # compare against benchmarks/baselines.json
+  python benchmarks/run_benchmarks.py --record        # record new baselines on this machine
+  python benchmarks/run_benchmarks.py --sizes 10 100 --only questions qa
+
+Exits 1 when a benchmark is slower than its baseline by more than --tolerance.
+Baselines are machine-specific; record them on the machine that runs the comparison.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(BENCHMARK_DIR), 'code'))
+
+from synthetic_pages import generate_reviews, render_interview_page, build_page_record, review_text
+
+DEFAULT_BASELINES = os.path.join(BENCHMARK_DIR, 'baselines.json')
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+SYNTHETIC_URL = 'https://www.glassdoor.com/Interview/Tesla-Software-Engineer-Interview-Questions-EI_IE43129.0,5_KO6,23.htm'
+
+def time_call(function, repeat):
+    """Run function repeat times; returns (median seconds, min seconds, last result)"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), min(timings), result
+
+def bench_experiences(reviews, workdir, repeat):
+    """InterviewPageParser.extract_interview_experiences on a pre-parsed page"""
+    from bs4 import BeautifulSoup
+    from interview_page_parser import InterviewPageParser
+
+    parser = InterviewPageParser()
+    html = render_interview_page(reviews)
+
+    # Parse outside the timed region so only extraction is measured
+    timings = []
+    result = []
+    for _ in range(repeat):
+        soup = BeautifulSoup(html, 'html.parser')
+        started = time.perf_counter()
+        result = parser.extract_interview_experiences(soup)
+        timings.append(time.perf_counter() - started)
+        soup.decompose()
+    return statistics.median(timings), min(timings), len(result)
+
+def bench_questions(reviews, workdir, repeat):
+    """InterviewPageParser.extract_questions_from_text over every review's text"""
+    from interview_page_parser import InterviewPageParser
+
+    parser = InterviewPageParser()
+    texts = [review_text(review) for review in reviews]
+    median, minimum, result = time_call(lambda: [parser.extract_questions_from_text(text) for text in texts], repeat)
+    return median, minimum, sum(len(questions) for questions in result)
+
+def bench_qa(reviews, workdir, repeat):
+    """SmartQAExtractor.extract_questions_and_answers on the matching scraped JSON"""
+    from smart_qa_extractor import SmartQAExtractor
+
+    json_path = os.path.join(workdir, f'interview_data_{len(reviews)}.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump([build_page_record(reviews, SYNTHETIC_URL)], f)
+
+    def run():
+        return SmartQAExtractor(json_path).extract_questions_and_answers()
+
+    median, minimum, result = time_call(run, repeat)
+    return median, minimum, len(result)
+
+def bench_qa_cached(reviews, workdir, repeat):
+    """extract_questions_and_answers again with a warm Q&A cache, as re-renders and replays run"""
+    from smart_qa_extractor import SmartQAExtractor, PATTERN_SET_VERSION
+    from qa_cache import QACache
+
+    json_path = os.path.join(workdir, f'interview_data_{len(reviews)}.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump([build_page_record(reviews, SYNTHETIC_URL)], f)
+    cache = QACache(os.path.join(workdir, f'qa_cache_{len(reviews)}.sqlite3'), PATTERN_SET_VERSION)
+    SmartQAExtractor(json_path, cache=cache).extract_questions_and_answers()
+
+    def run():
+        return SmartQAExtractor(json_path, cache=cache).extract_questions_and_answers()
+
+    median, minimum, result = time_call(run, repeat)
+    return median, minimum, len(result)
+
+def bench_docx(reviews, workdir, repeat):
+    """generate_docx_from_qa on the extracted Q&A pairs"""
+    from smart_qa_extractor import SmartQAExtractor
+    from docx_generator import generate_docx_from_qa
+
+    json_path = os.path.join(workdir, f'interview_data_{len(reviews)}.json')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump([build_page_record(reviews, SYNTHETIC_URL)], f)
+    qa_pairs = SmartQAExtractor(json_path).extract_questions_and_answers(tag_topics=True)
+
+    output_dir = os.path.join(workdir, f'docx_{len(reviews)}')
+    median, minimum, _ = time_call(lambda: generate_docx_from_qa(qa_pairs, 'Tesla', 'Software Engineer', output_dir), repeat)
+    return median, minimum, len(qa_pairs)
+
+BENCHMARKS = {
+    'experiences': bench_experiences,
+    'questions': bench_questions,
+    'qa': bench_qa,
+    'qa_cached': bench_qa_cached,
+    'docx': bench_docx
+}
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction against synthetic interview pages')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Reviews per page')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per benchmark (median is compared)')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='Allowed slowdown factor before failing')
+    parser.add_argument('--baselines', default=DEFAULT_BASELINES)
+    parser.add_argument('--record', action='store_true', help='Record these results as the new baselines')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baselines)
+    results = {}
+    regressions = []
+    workdir = tempfile.mkdtemp(prefix='glassdoor_bench_')
+
+    print(f"{'benchmark':12} {'reviews':>8} {'median ms':>11} {'min ms':>9} {'items':>7} {'baseline ms':>12} {'ratio':>7}")
+    try:
+        for size in args.sizes:
+            reviews = generate_reviews(size, seed=args.seed)
+            for name in args.only or BENCHMARKS:
+                # Fewer repeats at the largest sizes keep the suite runnable
+                repeat = max(1, args.repeat if size <= 1000 else args.repeat // 3)
+                median, minimum, items = BENCHMARKS[name](reviews, workdir, repeat)
+                results.setdefault(name, {})[str(size)] = median
+
+                baseline = baselines.get('results', {}).get(name, {}).get(str(size))
+                ratio = median / baseline if baseline else None
+                if ratio and ratio > args.tolerance:
+                    regressions.append((name, size, ratio))
+
+                print(f"{name:12} {size:8} {median * 1000:11.2f} {minimum * 1000:9.2f} {items:7} "
+                      f"{baseline * 1000 if baseline else float('nan'):12.2f} "
+                      f"{ratio if ratio else float('nan'):7.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.record:
+        recorded = baselines.get('results', {})
+        for name, sizes in results.items():
+            recorded.setdefault(name, {}).update(sizes)
+        with open(args.baselines, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine': platform.node(),
+                'python': platform.python_version(),
+                'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': recorded
+            }, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baselines recorded in {args.baselines}")
+        return
+
+    if not baselines:
+        print(f"\nℹ️  No baselines at {args.baselines}; run with --record to create them")
+        return
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.2f}x:")
+        for name, size, ratio in regressions:
+            print(f"   {name} @ {size} reviews: {ratio:.2f}x baseline")
+        sys.exit(1)
+
+    print(f"\n✅ No regressions beyond {args.tolerance:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import json
+import os
+import sys
+import time
+import argparse
+import threading
+from urllib.parse import urlparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint_store import atomic_write_json
+
+# Cookies that carry a solved bot-protection challenge
+CLEARANCE_COOKIES = ['cf_clearance', '__cf_bm', 'datadome', 'GSESSIONID']
+
+LOCAL_STORAGE_SCRIPT = "return Object.assign({}, window.localStorage);"
+
+RESTORE_STORAGE_TEMPLATE = """
+(function() {
+    if (window.location.hostname !== %s) { return; }
+    var items = %s;
+    for (var key in items) {
+        if (window.localStorage.getItem(key) === null) { window.localStorage.setItem(key, items[key]); }
+    }
+})();
+"""
+
+class BrowserSessionStore:
+    """Persists cookies and localStorage from browsers that got past the challenge, per host"""
+
+    def __init__(self, session_path=None, refresh_margin=900):
+        if not session_path:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            session_path = os.path.join(base_dir, 'scraped_data', 'browser_sessions.json')
+
+        self.session_path = session_path
+        self.refresh_margin = refresh_margin
+        # Browser worker threads share one store; the lock guards sessions and the file
+        self.lock = threading.RLock()
+        self.sessions = self.load()
+
+    def load(self):
+        """Load saved sessions"""
+        if not os.path.exists(self.session_path):
+            return {}
+
+        try:
+            with open(self.session_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def write(self):
+        """Write sessions atomically; cookies are credentials, so keep the file private"""
+        with self.lock:
+            atomic_write_json(self.session_path, self.sessions)
+            os.chmod(self.session_path, 0o600)
+
+    def host_key(self, url):
+        return urlparse(url).netloc.lower()
+
+    def session_expiry(self, cookies):
+        """Get when a session stops being useful: the earliest clearance cookie expiry"""
+        clearance = [c['expiry'] for c in cookies if c.get('name') in CLEARANCE_COOKIES and c.get('expiry')]
+        if clearance:
+            return min(clearance)
+
+        expiring = [c['expiry'] for c in cookies if c.get('expiry')]
+        return min(expiring) if expiring else None
+
+    def clearance_fingerprint(self, cookies):
+        return sorted((c.get('name'), c.get('value')) for c in cookies if c.get('name') in CLEARANCE_COOKIES)
+
+    def save(self, driver, url):
+        """Capture cookies, localStorage and user agent from a browser that loaded a real page"""
+        cookies = driver.get_cookies()
+        try:
+            local_storage = driver.execute_script(LOCAL_STORAGE_SCRIPT) or {}
+        except Exception:
+            local_storage = {}
+
+        session = {
+            'cookies': cookies,
+            'local_storage': local_storage,
+            'user_agent': driver.execute_script("return navigator.userAgent;"),
+            'saved_at': time.time(),
+            'expires_at': self.session_expiry(cookies)
+        }
+        with self.lock:
+            self.sessions[self.host_key(url)] = session
+            self.write()
+
+    def save_if_changed(self, driver, url):
+        """Save when the clearance cookies changed or the stored session is close to expiring"""
+        session = self.sessions.get(self.host_key(url))
+        cookies = driver.get_cookies()
+
+        if (session and not self.needs_refresh(url)
+                and self.clearance_fingerprint(session['cookies']) == self.clearance_fingerprint(cookies)):
+            return False
+
+        self.save(driver, url)
+        return True
+
+    def is_valid(self, url):
+        """Check whether a saved session exists and hasn't expired"""
+        session = self.sessions.get(self.host_key(url))
+        if not session:
+            return False
+
+        expires_at = session.get('expires_at')
+        return expires_at is None or expires_at > time.time()
+
+    def needs_refresh(self, url):
+        """Check whether a session is missing or expires within the refresh margin"""
+        session = self.sessions.get(self.host_key(url))
+        if not session:
+            return True
+
+        expires_at = session.get('expires_at')
+        return expires_at is not None and expires_at - time.time() < self.refresh_margin
+
+    def get_cookies(self, url):
+        """Get saved, unexpired cookies for a host (used by plain HTTP clients too)"""
+        session = self.sessions.get(self.host_key(url))
+        if not session or not self.is_valid(url):
+            return []
+
+        now = time.time()
+        return [c for c in session['cookies'] if not c.get('expiry') or c['expiry'] > now]
+
+    def get_user_agent(self, url):
+        session = self.sessions.get(self.host_key(url))
+        return session.get('user_agent') if session else None
+
+    def restore(self, driver):
+        """Load every valid saved session into a new driver before its first navigation"""
+        restored = []
+        driver.execute_cdp_cmd('Network.enable', {})
+
+        with self.lock:
+            sessions = list(self.sessions.items())
+        for host, session in sessions:
+            origin = f'https://{host}'
+            if not self.is_valid(origin):
+                continue
+
+            # CDP sets cookies without first having to navigate to the domain
+            for cookie in self.get_cookies(origin):
+                params = {
+                    'name': cookie['name'],
+                    'value': cookie['value'],
+                    'domain': cookie.get('domain', host),
+                    'path': cookie.get('path', '/'),
+                    'secure': cookie.get('secure', False),
+                    'httpOnly': cookie.get('httpOnly', False)
+                }
+                if cookie.get('expiry'):
+                    params['expires'] = cookie['expiry']
+                if cookie.get('sameSite'):
+                    params['sameSite'] = cookie['sameSite']
+                driver.execute_cdp_cmd('Network.setCookie', params)
+
+            # localStorage is per origin, so seed it as each document starts loading
+            if session.get('local_storage'):
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': RESTORE_STORAGE_TEMPLATE % (json.dumps(host), json.dumps(session['local_storage']))
+                })
+
+            restored.append(host)
+
+        return restored
+
+    def status(self):
+        """Summarize saved sessions and their remaining lifetime"""
+        now = time.time()
+        summary = {}
+        with self.lock:
+            sessions = list(self.sessions.items())
+        for host, session in sessions:
+            expires_at = session.get('expires_at')
+            summary[host] = {
+                'cookies': len(session.get('cookies', [])),
+                'saved_at': session.get('saved_at'),
+                'expires_in': None if expires_at is None else expires_at - now,
+                'needs_refresh': self.needs_refresh(f'https://{host}')
+            }
+        return summary
+
+def main():
+    parser = argparse.ArgumentParser(description='Show or clear saved browser sessions')
+    parser.add_argument('--sessions', help='Session file (default: scraped_data/browser_sessions.json)')
+    parser.add_argument('--clear', action='store_true', help='Forget all saved sessions')
+    args = parser.parse_args()
+
+    store = BrowserSessionStore(args.sessions)
+    if args.clear:
+        store.sessions = {}
+        store.write()
+        print("🧹 Cleared saved browser sessions")
+        return
+
+    status = store.status()
+    if not status:
+        print("No saved browser sessions")
+        return
+
+    for host, info in status.items():
+        expires = 'session' if info['expires_in'] is None else f"{info['expires_in'] / 60:.0f} min"
+        flag = ' (refresh due)' if info['needs_refresh'] else ''
+        print(f"{host}: {info['cookies']} cookies, expires in {expires}{flag}")
+
+if __name__ == "__main__":
+    main()
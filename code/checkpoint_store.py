@@ -0,0 +1,89 @@
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def atomic_write_json(filepath, data, indent=2):
+    """Write JSON to a temp file in the same folder and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return filepath
+
+class CheckpointStore:
+    """Append-only JSON Lines log of scraped pages, flushed to disk after every page"""
+
+    def __init__(self, checkpoint_path):
+        self.checkpoint_path = checkpoint_path
+        os.makedirs(os.path.dirname(os.path.abspath(checkpoint_path)), exist_ok=True)
+        self.terminate_partial_line()
+
+    def terminate_partial_line(self):
+        """Make sure records appended after a crash don't merge into a truncated line"""
+        if not os.path.exists(self.checkpoint_path) or os.path.getsize(self.checkpoint_path) == 0:
+            return
+
+        with open(self.checkpoint_path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def append(self, page_data):
+        """Write one page record through to disk"""
+        line = json.dumps(page_data, ensure_ascii=False)
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def iter_pages(self):
+        """Stream every complete page record from the log"""
+        if not os.path.exists(self.checkpoint_path):
+            return
+
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves a truncated last line; skip it
+                    continue
+
+    def load(self):
+        """Replay every complete page record from the log"""
+        return list(self.iter_pages())
+
+    def compact(self):
+        """Rewrite the log without truncated lines or duplicate URLs (keeping each URL's latest record)"""
+        latest = {}
+        for page in self.iter_pages():
+            latest[page.get('url')] = page
+
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.jsonl')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for page in latest.values():
+                f.write(json.dumps(page, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+        return len(latest)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Shared crawl queue for running scrape workers on several processes or hosts
+Usage:
+  python crawl_queue.py enqueue <url> [<url> ...]
+  python crawl_queue.py work
+  python crawl_queue.py status
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_registry import page_key
+
+DEFAULT_QUEUE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'crawl_queue.sqlite3'
+)
+
+class CrawlQueue:
+    """SQLite-backed work queue with visibility-timeout leases, attempt caps and deduplication"""
+
+    def __init__(self, queue_path=DEFAULT_QUEUE_PATH, max_attempts=3, retry_delay=60):
+        self.queue_path = queue_path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        os.makedirs(os.path.dirname(os.path.abspath(queue_path)), exist_ok=True)
+        self.setup_schema()
+
+    def connect(self):
+        """Open a connection; writers serialize on the database lock"""
+        connection = sqlite3.connect(self.queue_path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def setup_schema(self):
+        """Create the jobs table"""
+        connection = self.connect()
+        try:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    dedupe_key TEXT NOT NULL UNIQUE,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    last_error TEXT,
+                    result TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, id);
+            """)
+        finally:
+            connection.close()
+
+    def enqueue(self, url, dedupe_key=None, priority=0, max_attempts=None):
+        """Add a URL unless an equivalent job already exists; returns True if it was added
+
+        By default URL variants of the same employer/position page (other slugs, hosts or
+        query strings) share one dedupe key, so they become a single job.
+        """
+        now = datetime.now().isoformat()
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                """INSERT OR IGNORE INTO jobs (url, dedupe_key, priority, max_attempts, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (url, dedupe_key or page_key(url), priority, max_attempts or self.max_attempts, now, now)
+            )
+            return cursor.rowcount == 1
+        finally:
+            connection.close()
+
+    def lease(self, worker_id, visibility_timeout=900):
+        """Claim the next ready job until the lease expires; returns the job or None"""
+        now = time.time()
+        connection = self.connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+
+            # Leases that expired on their last allowed attempt are dead, not retried
+            connection.execute(
+                """UPDATE jobs SET status = 'dead', last_error = 'lease expired', lease_owner = NULL, updated_at = ?
+                   WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts""",
+                (datetime.now().isoformat(), now)
+            )
+
+            row = connection.execute(
+                """SELECT * FROM jobs
+                   WHERE (status = 'queued' AND available_at <= ?)
+                      OR (status = 'leased' AND lease_expires < ?)
+                   ORDER BY priority DESC, id
+                   LIMIT 1""",
+                (now, now)
+            ).fetchone()
+
+            if not row:
+                connection.execute("COMMIT")
+                return None
+
+            connection.execute(
+                """UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                                   lease_expires = ?, updated_at = ?
+                   WHERE id = ?""",
+                (worker_id, now + visibility_timeout, datetime.now().isoformat(), row['id'])
+            )
+            connection.execute("COMMIT")
+
+            job = dict(row)
+            job['attempts'] += 1
+            return job
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+    def extend_lease(self, job_id, worker_id, visibility_timeout=900):
+        """Push a held lease's expiry out; returns False if the lease was lost"""
+        return self.update_owned(
+            job_id, worker_id, "lease_expires = ?", (time.time() + visibility_timeout,)
+        )
+
+    def complete(self, job_id, worker_id, result=None):
+        """Mark a leased job done and store its result (e.g. output paths)"""
+        return self.update_owned(
+            job_id, worker_id, "status = 'done', lease_owner = NULL, result = ?",
+            (json.dumps(result) if result is not None else None,)
+        )
+
+    def fail(self, job_id, worker_id, error):
+        """Release a leased job for retry, or mark it dead once its attempts are used up"""
+        return self.update_owned(
+            job_id, worker_id,
+            """status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+               lease_owner = NULL, last_error = ?, available_at = ?""",
+            (str(error), time.time() + self.retry_delay)
+        )
+
+    def update_owned(self, job_id, worker_id, assignments, params):
+        """Update a job only while this worker still holds its lease"""
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                params + (datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+        finally:
+            connection.close()
+
+    def requeue_dead(self):
+        """Give dead jobs a fresh set of attempts"""
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, available_at = 0, updated_at = ? WHERE status = 'dead'",
+                (datetime.now().isoformat(),)
+            )
+            return cursor.rowcount
+        finally:
+            connection.close()
+
+    def release_owned(self, owner_prefix):
+        """Put jobs leased by workers whose ID starts with owner_prefix back in the queue (e.g. after a restart)
+
+        The interrupted attempt isn't counted against the job.
+        """
+        connection = self.connect()
+        try:
+            cursor = connection.execute(
+                """UPDATE jobs SET status = 'queued', lease_owner = NULL, available_at = 0,
+                                   attempts = MAX(attempts - 1, 0), updated_at = ?
+                   WHERE status = 'leased' AND substr(lease_owner, 1, ?) = ?""",
+                (datetime.now().isoformat(), len(owner_prefix), owner_prefix)
+            )
+            return cursor.rowcount
+        finally:
+            connection.close()
+
+    def get_job(self, job_id):
+        """Get one job by ID"""
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            connection.close()
+
+    def find_job(self, dedupe_key):
+        """Get a job by its deduplication key"""
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT * FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            connection.close()
+
+    def counts(self):
+        """Count jobs by status"""
+        connection = self.connect()
+        try:
+            return {row['status']: row['total'] for row in connection.execute(
+                "SELECT status, COUNT(*) AS total FROM jobs GROUP BY status"
+            )}
+        finally:
+            connection.close()
+
+class LeaseHeartbeat:
+    """Keeps extending a job's lease while it runs, so slow pages and rate-limiter back-off
+    don't let the lease expire and hand the job to a second worker"""
+
+    def __init__(self, queue, job_id, worker_id, visibility_timeout=900):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.visibility_timeout = visibility_timeout
+        self.interval = max(visibility_timeout / 3, 1)
+        self.lost = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f'lease-heartbeat-{job_id}', daemon=True)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                if not self.queue.extend_lease(self.job_id, self.worker_id, self.visibility_timeout):
+                    self.lost = True
+                    return
+            except sqlite3.Error:
+                # A busy database only delays this extension; the lease has time left
+                continue
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_event.set()
+        self.thread.join()
+
+def run_worker(queue, worker_id, store_dir=None, visibility_timeout=900, max_jobs=None, idle_exit=None,
+               restart_after=2):
+    """Lease jobs, scrape them with one browser and write results to the shared store
+
+    Chrome is restarted when it stops answering or after restart_after failed jobs in a row,
+    so a crashed browser doesn't burn through the attempts of every job it leases.
+    """
+    from universal_interview_scraper import UniversalInterviewScraper
+    from rate_limiter import SharedRateLimiter
+
+    # Every worker on the store paces the site through one shared token bucket per host
+    data_dir = os.path.join(store_dir, 'scraped_data') if store_dir else os.path.dirname(DEFAULT_QUEUE_PATH)
+    rate_limiter = SharedRateLimiter(os.path.join(data_dir, 'rate_limits.sqlite3'))
+    scraper = UniversalInterviewScraper(base_dir=store_dir, rate_limiter=rate_limiter)
+    processed = 0
+    consecutive_failures = 0
+    idle_since = time.time()
+
+    try:
+        if not scraper.setup_driver():
+            print("❌ Failed to setup Chrome driver")
+            return processed
+
+        while max_jobs is None or processed < max_jobs:
+            if consecutive_failures >= restart_after or not scraper.driver_alive():
+                print(f"🔄 [{worker_id}] Restarting Chrome ({consecutive_failures} failed job(s) in a row)")
+                if not scraper.restart_driver():
+                    print(f"❌ [{worker_id}] Chrome failed to restart; stopping before leasing more jobs")
+                    break
+                consecutive_failures = 0
+
+            job = queue.lease(worker_id, visibility_timeout)
+            if not job:
+                if idle_exit is not None and time.time() - idle_since > idle_exit:
+                    break
+                time.sleep(5)
+                continue
+
+            idle_since = time.time()
+            print(f"🔗 [{worker_id}] Job {job['id']} (attempt {job['attempts']}/{job['max_attempts']}): {job['url']}")
+
+            try:
+                with LeaseHeartbeat(queue, job['id'], worker_id, visibility_timeout) as heartbeat:
+                    data = scraper.scrape_interview_page(job['url'])
+                    if not data:
+                        raise RuntimeError("scrape returned no data")
+
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    saved_files = scraper.save_shards(f'interview_data_{timestamp}_{worker_id}_{job["id"]}.json')
+                    scraper.clear_pages()
+
+                if heartbeat.lost or not queue.complete(job['id'], worker_id, list(saved_files.values())):
+                    print(f"⚠️  [{worker_id}] Lease on job {job['id']} was lost before completion")
+                else:
+                    print(f"✅ [{worker_id}] Job {job['id']} done: {data['total_interviews']} experiences")
+                consecutive_failures = 0
+            except Exception as e:
+                scraper.clear_pages()
+                queue.fail(job['id'], worker_id, e)
+                consecutive_failures += 1
+                print(f"❌ [{worker_id}] Job {job['id']} failed: {e}")
+
+            processed += 1
+    finally:
+        scraper.close()
+
+    return processed
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared crawl queue for distributed scraping')
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help='Queue database path (shared by all workers)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Add URLs to the queue')
+    enqueue_parser.add_argument('urls', nargs='*', help='Glassdoor interview URLs')
+    enqueue_parser.add_argument('--file', help='File with one URL per line')
+    enqueue_parser.add_argument('--priority', type=int, default=0)
+    enqueue_parser.add_argument('--max-attempts', type=int, default=3)
+
+    work_parser = subparsers.add_parser('work', help='Run a worker that scrapes queued URLs')
+    work_parser.add_argument('--worker-id', default=f'{socket.gethostname()}-{os.getpid()}')
+    work_parser.add_argument('--store', help='Shared output root (default: this checkout)')
+    work_parser.add_argument('--visibility-timeout', type=int, default=900, help='Lease length in seconds')
+    work_parser.add_argument('--max-jobs', type=int, help='Stop after this many jobs')
+    work_parser.add_argument('--idle-exit', type=int, help='Stop after this many idle seconds')
+    work_parser.add_argument('--restart-after', type=int, default=2,
+                             help='Restart Chrome after this many failed jobs in a row')
+    work_parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this local port')
+
+    subparsers.add_parser('status', help='Show job counts by status')
+    subparsers.add_parser('requeue-dead', help='Retry jobs that used up their attempts')
+
+    args = parser.parse_args()
+    queue = CrawlQueue(args.queue)
+
+    if args.command == 'enqueue':
+        urls = list(args.urls)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                urls.extend(line.strip() for line in f if line.strip())
+
+        # Variants of one page collapse here, before any of them costs a queue insert
+        from url_canonicalizer import UrlFrontier
+        frontier = UrlFrontier(capacity=max(len(urls), 1000))
+        added = sum(1 for url in frontier.filter(urls)
+                    if queue.enqueue(url, priority=args.priority, max_attempts=args.max_attempts))
+        print(f"📥 Enqueued {added} new URL(s), skipped {len(urls) - added - frontier.stats['invalid']} duplicate(s)"
+              f" and {frontier.stats['invalid']} non-interview URL(s)")
+
+    elif args.command == 'work':
+        if args.metrics_port:
+            from metrics import start_metrics_server, watch_queue
+            watch_queue(queue)
+            start_metrics_server(args.metrics_port)
+        processed = run_worker(queue, args.worker_id, args.store, args.visibility_timeout,
+                               args.max_jobs, args.idle_exit, args.restart_after)
+        print(f"🏁 Worker {args.worker_id} processed {processed} job(s)")
+
+    elif args.command == 'status':
+        counts = queue.counts()
+        for status in ['queued', 'leased', 'done', 'dead']:
+            print(f"{status:>7}: {counts.get(status, 0)}")
+
+    elif args.command == 'requeue-dead':
+        print(f"♻️  Requeued {queue.requeue_dead()} dead job(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Company-wide discovery crawl: every position interview page of one employer in one command
+Usage:
+  python discovery_crawler.py "https://www.glassdoor.com/Interview/Tesla-Interview-Questions-E43129.htm" [--browsers 2]
+  python discovery_crawler.py 43129 --company Tesla [--max-positions 20] [--min-reviews 50]
+  python discovery_crawler.py <employer url> --enqueue-to /shared/crawl_queue.sqlite3
+
+The employer's interview landing pages (-E<id>.htm, -E<id>_P2.htm, ...) list links to its
+position pages (EI_IE<id>..._KO...htm) with interview counts. Landing pages and position pages
+share one priority queue worked by a fixed number of browsers: landing pages go first, and
+positions with the most interviews are fetched next, so scraping starts while later landing
+pages are still being discovered. Positions are deduplicated through a UrlFrontier, which records
+a position only once it has been scraped or enqueued.
+"""
+
+import os
+import re
+import sys
+import time
+import queue
+import argparse
+import itertools
+import threading
+from datetime import datetime
+from html import unescape
+from urllib.parse import urljoin
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_registry import COMPANY_URL_PATTERN, parse_entity_url
+from url_canonicalizer import CANONICAL_ORIGIN, UrlFrontier, canonicalize_url
+
+# Any anchor; position and landing links are told apart by parse_entity_url
+ANCHOR_PATTERN = re.compile(r'<a\b[^>]*?\bhref\s*=\s*["\'](?P<href>[^"\']+)["\'][^>]*>(?P<text>.*?)</a>',
+                            re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# "1,234 interviews", "1.2k Interviews", "(56 interview reviews)"
+COUNT_PATTERN = re.compile(r'(?P<count>\d[\d,]*(?:\.\d+)?)\s*(?P<thousands>[kK])?\+?\s*(?:interview|review)',
+                           re.IGNORECASE)
+
+# How much markup after a link can hold its count before the next link starts
+COUNT_WINDOW = 600
+
+LANDING_PRIORITY = 0
+POSITION_PRIORITY = 1
+
+def parse_count(text):
+    """Interview count from '1,234 interviews' or '1.2k interviews', or None"""
+    match = COUNT_PATTERN.search(text)
+    if not match:
+        return None
+    count = float(match.group('count').replace(',', ''))
+    return int(count * 1000) if match.group('thousands') else int(count)
+
+def landing_url(employer_id, company, page_number=1):
+    """Interview landing page of an employer, e.g. .../Interview/Tesla-Interview-Questions-E43129.htm"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', company).strip('-') or 'Company'
+    suffix = '' if page_number == 1 else f'_P{page_number}'
+    return f"{CANONICAL_ORIGIN}/Interview/{slug}-Interview-Questions-E{employer_id}{suffix}.htm"
+
+def landing_url_for(target, company=None):
+    """Landing page for an employer URL (landing or position page) or a bare employer ID"""
+    target = str(target).strip()
+    if target.isdigit():
+        if not company:
+            raise ValueError("A bare employer ID needs the company name (--company)")
+        return landing_url(int(target), company)
+
+    parsed = parse_entity_url(target)
+    if not parsed:
+        raise ValueError(f"No employer ID in {target}")
+    return landing_url(parsed['employer_id'], company or parsed['company'] or '')
+
+def discover_links(page_source, page_url, employer_id):
+    """Position pages and further landing pages linked from an employer's landing page
+
+    Returns (positions, landing_pages): positions as {'url', 'position', 'review_count'} dicts
+    (review_count is None when the page shows none) and landing page URLs, both limited to
+    this employer and deduplicated within the page.
+    """
+    positions = {}
+    landing_pages = []
+    anchors = list(ANCHOR_PATTERN.finditer(page_source))
+
+    for index, anchor in enumerate(anchors):
+        url = urljoin(page_url, unescape(anchor.group('href')))
+        parsed = parse_entity_url(url)
+        if not parsed or parsed['employer_id'] != employer_id:
+            continue
+
+        if not parsed['position']:
+            if COMPANY_URL_PATTERN.search(url) and url not in landing_pages:
+                landing_pages.append(url)
+            continue
+        if parsed['page'] > 1:
+            # A position's later result pages aren't positions of their own
+            continue
+
+        canonical = canonicalize_url(url)
+        if not canonical:
+            continue
+
+        # The count sits in the link text or in the markup between this link and the next one
+        window_end = anchors[index + 1].start() if index + 1 < len(anchors) else len(page_source)
+        window = anchor.group('text') + ' ' + page_source[anchor.end():min(window_end, anchor.end() + COUNT_WINDOW)]
+        review_count = parse_count(TAG_PATTERN.sub(' ', window))
+
+        known = positions.get(canonical)
+        if known is None or (review_count or 0) > (known['review_count'] or 0):
+            positions[canonical] = {'url': canonical, 'position': parsed['position'], 'review_count': review_count}
+
+    return list(positions.values()), landing_pages
+
+class DiscoveryWorker(threading.Thread):
+    """Owns one browser and works the crawler's shared queue until it drains"""
+
+    def __init__(self, crawler, index):
+        super().__init__(name=f'discovery-worker-{index}', daemon=True)
+        self.crawler = crawler
+        self.index = index
+        self.scraper = None
+
+    def run(self):
+        crawler = self.crawler
+        self.scraper = crawler.create_scraper(self.index)
+        if not self.scraper.setup_driver():
+            print(f"❌ [worker {self.index}] Chrome failed to start")
+            return
+
+        while not crawler.stop_event.is_set():
+            try:
+                _, _, _, task = crawler.tasks.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                if task['kind'] == 'landing':
+                    crawler.process_landing(self.scraper, task)
+                else:
+                    crawler.process_position(self.scraper, task)
+            except Exception as e:
+                crawler.retry(task, e)
+            finally:
+                crawler.task_done()
+
+class DiscoveryCrawler:
+    """Discovers an employer's position pages and scrapes them with a fixed number of browsers"""
+
+    def __init__(self, create_scraper, browsers=2, frontier=None, max_positions=None, min_reviews=0,
+                 max_attempts=3, crawl_queue=None, parse_pool=None):
+        self.create_scraper = create_scraper
+        self.browsers = browsers
+        self.frontier = frontier or UrlFrontier()
+        self.max_positions = max_positions
+        self.min_reviews = min_reviews
+        self.max_attempts = max_attempts
+        # With a crawl queue, positions are enqueued for its workers instead of scraped here
+        self.crawl_queue = crawl_queue
+        self.parse_pool = parse_pool
+
+        self.tasks = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.outstanding = 0
+        self.drained = threading.Event()
+        self.stop_event = threading.Event()
+        self.seen_landing_pages = set()
+        # Positions seen on a landing page this run; the frontier only records finished ones
+        self.discovered_positions = set()
+        # Positions being or already scraped (or enqueued), so max_positions holds across concurrent workers
+        self.claimed_positions = set()
+        self.workers = []
+        self.stats = {'landing_pages': 0, 'positions_found': 0, 'positions_scraped': 0,
+                      'positions_enqueued': 0, 'skipped': 0, 'failed': 0}
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def push(self, task):
+        """Queue a task: landing pages first, then positions by interview count"""
+        if task['kind'] == 'landing':
+            rank = (LANDING_PRIORITY, 0)
+        else:
+            rank = (POSITION_PRIORITY, -(task.get('review_count') or 0))
+        with self.lock:
+            self.outstanding += 1
+            self.drained.clear()
+        self.tasks.put((*rank, next(self.sequence), task))
+
+    def task_done(self):
+        with self.lock:
+            self.outstanding -= 1
+            if self.outstanding == 0:
+                self.drained.set()
+
+    def retry(self, task, error):
+        """Requeue a failed task until it runs out of attempts"""
+        task['attempts'] = task.get('attempts', 0) + 1
+        if task['attempts'] < self.max_attempts:
+            print(f"🔁 Retrying {task['url']} ({task['attempts']}/{self.max_attempts}): {error}")
+            self.push(task)
+        else:
+            with self.lock:
+                self.stats['failed'] += 1
+                self.claimed_positions.discard(task['url'])
+            print(f"❌ Giving up on {task['url']}: {error}")
+
+    def add_landing_page(self, url):
+        with self.lock:
+            if url in self.seen_landing_pages:
+                return
+            self.seen_landing_pages.add(url)
+        self.push({'kind': 'landing', 'url': url})
+
+    def claim_position(self, url):
+        """Reserve a position under max_positions; False once the cap is reached"""
+        with self.lock:
+            if url in self.claimed_positions:
+                return True
+            if self.max_positions is not None and len(self.claimed_positions) >= self.max_positions:
+                self.stats['skipped'] += 1
+                return False
+            self.claimed_positions.add(url)
+            return True
+
+    def fetch(self, scraper, url, expect_reviews=True):
+        """Fetch a page with the worker's scraper; raises on failures and challenges so they are retried"""
+        fetched = scraper.fetch_page_source(url, expect_reviews=expect_reviews)
+        if not fetched:
+            raise RuntimeError("page failed to load")
+        if scraper.last_page_challenged:
+            raise RuntimeError("challenge page")
+        return fetched
+
+    def process_landing(self, scraper, task):
+        """Queue the position pages and further landing pages a landing page links to"""
+        page_source, _ = self.fetch(scraper, task['url'], expect_reviews=False)
+        # Landing pages have no reviews to feed the refresh scheduler
+        scraper.fetch_seconds.pop(task['url'], None)
+        self.count('landing_pages')
+
+        employer_id = parse_entity_url(task['url'])['employer_id']
+        positions, landing_pages = discover_links(page_source, task['url'], employer_id)
+        for url in landing_pages:
+            self.add_landing_page(url)
+
+        found = 0
+        for position in positions:
+            if position['review_count'] is not None and position['review_count'] < self.min_reviews:
+                continue
+            with self.lock:
+                if position['url'] in self.discovered_positions:
+                    continue
+                self.discovered_positions.add(position['url'])
+            # Scraped or enqueued by an earlier run
+            if position['url'] in self.frontier:
+                continue
+            found += 1
+            if self.crawl_queue is not None:
+                if not self.claim_position(position['url']):
+                    continue
+                if self.crawl_queue.enqueue(position['url'], priority=position['review_count'] or 0):
+                    self.frontier.add(position['url'])
+                    self.count('positions_enqueued')
+                else:
+                    # Already queued, so it doesn't count against max_positions
+                    with self.lock:
+                        self.claimed_positions.discard(position['url'])
+            else:
+                self.push({'kind': 'position', **position})
+        self.count('positions_found', found)
+        print(f"🧭 {task['url']}: {found} new position(s), {len(landing_pages)} landing page link(s)")
+
+    def process_position(self, scraper, task):
+        """Fetch, parse and record one position page"""
+        if not self.claim_position(task['url']):
+            return
+
+        if self.parse_pool and scraper.extraction_mode == 'html':
+            page_source, html_filename = self.fetch(scraper, task['url'])
+            page_data = self.parse_pool.submit_file(task['url'], html_filename, datetime.now().isoformat()).result()
+        else:
+            page_data = scraper.fetch_page_data(task['url'])
+            if not page_data:
+                raise RuntimeError("page failed to load")
+            if scraper.last_page_challenged:
+                raise RuntimeError("challenge page")
+        scraper.record_page(page_data)
+        # Only a scraped page is marked seen, so failed and capped positions are retried by later runs
+        self.frontier.add(task['url'])
+        self.count('positions_scraped')
+        print(f"✅ {page_data.get('position')} ({task.get('review_count') or '?'} interviews listed): "
+              f"{page_data['total_interviews']} experiences")
+
+    def run(self, start_url):
+        """Crawl from a landing page until nothing is left to discover or scrape; returns the scrapers"""
+        started = time.time()
+        self.add_landing_page(start_url)
+        for index in range(self.browsers):
+            worker = DiscoveryWorker(self, index)
+            worker.start()
+            self.workers.append(worker)
+
+        # Workers whose browser failed to start exit early; stop waiting if none is left
+        while not self.drained.wait(1):
+            if not any(worker.is_alive() for worker in self.workers):
+                print("❌ No browser is running; stopping the crawl")
+                break
+
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join()
+        self.stats['seconds'] = time.time() - started
+        return [worker.scraper for worker in self.workers if worker.scraper]
+
+    def save(self, scrapers, render_docx=True):
+        """Write every worker's pages as JSON shards (and DOCX files) through the first scraper"""
+        if not scrapers:
+            return {}
+        primary = scrapers[0]
+        for scraper in scrapers[1:]:
+            for page in scraper.scraped_data:
+                primary.keep_page(page)
+            scraper.clear_pages()
+        if not primary.scraped_data:
+            return {}
+
+        saved_files = primary.save_shards()
+        if render_docx:
+            for json_file in saved_files.values():
+                primary.process_and_generate_docx(json_file)
+        return saved_files
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover and scrape every position interview page of an employer")
+    parser.add_argument('employer', help='Employer landing or position interview URL, or an employer ID')
+    parser.add_argument('--company', help='Company name (required with a bare employer ID)')
+    parser.add_argument('--browsers', type=int, default=2, help='Pages fetched at once')
+    parser.add_argument('--max-positions', type=int, help='Scrape at most this many positions, most interviews first')
+    parser.add_argument('--min-reviews', type=int, default=0, help='Skip positions listing fewer interviews')
+    parser.add_argument('--parse-workers', type=int, default=0, help='Parse pages in this many worker processes')
+    parser.add_argument('--frontier', help='Skip positions earlier runs scraped or enqueued, recorded in this SQLite frontier')
+    parser.add_argument('--enqueue-to', help='Enqueue positions into this crawl queue instead of scraping them here')
+    parser.add_argument('--no-docx', action='store_true', help='Only write JSON')
+    parser.add_argument('--http-first', action='store_true',
+                        help='Fetch over plain HTTP and start Chrome only for challenged or incomplete pages')
+    parser.add_argument('--extraction-mode', choices=['html', 'dom'], default='html',
+                        help="'dom' reads reviews with one in-page script instead of parsing the page source")
+    parser.add_argument('--base-url', help='Fetch pages from this origin instead, e.g. a local mock server '
+                                           '(default: $GLASSDOOR_BASE_URL)')
+    args = parser.parse_args()
+
+    try:
+        start_url = landing_url_for(args.employer, args.company)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    from universal_interview_scraper import UniversalInterviewScraper
+    from rate_limiter import AdaptiveRateLimiter
+    from browser_session import BrowserSessionStore
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # All browsers pace the site together and share one session store
+    rate_limiter = AdaptiveRateLimiter(os.path.join(base_dir, 'scraped_data', 'rate_limits.json'))
+    session_store = BrowserSessionStore(os.path.join(base_dir, 'scraped_data', 'browser_sessions.json'))
+
+    def create_scraper(index):
+        # One checkpoint log per browser, so concurrent appends never interleave
+        checkpoint_path = os.path.join(base_dir, 'scraped_data', 'checkpoints',
+                                       f'checkpoint_{timestamp}_{os.getpid()}_discovery{index}.jsonl')
+        return UniversalInterviewScraper(checkpoint_path=checkpoint_path, rate_limiter=rate_limiter,
+                                         session_store=session_store, base_url=args.base_url,
+                                         http_first=args.http_first, extraction_mode=args.extraction_mode)
+
+    crawl_queue = None
+    if args.enqueue_to:
+        from crawl_queue import CrawlQueue
+        crawl_queue = CrawlQueue(args.enqueue_to)
+
+    parse_pool = None
+    if args.parse_workers and not crawl_queue:
+        from parse_workers import ParseWorkerPool
+        parse_pool = ParseWorkerPool(args.parse_workers)
+
+    frontier = UrlFrontier(args.frontier)
+    crawler = DiscoveryCrawler(create_scraper, browsers=args.browsers, frontier=frontier,
+                               max_positions=args.max_positions, min_reviews=args.min_reviews,
+                               crawl_queue=crawl_queue, parse_pool=parse_pool)
+
+    print(f"🏢 Discovering positions from {start_url} with {args.browsers} browser(s)")
+    try:
+        scrapers = crawler.run(start_url)
+        saved_files = crawler.save(scrapers, render_docx=not args.no_docx)
+        for json_file in saved_files.values():
+            print(f"📄 {json_file}")
+    finally:
+        for worker in crawler.workers:
+            if worker.scraper:
+                worker.scraper.close()
+        if parse_pool:
+            parse_pool.close()
+        frontier.close()
+
+    stats = crawler.stats
+    print(f"\n🏁 {stats['landing_pages']} landing page(s), {stats['positions_found']} new position(s), "
+          f"{stats['positions_scraped']} scraped, {stats['positions_enqueued']} enqueued, "
+          f"{stats['failed']} failed, {stats['skipped']} over --max-positions in {stats['seconds']:.0f}s")
+
+if __name__ == "__main__":
+    main()
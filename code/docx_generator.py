@@ -10,6 +10,9 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from stage_timer import get_timer
+from topic_tagger import TOPIC_LABELS, group_by_topic
+
 class DOCXGenerator:
     def __init__(self, output_dir='scraped_data'):
         self.output_dir = output_dir
@@ -81,41 +84,53 @@ class DOCXGenerator:
         return self.document
     
     def add_table_of_contents(self, qa_pairs):
-        """Add table of contents"""
+        """Add table of contents: one entry per topic section with its question numbers"""
         toc_heading = self.document.add_paragraph('Table of Contents', style='CustomHeading')
         
-        for i, qa in enumerate(qa_pairs[:20]):  # Limit to first 20 for TOC
-            question_preview = qa['question'][:60] + '...' if len(qa['question']) > 60 else qa['question']
-            toc_item = self.document.add_paragraph(f'{i+1}. {question_preview}', style='Metadata')
+        first = 1
+        for topic, pairs in group_by_topic(qa_pairs):
+            last = first + len(pairs) - 1
+            toc_item = self.document.add_paragraph(
+                f'{TOPIC_LABELS.get(topic, topic)} ({len(pairs)}): Q{first}-Q{last}', style='Metadata'
+            )
+            first = last + 1
     
     def add_qa_sections(self, qa_pairs):
-        """Add Q&A sections to document"""
+        """Add Q&A sections to document, one section per topic"""
         section_heading = self.document.add_paragraph('Interview Questions & Answers', style='CustomHeading')
         
-        for i, qa in enumerate(qa_pairs):
-            # Question
-            question_para = self.document.add_paragraph(f'Q{i+1}: {qa["question"]}', style='Question')
-            
-            # Answer
-            answer_para = self.document.add_paragraph(f'Answer: {qa["answer"]}', style='Answer')
-            
-            # Metadata
-            metadata_items = []
-            if qa.get('difficulty'):
-                metadata_items.append(f'Difficulty: {qa["difficulty"]}')
-            if qa.get('outcome'):
-                metadata_items.append(f'Outcome: {qa["outcome"]}')
-            if qa.get('location'):
-                metadata_items.append(f'Location: {qa["location"]}')
-            if qa.get('date'):
-                metadata_items.append(f'Date: {qa["date"]}')
-            
-            if metadata_items:
-                metadata_para = self.document.add_paragraph(' | '.join(metadata_items), style='Metadata')
-            
-            # Add separator
-            if i < len(qa_pairs) - 1:
-                self.document.add_paragraph('─' * 80, style='Metadata')
+        number = 0
+        for topic, pairs in group_by_topic(qa_pairs):
+            self.document.add_paragraph(TOPIC_LABELS.get(topic, topic), style='CustomHeading')
+            for i, qa in enumerate(pairs):
+                number += 1
+                self.add_qa(qa, number, separator=i < len(pairs) - 1)
+    
+    def add_qa(self, qa, number, separator=True):
+        """Add one question with its answer and metadata"""
+        # Question
+        question_para = self.document.add_paragraph(f'Q{number}: {qa["question"]}', style='Question')
+        
+        # Answer
+        answer_para = self.document.add_paragraph(f'Answer: {qa["answer"]}', style='Answer')
+        
+        # Metadata
+        metadata_items = []
+        if qa.get('difficulty'):
+            metadata_items.append(f'Difficulty: {qa["difficulty"]}')
+        if qa.get('outcome'):
+            metadata_items.append(f'Outcome: {qa["outcome"]}')
+        if qa.get('location'):
+            metadata_items.append(f'Location: {qa["location"]}')
+        if qa.get('date'):
+            metadata_items.append(f'Date: {qa["date"]}')
+        
+        if metadata_items:
+            metadata_para = self.document.add_paragraph(' | '.join(metadata_items), style='Metadata')
+        
+        # Add separator
+        if separator:
+            self.document.add_paragraph('─' * 80, style='Metadata')
     
     def add_summary(self, qa_pairs):
         """Add summary section"""
@@ -126,6 +141,7 @@ class DOCXGenerator:
         positions = set(qa.get('position', 'Unknown') for qa in qa_pairs)
         difficulties = [qa.get('difficulty', '') for qa in qa_pairs if qa.get('difficulty')]
         outcomes = [qa.get('outcome', '') for qa in qa_pairs if qa.get('outcome')]
+        topic_dist = {TOPIC_LABELS.get(topic, topic): len(pairs) for topic, pairs in group_by_topic(qa_pairs)}
         
         # Difficulty distribution
         difficulty_dist = {}
@@ -143,7 +159,8 @@ class DOCXGenerator:
             f'Companies: {", ".join(companies)}\n'
             f'Positions: {", ".join(positions)}\n'
             f'Difficulty Distribution: {dict(difficulty_dist)}\n'
-            f'Outcome Distribution: {dict(outcome_dist)}',
+            f'Outcome Distribution: {dict(outcome_dist)}\n'
+            f'Topic Distribution: {topic_dist}',
             style='Answer'
         )
     
@@ -153,15 +170,17 @@ class DOCXGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f'interview_questions_{timestamp}.docx'
         
+        os.makedirs(self.output_dir, exist_ok=True)
         filepath = os.path.join(self.output_dir, filename)
         self.document.save(filepath)
         return filepath
 
 def generate_docx_from_qa(qa_pairs, company='Unknown', position='Unknown', output_dir='scraped_data'):
     """Generate DOCX file from Q&A pairs"""
-    generator = DOCXGenerator(output_dir)
-    generator.create_document(qa_pairs, company, position)
-    filepath = generator.save_document()
+    with get_timer().span('docx_render', cpu=True, qa_pairs=len(qa_pairs)):
+        generator = DOCXGenerator(output_dir)
+        generator.create_document(qa_pairs, company, position)
+        filepath = generator.save_document()
     return filepath
 
 def main():
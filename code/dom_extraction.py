@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+In-browser review extraction in a single execute_script round trip
+
+Reading driver.page_source ships the whole DOM (often over a megabyte) across the WebDriver
+wire, only for BeautifulSoup to rebuild it and read about ten review blocks. The script here
+runs inside the page instead. It clicks the "Show more" / "Read more" controls inside review
+containers, then returns the page title, whether a challenge form is showing and each
+container's title and text. Container and title lookups use the parser's own
+selectors in the same order, and review text is the container's textContent, which is what
+BeautifulSoup's get_text() gives. The Q&A patterns downstream therefore see the same text
+either way.
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stage_timer import get_timer
+from interview_page_parser import EXPERIENCE_SELECTORS, TITLE_SELECTORS, CHALLENGE_ELEMENT_SELECTOR, is_challenge_title
+
+# How long expanded sections get to render before the reviews are read
+EXPAND_WAIT_MS = 300
+
+EXTRACTION_SCRIPT = """
+const [containerSelectors, titleSelectors, expandWaitMs, challengeSelector] = arguments;
+const EXPAND_LABEL = /^(show|read|see|view) (more|full|all)\\b/i;
+
+function findContainers() {
+    for (const selector of containerSelectors) {
+        const nodes = document.querySelectorAll(selector);
+        if (nodes.length) { return [selector, Array.from(nodes)]; }
+    }
+    return [null, []];
+}
+
+// Same as BeautifulSoup's get_text(strip=True): stripped text nodes joined without separators
+function strippedText(node) {
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    const parts = [];
+    while (walker.nextNode()) {
+        const text = walker.currentNode.nodeValue.trim();
+        if (text) { parts.push(text); }
+    }
+    return parts.join('');
+}
+
+function expand(containers) {
+    let clicked = 0;
+    for (const container of containers) {
+        for (const control of container.querySelectorAll('button, [role="button"], a')) {
+            const label = (control.textContent || '').trim().replace(/\\s+/g, ' ');
+            if (label.length > 40 || !EXPAND_LABEL.test(label) || control.getAttribute('aria-expanded') === 'true') {
+                continue;
+            }
+            // Never follow a real link away from the page
+            const href = control.tagName === 'A' ? (control.getAttribute('href') || '') : '';
+            if (href && !href.startsWith('#') && !href.startsWith('javascript:')) { continue; }
+            try { control.click(); clicked++; } catch (e) {}
+        }
+    }
+    return clicked;
+}
+
+function collect(expanded) {
+    const [selector, containers] = findContainers();
+    const reviews = containers.map(container => {
+        let title = '';
+        for (const titleSelector of titleSelectors) {
+            const element = container.querySelector(titleSelector);
+            if (element) { title = strippedText(element); break; }
+        }
+        return {title: title, text: container.textContent || ''};
+    });
+    return {
+        title: document.title,
+        selector: selector,
+        reviews: reviews,
+        expanded: expanded,
+        challenge_markup: !!document.querySelector(challengeSelector)
+    };
+}
+
+const expanded = expand(findContainers()[1]);
+if (!expanded) { return collect(0); }
+// WebDriver waits for a returned promise, so this is still one round trip
+return new Promise(resolve => setTimeout(() => resolve(collect(expanded)), expandWaitMs));
+"""
+
+def read_reviews(driver, expand_wait_ms=EXPAND_WAIT_MS):
+    """Expand and read the page's reviews in one script call
+
+    Returns {'title', 'selector', 'reviews': [{'title', 'text'}], 'expanded', 'challenge_markup'};
+    reviews is empty when no container selector matched.
+    """
+    with get_timer().span('dom_extraction'):
+        result = driver.execute_script(EXTRACTION_SCRIPT, EXPERIENCE_SELECTORS, TITLE_SELECTORS,
+                                       expand_wait_ms, CHALLENGE_ELEMENT_SELECTOR)
+    return result or {'title': '', 'selector': None, 'reviews': [], 'expanded': 0, 'challenge_markup': False}
+
+def is_challenge_result(result):
+    """The DOM-mode counterpart of is_challenge_page(): no reviews, and a challenge title or form"""
+    if not result or result.get('reviews'):
+        return False
+    return bool(result.get('challenge_markup')) or is_challenge_title(result.get('title'))
+
+def result_size(result):
+    """Characters of review text and titles a script result carried"""
+    return sum(len(review.get('text') or '') + len(review.get('title') or '') for review in result.get('reviews') or [])
+
+def page_data_from_dom(url, result, parser, scraped_at=None):
+    """Build a page record (the same shape parse_page returns) from a read_reviews() result"""
+    company, position = parser.company_and_position(url, result.get('title'))
+    experiences = []
+
+    with get_timer().span('experience_extraction', cpu=True, size=result_size(result)):
+        for index, review in enumerate(result.get('reviews') or [], 1):
+            try:
+                experience = parser.experience_from_text(index, review.get('text') or '', review.get('title') or '')
+            except Exception as e:
+                if parser.item_log.allow('experience_error'):
+                    parser.logger.error("Error parsing experience %d: %s", index, e)
+                continue
+            experiences.append(experience)
+
+    failed = parser.item_log.pop_suppressed('experience_error')
+    if failed:
+        parser.logger.error(f"{failed} more experiences failed to parse (errors sampled)")
+
+    return {
+        'url': url,
+        'scraped_at': scraped_at or datetime.now().isoformat(),
+        'title': (result.get('title') or '').strip(),
+        'company': company,
+        'position': position,
+        'total_interviews': len(experiences),
+        'interview_experiences': experiences
+    }
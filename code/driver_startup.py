@@ -0,0 +1,132 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'glassdoor_scraper', 'chromedriver')
+
+def detect_chrome_major():
+    """Get the installed Chrome major version, or None if it can't be determined"""
+    import undetected_chromedriver as uc
+
+    chrome_path = uc.find_chrome_executable()
+    if not chrome_path:
+        return None
+
+    try:
+        output = subprocess.run([chrome_path, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = re.search(r'(\d+)\.\d+\.\d+', output)
+    return int(match.group(1)) if match else None
+
+class ChromedriverCache:
+    """Keeps one patched chromedriver per Chrome major version so launches skip download and patching"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def driver_path(self, chrome_major):
+        filename = 'chromedriver.exe' if sys.platform.startswith('win') else 'chromedriver'
+        return os.path.join(self.cache_dir, str(chrome_major), filename)
+
+    def get(self, chrome_major):
+        """Get the cached patched driver for a Chrome version, if any"""
+        path = self.driver_path(chrome_major)
+        return path if chrome_major and os.path.exists(path) else None
+
+    def prepare(self, chrome_major):
+        """Make sure a patched driver is cached, returning (path, seconds spent patching)"""
+        cached = self.get(chrome_major)
+        if cached:
+            return cached, 0.0
+
+        import undetected_chromedriver as uc
+
+        started = time.time()
+        patcher = uc.Patcher(version_main=chrome_major or 0)
+        patcher.auto()
+
+        # Copy to a temp name first so concurrent launches never see a half-written binary
+        path = self.driver_path(chrome_major)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        shutil.copy2(patcher.executable_path, tmp_path)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, path)
+
+        return path, time.time() - started
+
+class BrowserPrewarmer:
+    """Starts scrapers with ready Chrome drivers in the background while the CLI waits on input"""
+
+    def __init__(self, count=1, scraper_factory=None):
+        self.count = count
+        self.scraper_factory = scraper_factory
+        self.ready = []
+        self.threads = []
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def create_scraper(self):
+        if self.scraper_factory:
+            return self.scraper_factory()
+
+        from universal_interview_scraper import UniversalInterviewScraper
+        return UniversalInterviewScraper()
+
+    def warm_one(self):
+        try:
+            scraper = self.create_scraper()
+            started = scraper.setup_driver()
+            with self.lock:
+                # A browser that finishes starting after close() would otherwise be leaked
+                if started and not self.closed:
+                    self.ready.append(scraper)
+                    return
+            scraper.close()
+        except Exception:
+            # Pre-warming is best effort; take() falls back to a cold start
+            pass
+
+    def start(self):
+        """Begin starting browsers in background threads"""
+        for _ in range(self.count):
+            thread = threading.Thread(target=self.warm_one, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def take(self, timeout=None):
+        """Get a warmed scraper, waiting up to timeout for one still starting; None if none came up"""
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.time()))
+            with self.lock:
+                if self.ready:
+                    return self.ready.pop(0)
+
+        with self.lock:
+            return self.ready.pop(0) if self.ready else None
+
+    def close(self, timeout=30):
+        """Shut down any warmed browsers that were never used
+
+        Browsers still starting are waited for (up to timeout) and close themselves when they come up.
+        """
+        with self.lock:
+            self.closed = True
+            scrapers, self.ready = self.ready, []
+        for scraper in scrapers:
+            scraper.close()
+
+        deadline = time.time() + timeout
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.time()))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Canonical company/position identity from Glassdoor's employer IDs
+Usage:
+  python entity_registry.py resolve <url> [--title "Tesla Software Engineer Interview Questions | Glassdoor"]
+  python entity_registry.py list
+  python entity_registry.py rename <employer_id> "Tesla"
+
+Interview URLs carry the employer ID and the character offsets of the company and position
+names inside the slug: .../Tesla-Software-Engineer-Interview-Questions-EI_IE43129.0,5_KO6,23.htm
+The employer ID plus the normalized position is the entity key. The first display names
+resolved for a key are cached and reused for every later URL variant of the same employer, so
+'Tesla' and 'Tesla-Motors' slugs land in one scraped_data folder and one crawl job.
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from urllib.parse import urlsplit, unquote
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_REGISTRY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'entities.sqlite3'
+)
+
+# Position pages: <slug>-Interview-Questions-EI_IE<id>.<company offsets>_KO<position offsets>[_IP<page>].htm
+POSITION_URL_PATTERN = re.compile(
+    r'/Interview/(?P<slug>[^/]+?)-Interview-Questions-EI_IE(?P<employer_id>\d+)'
+    r'\.(?P<company_start>\d+),(?P<company_end>\d+)'
+    r'(?:_KO(?P<position_start>\d+),(?P<position_end>\d+))?'
+    r'(?:_IP(?P<page>\d+))?\.htm'
+)
+
+# Company landing pages: <company>-Interview-Questions-E<id>[_P<page>].htm
+COMPANY_URL_PATTERN = re.compile(
+    r'/Interview/(?P<slug>[^/]+?)-Interview-Questions-E(?P<employer_id>\d+)(?:_P(?P<page>\d+))?\.htm'
+)
+
+def slug_name(slug, start, end):
+    """Display name from a slug span, e.g. 'Software-Engineer' -> 'Software Engineer'"""
+    return re.sub(r'\s+', ' ', slug[start:end].replace('-', ' ')).strip()
+
+def parse_entity_url(url):
+    """Employer ID, slug names and page number of an interview URL, or None without an employer ID"""
+    path = unquote(urlsplit(url).path)
+    match = POSITION_URL_PATTERN.search(path)
+    if match:
+        slug = match.group('slug')
+        company = slug_name(slug, int(match.group('company_start')), int(match.group('company_end')))
+        position = None
+        if match.group('position_start'):
+            position = slug_name(slug, int(match.group('position_start')), int(match.group('position_end')))
+        return {
+            'employer_id': int(match.group('employer_id')),
+            'company': company or None,
+            'position': position or None,
+            'page': int(match.group('page') or 1)
+        }
+
+    match = COMPANY_URL_PATTERN.search(path)
+    if match:
+        return {
+            'employer_id': int(match.group('employer_id')),
+            'company': slug_name(match.group('slug'), 0, len(match.group('slug'))) or None,
+            'position': None,
+            'page': int(match.group('page') or 1)
+        }
+    return None
+
+def normalize_position(position):
+    return re.sub(r'[^a-z0-9]+', ' ', (position or '').lower()).strip()
+
+def entity_key(employer_id, position=None):
+    """'43129' for an employer, '43129/software engineer' for one of its positions"""
+    position = normalize_position(position)
+    return f'{employer_id}/{position}' if position else str(employer_id)
+
+def page_key(url):
+    """Dedupe key for one page of an entity; falls back to the URL for pages without an employer ID"""
+    parsed = parse_entity_url(url)
+    if not parsed:
+        return url
+    key = entity_key(parsed['employer_id'], parsed['position'])
+    return key if parsed['page'] == 1 else f"{key}#p{parsed['page']}"
+
+def company_from_title(title, position):
+    """Company name from a '<Company> <Position> Interview Questions | Glassdoor' title, given the position"""
+    if not title or 'Interview Questions' not in title:
+        return None
+    prefix = title.split('Interview Questions')[0].split('|')[0].strip()
+    if position and prefix.lower().endswith(position.lower()):
+        prefix = prefix[:-len(position)].strip()
+    elif position:
+        # Without the known position to split on, the boundary between the names is a guess
+        return None
+    return prefix.strip(' -') or None
+
+class EntityRegistry:
+    """SQLite cache of canonical employer and position names by employer ID"""
+
+    def __init__(self, registry_path=DEFAULT_REGISTRY_PATH):
+        self.registry_path = registry_path
+        self.cache = {}
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(registry_path)), exist_ok=True)
+        self.setup_schema()
+
+    def connect(self):
+        """Open a connection that waits for concurrent writers"""
+        connection = sqlite3.connect(self.registry_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def setup_schema(self):
+        """Create the entities table"""
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS entities (
+                    entity_key TEXT PRIMARY KEY,
+                    employer_id INTEGER NOT NULL,
+                    company TEXT NOT NULL,
+                    position TEXT,
+                    first_url TEXT,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entities_employer ON entities (employer_id);
+            """)
+
+    def lookup(self, key):
+        with self.lock:
+            if key in self.cache:
+                return self.cache[key]
+        with self.connect() as connection:
+            row = connection.execute("SELECT * FROM entities WHERE entity_key = ?", (key,)).fetchone()
+        entity = dict(row) if row else None
+        if entity:
+            with self.lock:
+                self.cache[key] = entity
+        return entity
+
+    def register(self, key, employer_id, company, position, url):
+        """Insert names for a key unless another process got there first; returns the stored entity"""
+        with self.connect() as connection:
+            connection.execute(
+                """INSERT OR IGNORE INTO entities (entity_key, employer_id, company, position, first_url, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, employer_id, company, position, url, time.time())
+            )
+        with self.lock:
+            self.cache.pop(key, None)
+        return self.lookup(key)
+
+    def resolve(self, url, title=None):
+        """Canonical identity of an interview URL, or None if it has no employer ID
+
+        Returns employer_id, entity_key, company and position. Names cached for the employer (and
+        the position) win over whatever this URL's slug or the page title says.
+        """
+        parsed = parse_entity_url(url)
+        if not parsed:
+            return None
+
+        employer_id = parsed['employer_id']
+        employer_key = entity_key(employer_id)
+        employer = self.lookup(employer_key)
+        if not employer:
+            company = company_from_title(title, parsed['position']) or parsed['company'] or 'Unknown'
+            employer = self.register(employer_key, employer_id, company, None, url)
+
+        resolved = {
+            'employer_id': employer_id,
+            'entity_key': employer_key,
+            'company': employer['company'],
+            'position': None
+        }
+        if parsed['position']:
+            key = entity_key(employer_id, parsed['position'])
+            position = self.lookup(key) or self.register(key, employer_id, employer['company'], parsed['position'], url)
+            resolved.update(entity_key=key, position=position['position'])
+        return resolved
+
+    def rename(self, employer_id, company):
+        """Override an employer's display name for all of its entities"""
+        with self.connect() as connection:
+            connection.execute("UPDATE entities SET company = ? WHERE employer_id = ?", (company, employer_id))
+        with self.lock:
+            self.cache.clear()
+
+    def entities(self):
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute("SELECT * FROM entities ORDER BY employer_id, entity_key")]
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_entity_registry(registry_path=DEFAULT_REGISTRY_PATH):
+    """Get the process-wide registry for a path"""
+    with _registries_lock:
+        registry = _registries.get(registry_path)
+        if registry is None:
+            registry = _registries[registry_path] = EntityRegistry(registry_path)
+        return registry
+
+def main():
+    parser = argparse.ArgumentParser(description='Canonical company/position names by Glassdoor employer ID')
+    parser.add_argument('--registry', default=DEFAULT_REGISTRY_PATH, help='Registry database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    resolve_parser = subparsers.add_parser('resolve', help='Show the canonical identity of a URL')
+    resolve_parser.add_argument('url')
+    resolve_parser.add_argument('--title', help='Page title, used for names the first time an employer is seen')
+
+    subparsers.add_parser('list', help='List known entities')
+
+    rename_parser = subparsers.add_parser('rename', help="Set an employer's display name")
+    rename_parser.add_argument('employer_id', type=int)
+    rename_parser.add_argument('company')
+
+    args = parser.parse_args()
+    registry = EntityRegistry(args.registry)
+
+    if args.command == 'resolve':
+        resolved = registry.resolve(args.url, args.title)
+        if not resolved:
+            print("❌ No EI_IE employer ID in that URL")
+            sys.exit(1)
+        print(f"{resolved['entity_key']}: {resolved['company']} / {resolved['position'] or '(all positions)'}")
+        print(f"Page key: {page_key(args.url)}")
+
+    elif args.command == 'list':
+        for entity in registry.entities():
+            print(f"{entity['entity_key']:40} {entity['company']} / {entity['position'] or '-'}")
+
+    elif args.command == 'rename':
+        registry.rename(args.employer_id, args.company)
+        print(f"✏️  Employer {args.employer_id} is now '{args.company}'")
+
+if __name__ == "__main__":
+    main()
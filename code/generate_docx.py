@@ -7,14 +7,15 @@ from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from smart_qa_extractor import SmartQAExtractor
-from docx_generator import generate_docx_from_qa
+from output_manifest import OutputManifest
+from qa_cache import get_qa_cache
 
-def generate_docx_from_json(json_file_path):
-    """Generate DOCX file from JSON data"""
+def generate_docx_from_json(json_file_path, use_cache=True):
+    """Generate DOCX file from JSON data; use_cache reuses Q&A results for reviews seen before"""
     print(f"Processing JSON file: {json_file_path}")
     
     # Extract Q&A pairs
-    extractor = SmartQAExtractor(json_file_path)
+    extractor = SmartQAExtractor(json_file_path, cache=get_qa_cache() if use_cache else None)
     qa_pairs = extractor.extract_questions_and_answers()
     
     if not qa_pairs:
@@ -28,10 +29,11 @@ def generate_docx_from_json(json_file_path):
     print(f"Generating DOCX for {company} {position} interviews...")
     print(f"Total Q&A pairs: {len(qa_pairs)}")
     
-    # Generate DOCX in company-specific folder
-    company_folder = os.path.join('scraped_data', company)
-    os.makedirs(company_folder, exist_ok=True)
-    docx_path = generate_docx_from_qa(qa_pairs, company, position, company_folder)
+    # Generate DOCX next to the JSON it was built from (python-docx loads only when rendering)
+    from docx_generator import generate_docx_from_qa
+    output_folder = os.path.dirname(os.path.abspath(json_file_path))
+    docx_path = generate_docx_from_qa(qa_pairs, company, position, output_folder)
+    OutputManifest().record_artifact('docx', docx_path, company, position, row_count=len(qa_pairs))
     
     print(f"DOCX file generated: {docx_path}")
     return docx_path
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the scraper modules
+Usage: python import_benchmark.py [--repeat 5] [--check]
+
+Each module is imported in a fresh interpreter. --check fails if a browser-free
+module pulls in selenium or the Chrome driver.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules behind the extract/render/stats/replay commands must never load these
+BROWSER_MODULES = ['selenium', 'undetected_chromedriver']
+
+BROWSER_FREE_MODULES = [
+    'offline_commands',
+    'generate_docx',
+    'smart_qa_extractor',
+    'scrape_any_link',
+    'universal_interview_scraper',
+    'interview_page_parser',
+    'parse_workers'
+]
+
+PROBE_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in {heavy!r})
+print(json.dumps({{'seconds': elapsed, 'heavy_modules': loaded}}))
+"""
+
+def measure_import(module, heavy_modules):
+    """Import a module in a fresh interpreter; returns seconds and which heavy modules it loaded"""
+    script = PROBE_SCRIPT.format(module=module, heavy=heavy_modules)
+    result = subprocess.run([sys.executable, '-c', script], cwd=CODE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import time of the scraper modules')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh-interpreter runs per module')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if a browser-free module loads selenium')
+    args = parser.parse_args()
+
+    heavy_modules = BROWSER_MODULES + ['bs4', 'docx', 'numpy', 'scipy']
+    failed = False
+
+    print(f"{'module':32} {'median ms':>10} {'min ms':>8}  heavy modules loaded")
+    for module in BROWSER_FREE_MODULES:
+        runs = [measure_import(module, heavy_modules) for _ in range(args.repeat)]
+        errors = [run['error'] for run in runs if 'error' in run]
+        if errors:
+            print(f"{module:32} {'error':>10} {'':>8}  {errors[0]}")
+            failed = True
+            continue
+
+        times = [run['seconds'] * 1000 for run in runs]
+        loaded = sorted(set(name.split('.')[0] for name in runs[0]['heavy_modules']))
+        print(f"{module:32} {statistics.median(times):10.1f} {min(times):8.1f}  {', '.join(loaded) or '-'}")
+
+        if any(name in BROWSER_MODULES for name in loaded):
+            failed = True
+
+    if args.check and failed:
+        print("\n❌ A browser-free module failed to import or loaded selenium/the Chrome driver")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
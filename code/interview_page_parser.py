@@ -0,0 +1,418 @@
+import re
+import os
+import sys
+import logging
+from html import unescape
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stage_timer import get_timer
+from log_setup import LogSampler
+from entity_registry import parse_entity_url, company_from_title
+
+REVIEW_CONTAINER_SELECTOR = 'div[data-test="InterviewReview"]'
+# The same containers, found in raw HTML without building a DOM
+REVIEW_MARKUP_PATTERN = re.compile(r'data-test\s*=\s*["\']InterviewReview["\']')
+
+# Review containers, most specific first; the first selector that matches anything is used
+EXPERIENCE_SELECTORS = [
+    REVIEW_CONTAINER_SELECTOR,
+    '.interview-review',
+    '.review-container',
+    'div[class*="interview"]',
+    'div[class*="review"]',
+    'article[class*="interview"]',
+    'section[class*="interview"]'
+]
+
+# Where a review's title is looked for, in order
+TITLE_SELECTORS = ['h3', 'h4', '.title', '.header', '[class*="title"]', '[class*="header"]']
+
+# Titles of bot-protection interstitials ("Just a moment...", "Attention Required! | Cloudflare")
+CHALLENGE_TITLE_PATTERN = re.compile(r'^\s*(?:just a moment|attention required|checking your browser|'
+                                     r'security check|ddos protection)', re.IGNORECASE)
+# Elements only the challenge page itself renders, not the Cloudflare scripts on a normal page
+CHALLENGE_ELEMENT_SELECTOR = '#challenge-form, #challenge-running, #challenge-stage, #cf-challenge-running, .cf-browser-verification'
+CHALLENGE_MARKUP_PATTERN = re.compile(r'\bid\s*=\s*["\'](?:challenge-form|challenge-running|challenge-stage|'
+                                      r'cf-challenge-running)["\']|\bcf-browser-verification\b', re.IGNORECASE)
+PAGE_TITLE_PATTERN = re.compile(r'<title[^>]*>(?P<title>.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+def is_challenge_title(title):
+    """Check whether a page title is a bot-protection interstitial's"""
+    return bool(title) and CHALLENGE_TITLE_PATTERN.search(unescape(title)) is not None
+
+def is_challenge_page(page_source):
+    """Check whether page HTML is a bot-protection challenge page
+
+    Only pages without review markup count, and only by their title or the challenge form, so
+    reviews, scripts or CDN URLs that mention Cloudflare don't flag a good page.
+    """
+    if not page_source or has_review_markup(page_source):
+        return False
+    title = PAGE_TITLE_PATTERN.search(page_source)
+    if title and is_challenge_title(title.group('title')):
+        return True
+    return CHALLENGE_MARKUP_PATTERN.search(page_source) is not None
+
+def has_review_markup(page_source):
+    """Check whether page HTML already contains rendered review containers"""
+    return bool(page_source) and REVIEW_MARKUP_PATTERN.search(page_source) is not None
+
+class InterviewPageParser:
+    """Turns interview page HTML into page records; holds no browser state so it can run in worker processes"""
+    
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        # Per-experience messages are sampled so the parse loop isn't dominated by logging
+        self.item_log = LogSampler(first=3, every=100)
+    
+    def parse_page(self, url, page_source, scraped_at=None):
+        """Parse a fetched interview page into a page record"""
+        from bs4 import BeautifulSoup
+        
+        # Parse with BeautifulSoup
+        with get_timer().span('parse', cpu=True, size=len(page_source)):
+            soup = BeautifulSoup(page_source, 'html.parser')
+        
+        try:
+            # Extract company and position
+            company, position = self.extract_company_and_position(url, soup)
+            
+            # Extract page metadata
+            page_data = {
+                'url': url,
+                'scraped_at': scraped_at or datetime.now().isoformat(),
+                'title': '',
+                'company': company,
+                'position': position,
+                'total_interviews': 0,
+                'interview_experiences': []
+            }
+            
+            # Extract title
+            title_element = soup.find('title')
+            if title_element:
+                page_data['title'] = title_element.get_text(strip=True)
+                self.logger.info(f"Page title: {page_data['title']}")
+            
+            # Extract interview experiences
+            with get_timer().span('experience_extraction', cpu=True):
+                experiences = self.extract_interview_experiences(soup)
+            page_data['interview_experiences'] = experiences
+            page_data['total_interviews'] = len(experiences)
+            
+            return page_data
+        finally:
+            # Break the tree's reference cycles so its memory is released right away
+            soup.decompose()
+    
+    def parse_file(self, url, html_path, scraped_at=None):
+        """Parse an interview page saved to disk"""
+        with open(html_path, 'r', encoding='utf-8') as f:
+            page_source = f.read()
+        return self.parse_page(url, page_source, scraped_at)
+    
+    def extract_company_and_position(self, url, soup):
+        """Extract company and position from URL and page content"""
+        title_element = soup.find('title')
+        return self.company_and_position(url, title_element.get_text() if title_element else None)
+    
+    def company_and_position(self, url, title=None):
+        """Extract company and position from the URL and the page title"""
+        # URLs with an employer ID carry exact name offsets; no guessing needed
+        entity = parse_entity_url(url)
+        if entity and entity['company']:
+            company = company_from_title(title or '', entity['position']) or entity['company']
+            return self.clean_company_name(company), entity['position'] or 'Unknown'
+        
+        # Extract from URL
+        url_parts = url.split('/')
+        company = "Unknown"
+        position = "Unknown"
+        
+        # Look for company and position in URL
+        for part in url_parts:
+            if 'Interview' in part:
+                # Extract company and position from URL pattern
+                # Example: Tesla-Software-Engineer-Interview-Questions
+                if '-' in part:
+                    parts = part.split('-')
+                    if len(parts) >= 3:
+                        company = parts[0]
+                        position = ' '.join(parts[1:-2])  # Everything between company and "Interview"
+        
+        # Try to extract from page title
+        if title is not None:
+            # Pattern: "Company Position Interview Questions | Glassdoor"
+            if 'Interview Questions' in title:
+                title_parts = title.split('Interview Questions')[0].strip()
+                if '|' in title_parts:
+                    title_parts = title_parts.split('|')[0].strip()
+                
+                # Split by common separators
+                for separator in [' ', '-', '_']:
+                    if separator in title_parts:
+                        parts = title_parts.split(separator)
+                        if len(parts) >= 2:
+                            company = parts[0]
+                            position = ' '.join(parts[1:])
+                        break
+        
+        # Clean company name for folder usage
+        company = self.clean_company_name(company)
+        
+        return company, position
+    
+    def clean_company_name(self, company):
+        """Clean company name for use in folder names"""
+        if not company or company == "Unknown":
+            return "Unknown"
+        
+        # Remove special characters and normalize
+        company = re.sub(r'[^\w\s-]', '', company)
+        company = re.sub(r'\s+', '_', company.strip())
+        company = company.replace('__', '_')
+        
+        return company
+    
+    def extract_interview_experiences(self, soup):
+        """Extract detailed interview experiences from the page"""
+        return list(self.iter_interview_experiences(soup))
+    
+    def iter_interview_experiences(self, soup):
+        """Yield interview experiences one at a time as each container is parsed"""
+        self.logger.info("Extracting interview experiences...")
+        
+        extracted = 0
+        
+        # Look for interview experience containers
+        for selector in EXPERIENCE_SELECTORS:
+            elements = soup.select(selector)
+            if elements:
+                self.logger.info(f"Found {len(elements)} elements with selector: {selector}")
+                
+                for i, element in enumerate(elements):
+                    try:
+                        experience = self.parse_interview_experience(element, i+1)
+                    except Exception as e:
+                        if self.item_log.allow('experience_error'):
+                            self.logger.error("Error parsing experience %d: %s", i+1, e)
+                        continue
+                    
+                    if experience:
+                        extracted += 1
+                        if self.item_log.allow('experience'):
+                            self.logger.info("Extracted experience %d: %s...", i+1, experience.get('title', 'No title')[:50])
+                        yield experience
+                
+                if extracted:
+                    break
+        
+        # If no specific containers found, try to extract from general content
+        if not extracted:
+            self.logger.info("No specific interview containers found, trying general extraction...")
+            for experience in self.extract_from_general_content(soup):
+                extracted += 1
+                yield experience
+        
+        self.item_log.pop_suppressed('experience')
+        failed = self.item_log.pop_suppressed('experience_error')
+        if failed:
+            self.logger.error(f"{failed} more experiences failed to parse (errors sampled)")
+        self.logger.info(f"Total experiences extracted: {extracted}")
+    
+    def parse_interview_experience(self, element, index):
+        """Parse individual interview experience"""
+        # Extract title/header
+        title = ''
+        for selector in TITLE_SELECTORS:
+            title_elem = element.select_one(selector)
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                break
+        
+        return self.experience_from_text(index, element.get_text(), title)
+    
+    def experience_from_text(self, index, text, title=''):
+        """Build an experience record from a review container's text and title"""
+        experience = {
+            'index': index,
+            'title': title,
+            'date': '',
+            'location': '',
+            'outcome': '',
+            'difficulty': '',
+            'experience_rating': '',
+            'interview_process': '',
+            'questions': [],
+            'advice': '',
+            'full_text': ''
+        }
+        
+        # Extract date
+        date_patterns = [
+            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}',
+            r'\d{1,2}/\d{1,2}/\d{4}',
+            r'\d{4}-\d{2}-\d{2}'
+        ]
+        
+        for pattern in date_patterns:
+            match = re.search(pattern, text)
+            if match:
+                experience['date'] = match.group()
+                break
+        
+        # Extract location
+        location_patterns = [
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z]{2})',
+            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z][a-z]+)'
+        ]
+        
+        for pattern in location_patterns:
+            match = re.search(pattern, text)
+            if match:
+                experience['location'] = match.group()
+                break
+        
+        # Extract outcome
+        outcome_keywords = ['offer', 'no offer', 'declined', 'accepted', 'rejected']
+        for keyword in outcome_keywords:
+            if keyword.lower() in text.lower():
+                experience['outcome'] = keyword
+                break
+        
+        # Extract difficulty
+        difficulty_keywords = ['difficult', 'easy', 'average', 'hard', 'medium']
+        for keyword in difficulty_keywords:
+            if keyword.lower() in text.lower():
+                experience['difficulty'] = keyword
+                break
+        
+        # Extract experience rating
+        rating_patterns = [
+            r'(positive|negative|neutral)\s+experience',
+            r'experience.*?(positive|negative|neutral)'
+        ]
+        
+        for pattern in rating_patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                experience['experience_rating'] = match.group(1).lower()
+                break
+        
+        # Extract questions from text
+        with get_timer().span('question_extraction', cpu=True):
+            questions = self.extract_questions_from_text(text)
+        experience['questions'] = questions
+        
+        # Extract full text
+        experience['full_text'] = text
+        
+        return experience
+    
+    def extract_questions_from_text(self, text):
+        """Extract interview questions from text"""
+        questions = []
+        
+        # Look for specific question patterns in Glassdoor format
+        question_patterns = [
+            r'Question\s+\d+[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Question\s+\d+|$)',
+            r'Q\d*[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Q\d*|$)',
+            r'Interview questions?\s*\[?\d*\]?\s*[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Interview|$)',
+            r'What\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'How\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Why\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Describe\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Explain\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Tell me about\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'If you were to\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Does\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Some\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'They asked about\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'I was asked\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
+            r'Leetcode like\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Design a\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Past projects\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'current work\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'hobbies etc\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Tell me about your experience\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'large-scale distributed\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'If you were to describe yourself\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Does a hotdog\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Describe your most difficult\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Some hardware related\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'Power system and LabView\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'They asked about my experience\s+(.+?)(?=Answer question|Helpful|Share|$)',
+            r'I was asked a question on\s+(.+?)(?=Answer question|Helpful|Share|$)'
+        ]
+        
+        for pattern in question_patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
+            for match in matches:
+                question = match.strip()
+                if len(question) > 10 and len(question) < 500:
+                    # Clean up the question
+                    question = question.replace("Answer questionHelpfulShare", "")
+                    question = question.replace("HelpfulShare", "")
+                    question = re.sub(r'\s+', ' ', question)
+                    questions.append(question)
+        
+        # Remove duplicates and clean up
+        questions = list(set(questions))
+        questions = [q.strip() for q in questions if q.strip()]
+        
+        return questions[:10]  # Limit to 10 questions per experience
+    
+    def extract_from_general_content(self, soup):
+        """Extract experiences from general page content"""
+        experiences = []
+        
+        # Get all text and split into potential interview experiences
+        all_text = soup.get_text()
+        
+        # Look for interview experience indicators
+        experience_indicators = [
+            'I interviewed at',
+            'Interview process',
+            'Interview questions',
+            'Software Engineer Interview',
+            'Anonymous Interview Candidate'
+        ]
+        
+        # Split text into sections
+        sections = re.split(r'\n\s*\n', all_text)
+        
+        current_experience = None
+        for section in sections:
+            section = section.strip()
+            if not section or len(section) < 50:
+                continue
+            
+            # Check if this section contains interview experience
+            if any(indicator in section for indicator in experience_indicators):
+                if current_experience:
+                    experiences.append(current_experience)
+                
+                current_experience = {
+                    'index': len(experiences) + 1,
+                    'title': 'Interview Experience',
+                    'date': '',
+                    'location': '',
+                    'outcome': '',
+                    'difficulty': '',
+                    'experience_rating': '',
+                    'interview_process': '',
+                    'questions': [],
+                    'advice': '',
+                    'full_text': section
+                }
+            elif current_experience:
+                # Continue building current experience
+                current_experience['full_text'] += '\n\n' + section
+        
+        if current_experience:
+            experiences.append(current_experience)
+        
+        return experiences
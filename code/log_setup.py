@@ -0,0 +1,142 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Attributes every LogRecord has; anything else was passed through extra= and goes into the JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class LogSampler:
+    """Decides which per-item messages in a hot loop are worth logging
+
+    The first `first` messages for a key are always allowed, then one in every `every`,
+    and never more than one per `min_interval` seconds after that.
+    """
+
+    def __init__(self, first=3, every=100, min_interval=1.0):
+        self.first = first
+        self.every = every
+        self.min_interval = min_interval
+        self.counts = {}
+        self.last_logged = {}
+        self.suppressed = {}
+        self.lock = threading.Lock()
+
+    def allow(self, key):
+        with self.lock:
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+
+            now = time.monotonic()
+            allowed = count <= self.first or (
+                count % self.every == 0 and now - self.last_logged.get(key, 0.0) >= self.min_interval
+            )
+            if allowed:
+                self.last_logged[key] = now
+            else:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return allowed
+
+    def pop_suppressed(self, key):
+        """Get and reset how many messages for key were dropped"""
+        with self.lock:
+            self.counts.pop(key, None)
+            return self.suppressed.pop(key, 0)
+
+# Listener state is per process; forked parse workers set up their own
+_listener = None
+_queue_handler = None
+_log_path = None
+_owner_pid = None
+_setup_lock = threading.Lock()
+
+def setup_logging(name='universal_scraper', level=logging.INFO, log_dir='logs', console=True):
+    """Route logging through a queue to a background writer, once per process
+
+    Callers only pay for putting a record on a queue; the listener thread writes JSON
+    lines to logs/<name>_<timestamp>_<pid>.jsonl and plain text to the console.
+    Calling this again in the same process reuses the existing log file.
+    """
+    global _listener, _queue_handler, _log_path, _owner_pid
+
+    with _setup_lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            return logging.getLogger(name)
+
+        root = logging.getLogger()
+        if _queue_handler is not None:
+            # Inherited across fork; the parent's listener thread doesn't exist here
+            root.removeHandler(_queue_handler)
+
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _log_path = os.path.join(log_dir, f'{name}_{timestamp}_{os.getpid()}.jsonl')
+
+        file_handler = logging.FileHandler(_log_path, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(_queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _owner_pid = os.getpid()
+        atexit.register(shutdown_logging)
+        # Pool workers exit without running atexit hooks, but do run multiprocessing finalizers
+        import multiprocessing.util
+        multiprocessing.util.Finalize(None, shutdown_logging, exitpriority=10)
+
+    logger = logging.getLogger(name)
+    logger.info(f"Logging initialized. Log file: {_log_path}")
+    return logger
+
+def get_log_path():
+    """Get this process's log file, if logging has been set up"""
+    return _log_path if _owner_pid == os.getpid() else None
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            logging.getLogger().removeHandler(_queue_handler)
+            _queue_handler = None
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
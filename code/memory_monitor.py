@@ -0,0 +1,57 @@
+import gc
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def current_rss_mb():
+    """Get this process's resident memory in MB, or None where it can't be read"""
+    # Linux: current RSS from /proc
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    # Elsewhere fall back to peak RSS, which is still a safe upper bound
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+class MemoryMonitor:
+    """Tracks resident memory against an optional ceiling"""
+
+    def __init__(self, limit_mb=None):
+        self.limit_mb = limit_mb
+        self.peak_mb = 0.0
+        self.last_mb = None
+
+    def sample(self):
+        """Measure RSS now and update the peak"""
+        self.last_mb = current_rss_mb()
+        if self.last_mb is not None:
+            self.peak_mb = max(self.peak_mb, self.last_mb)
+        return self.last_mb
+
+    def within_limit(self):
+        """Check the ceiling, collecting garbage once before giving up"""
+        if not self.limit_mb or self.sample() is None or self.last_mb <= self.limit_mb:
+            return True
+
+        gc.collect()
+        return self.sample() <= self.limit_mb
+
+    def report(self):
+        """Get current, peak and limit figures"""
+        return {'rss_mb': self.last_mb, 'peak_rss_mb': self.peak_mb, 'limit_mb': self.limit_mb}
+
+    def format_report(self):
+        rss = 'n/a' if self.last_mb is None else f'{self.last_mb:.0f} MB'
+        limit = f', limit {self.limit_mb:.0f} MB' if self.limit_mb else ''
+        return f'RSS {rss} (peak {self.peak_mb:.0f} MB{limit})'
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Live scrape metrics in Prometheus text format
+Usage: python metrics.py [--port 9108]    # serve an empty registry to check the endpoint
+
+Scrapers record into the process-wide registry from get_registry(); start_metrics_server()
+exposes it at http://127.0.0.1:<port>/metrics. Per-second rates come from the counters,
+e.g. rate(glassdoor_pages_fetched_total[1m]).
+"""
+
+import os
+import sys
+import math
+import argparse
+import threading
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Browser navigation and readiness waits run to tens of seconds; parsing is sub-second
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (list(extra.items()) if extra else [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Metric:
+    """Base for metrics with an optional fixed set of label names"""
+
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def label_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self.lock:
+            return self.values.get(self.label_key(labels), 0)
+
+    def render(self):
+        with self.lock:
+            # An unlabelled counter reports 0 before its first increment so rate() has a starting point
+            items = sorted(self.values.items()) or ([((), 0)] if not self.labelnames else [])
+        return self.header() + [f'{self.name}{format_labels(self.labelnames, key)} {format_value(value)}'
+                                for key, value in items]
+
+class Gauge(Metric):
+    """Gauge set directly or read from a callback at scrape time"""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, callback):
+        """Read the value(s) from callback() on every scrape; it returns a number or {label values: number}"""
+        self.callback = callback
+
+    def render(self):
+        if self.callback:
+            try:
+                value = self.callback()
+            except Exception:
+                value = None
+            if isinstance(value, dict):
+                with self.lock:
+                    self.values = {(key if isinstance(key, tuple) else (key,)): v for key, v in value.items()}
+            elif value is not None:
+                with self.lock:
+                    self.values = {(): value}
+
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [f'{self.name}{format_labels(self.labelnames, key)} {format_value(value)}'
+                                for key, value in items]
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def render(self):
+        with self.lock:
+            items = sorted((key, dict(state, counts=list(state['counts']))) for key, state in self.values.items())
+
+        lines = self.header()
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                labels = format_labels(self.labelnames, key, {'le': format_value(bound)})
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{labels} {state["count"]}')
+        return lines
+
+class MetricsRegistry:
+    """Named metrics of one process; asking for an existing name returns the same metric"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric_class, name, documentation, labelnames=(), **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"{name} is already registered as a {metric.metric_type}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        gauge = self.register(Gauge, name, documentation, labelnames)
+        if callback:
+            gauge.set_function(callback)
+        return gauge
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """Render every metric in Prometheus text exposition format"""
+        with self.lock:
+            metrics = [self.metrics[name] for name in sorted(self.metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry; modules record through get_registry()
+_registry = MetricsRegistry()
+
+def get_registry():
+    """Get the process-wide metrics registry"""
+    return _registry
+
+class ScrapeMetrics:
+    """The scraper's metrics, registered once per process"""
+
+    def __init__(self, registry=None):
+        registry = registry or get_registry()
+        self.pages_fetched = registry.counter('glassdoor_pages_fetched_total', 'Pages fetched by a browser')
+        self.pages_parsed = registry.counter('glassdoor_pages_parsed_total', 'Pages parsed into records')
+        self.challenges = registry.counter('glassdoor_challenge_pages_total', 'Bot-protection challenge pages seen')
+        self.fetch_errors = registry.counter('glassdoor_fetch_errors_total', 'Navigations that failed or timed out')
+        self.experiences = registry.counter('glassdoor_experiences_extracted_total', 'Interview experiences extracted')
+        self.questions = registry.counter('glassdoor_questions_extracted_total', 'Interview questions extracted')
+        self.experiences_per_page = registry.histogram(
+            'glassdoor_experiences_per_page', 'Interview experiences extracted per page',
+            buckets=(0, 1, 5, 10, 20, 50, 100, 250, 1000)
+        )
+        self.questions_per_page = registry.histogram(
+            'glassdoor_questions_per_page', 'Interview questions extracted per page',
+            buckets=(0, 1, 5, 10, 20, 50, 100, 250, 1000)
+        )
+        self.browsers = registry.gauge('glassdoor_browsers_running', 'Chrome instances currently running')
+        self.browsers.set(0)
+        self.stage_seconds = registry.histogram('glassdoor_stage_seconds', 'Pipeline stage latency', ['stage'])
+
+        from memory_monitor import current_rss_mb
+        registry.gauge('glassdoor_resident_memory_bytes', 'Resident memory of this process',
+                       callback=lambda: current_rss_mb() * 1024 * 1024)
+
+    def record_page(self, page_data):
+        """Count a parsed page and what was extracted from it"""
+        experiences = page_data.get('interview_experiences', [])
+        questions = sum(len(experience.get('questions', [])) for experience in experiences)
+        self.pages_parsed.inc()
+        self.experiences.inc(len(experiences))
+        self.questions.inc(questions)
+        self.experiences_per_page.observe(len(experiences))
+        self.questions_per_page.observe(questions)
+
+    def observe_stage(self, stage, seconds, attrs):
+        """StageTimer listener feeding the stage latency histogram"""
+        self.stage_seconds.observe(seconds, stage=stage)
+
+_scrape_metrics = None
+_scrape_metrics_lock = threading.Lock()
+
+def get_scrape_metrics():
+    """Get the scraper metrics, registering them on first use"""
+    global _scrape_metrics
+    with _scrape_metrics_lock:
+        if _scrape_metrics is None:
+            _scrape_metrics = ScrapeMetrics()
+        return _scrape_metrics
+
+def watch_stage_timer(timer):
+    """Feed a StageTimer's spans into the stage latency histogram (once per timer)"""
+    listener = get_scrape_metrics().observe_stage
+    if listener not in timer.listeners:
+        timer.add_listener(listener)
+    return timer
+
+_watched_queues = {}
+
+def watch_queue(queue, name='crawl'):
+    """Report a CrawlQueue's job counts by status on every scrape"""
+    _watched_queues[name] = queue
+
+    def read_counts():
+        counts = {}
+        for queue_name, watched in list(_watched_queues.items()):
+            by_status = watched.counts()
+            for status in ['queued', 'leased', 'done', 'dead']:
+                counts[(queue_name, status)] = by_status.get(status, 0)
+        return counts
+
+    return get_registry().gauge('glassdoor_queue_jobs', 'Jobs in a crawl queue by status', ['queue', 'status'],
+                                callback=read_counts)
+
+def start_metrics_server(port, host='127.0.0.1', registry=None):
+    """Serve /metrics from a background thread; returns the server"""
+    # Imported here so scrapers that never serve metrics don't load the HTTP server
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            body = self.server.registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry or get_registry()
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve scrape metrics in Prometheus text format')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9108)
+    args = parser.parse_args()
+
+    get_scrape_metrics()
+    server = start_metrics_server(args.port, args.host)
+    print(f"📈 Metrics on http://{args.host}:{args.port}/metrics (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Local mock of Glassdoor interview pages for end-to-end and load testing without network access
+Usage: python mock_glassdoor_server.py [--port 8765] [--latency 0.2] [--challenge-rate 0.05] [--error-rate 0.02]
+
+Point the scraper at it with GLASSDOOR_BASE_URL=http://127.0.0.1:8765 (or --base-url).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import zlib
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_pages import generate_reviews, render_interview_page
+
+# /Interview/Tesla-Software-Engineer-Interview-Questions-EI_IE43129.0,5_KO6,23_IP2.htm
+INTERVIEW_PATH_PATTERN = re.compile(
+    r'^/Interview/(?P<slug>.+)-Interview-Questions-EI_IE(?P<employer_id>\d+)'
+    r'\.(?P<company_start>\d+),(?P<company_end>\d+)_KO(?P<position_start>\d+),(?P<position_end>\d+)'
+    r'(?:_IP(?P<page>\d+))?\.htm$'
+)
+
+# /Interview/Tesla-Interview-Questions-E43129_P2.htm (employer landing page listing its positions)
+COMPANY_PATH_PATTERN = re.compile(
+    r'^/Interview/(?P<company>[^/]+?)-Interview-Questions-E(?P<employer_id>\d+)(?:_P(?P<page>\d+))?\.htm$'
+)
+
+CHALLENGE_PAGE = (
+    '<!DOCTYPE html><html><head><title>Just a moment...</title></head><body>'
+    '<h1>Just a moment...</h1><p>Checking your browser before accessing glassdoor.com.</p>'
+    '<p>This process is automatic. DDoS protection by Cloudflare.</p></body></html>'
+)
+
+DEFAULT_EMPLOYERS = [
+    ('Tesla', 43129, ['Software Engineer', 'Data Scientist', 'Mechanical Engineer']),
+    ('Google', 9079, ['Software Engineer', 'Product Manager']),
+    ('Amazon', 6036, ['Software Development Engineer', 'Data Engineer'])
+]
+
+# Landing pages are topped up with these so every employer has several pages of positions
+EXTRA_POSITIONS = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'Product Manager',
+                   'Data Analyst', 'Mechanical Engineer', 'Electrical Engineer', 'Machine Learning Engineer',
+                   'Technical Program Manager', 'Business Analyst', 'Solutions Architect', 'Recruiter',
+                   'Financial Analyst', 'Quality Engineer', 'Production Associate', 'Sales Advisor',
+                   'Service Technician', 'UX Designer', 'Security Engineer', 'Site Reliability Engineer']
+
+def interview_path(company, employer_id, position, page_number=1):
+    """Build a Glassdoor-style interview path with the EI/KO name offsets"""
+    company_slug = company.replace(' ', '-')
+    position_slug = position.replace(' ', '-')
+    slug = f'{company_slug}-{position_slug}'
+    position_start = len(company_slug) + 1
+    suffix = '' if page_number == 1 else f'_IP{page_number}'
+    return (f'/Interview/{slug}-Interview-Questions-EI_IE{employer_id}.0,{len(company_slug)}'
+            f'_KO{position_start},{position_start + len(position_slug)}{suffix}.htm')
+
+def company_path(company, employer_id, page_number=1):
+    """Build an employer landing page path"""
+    suffix = '' if page_number == 1 else f'_P{page_number}'
+    return f"/Interview/{company.replace(' ', '-')}-Interview-Questions-E{employer_id}{suffix}.htm"
+
+def employer_positions(company, employer_id, count, seed=0):
+    """Positions and interview counts on an employer's landing page, most interviews first"""
+    known = next((positions for _, known_id, positions in DEFAULT_EMPLOYERS if known_id == employer_id), [])
+    rng = random.Random(zlib.crc32(f'{seed}:{employer_id}'.encode('utf-8')))
+    extras = [position for position in EXTRA_POSITIONS if position not in known]
+    positions = (known + rng.sample(extras, len(extras)))[:count]
+    counts = sorted((rng.randint(1, 5000) for _ in positions), reverse=True)
+    return list(zip(positions, counts))
+
+def parse_interview_path(path):
+    """Get (company, position, employer_id, page_number) from an interview path, or None"""
+    match = INTERVIEW_PATH_PATTERN.match(path)
+    if not match:
+        return None
+
+    slug = match.group('slug')
+    company = slug[int(match.group('company_start')):int(match.group('company_end'))].replace('-', ' ')
+    position = slug[int(match.group('position_start')):int(match.group('position_end'))].replace('-', ' ')
+    return company or 'Unknown', position or 'Unknown', int(match.group('employer_id')), int(match.group('page') or 1)
+
+class MockServerConfig:
+    """Knobs for the mock server's behaviour"""
+
+    def __init__(self, reviews_per_page=10, total_pages=5, latency=0.0, latency_jitter=0.0, padding_kb=0,
+                 challenge_rate=0.0, error_rate=0.0, error_status=503, seed=0, positions_per_employer=12,
+                 positions_per_landing_page=5):
+        self.reviews_per_page = reviews_per_page
+        self.total_pages = total_pages
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.padding_kb = padding_kb
+        self.challenge_rate = challenge_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seed = seed
+        self.positions_per_employer = positions_per_employer
+        self.positions_per_landing_page = positions_per_landing_page
+
+class MockGlassdoorHandler(BaseHTTPRequestHandler):
+    server_version = 'MockGlassdoor/1.0'
+
+    def log_message(self, format, *args):
+        # Request logging would dominate the output under load
+        pass
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        path = self.path.split('?', 1)[0]
+
+        if path == '/__stats':
+            self.send_body(200, json.dumps(server.stats_snapshot()), 'application/json')
+            return
+
+        delay = config.latency + server.random_uniform(0, config.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if path in ('/', '/Interview/index.htm'):
+            server.count('landing')
+            self.send_body(200, self.render_landing())
+            return
+
+        parsed = parse_interview_path(path)
+        company_match = COMPANY_PATH_PATTERN.match(path)
+        if not parsed and not company_match:
+            server.count('not_found')
+            self.send_body(404, '<html><head><title>Page not found | Glassdoor</title></head><body>Not found</body></html>')
+            return
+
+        # Faults are drawn per request, so a retry can succeed
+        roll = server.random_uniform(0, 1)
+        if roll < config.error_rate:
+            server.count('errors')
+            self.send_body(config.error_status, f'<html><body><h1>{config.error_status} Error</h1></body></html>')
+            return
+        if roll < config.error_rate + config.challenge_rate:
+            server.count('challenges')
+            self.send_body(403, CHALLENGE_PAGE)
+            return
+
+        if company_match:
+            self.send_company_landing(company_match.group('company').replace('-', ' '),
+                                      int(company_match.group('employer_id')), int(company_match.group('page') or 1))
+            return
+
+        company, position, employer_id, page_number = parsed
+        if page_number > config.total_pages:
+            server.count('not_found')
+            self.send_body(404, '<html><body>No more reviews</body></html>')
+            return
+
+        server.count('pages')
+        self.send_body(200, self.render_page(company, position, employer_id, page_number))
+
+    def render_page(self, company, position, employer_id, page_number):
+        config = self.server.config
+        # The same URL always serves the same reviews
+        seed = zlib.crc32(f'{config.seed}:{employer_id}:{position}:{page_number}'.encode('utf-8'))
+        reviews = generate_reviews(config.reviews_per_page, company, position, seed)
+        offset = (page_number - 1) * config.reviews_per_page
+        for review in reviews:
+            review['index'] += offset
+
+        base_href = interview_path(company, employer_id, position)[:-len('.htm')]
+        return render_interview_page(reviews, company, position, page_number, config.total_pages,
+                                     config.padding_kb, base_href)
+
+    def render_landing(self):
+        links = ''.join(
+            f'<li><a href="{interview_path(company, employer_id, position)}">{escape(company)} '
+            f'{escape(position)} Interview Questions</a></li>'
+            for company, employer_id, positions in DEFAULT_EMPLOYERS for position in positions
+        )
+        return (f'<!DOCTYPE html><html><head><title>Interview Questions | Glassdoor</title></head>'
+                f'<body><ul class="interview-links">{links}</ul></body></html>')
+
+    def send_company_landing(self, company, employer_id, page_number):
+        """Serve one page of an employer's position list, with interview counts and a next link"""
+        config = self.server.config
+        positions = employer_positions(company, employer_id, config.positions_per_employer, config.seed)
+        page_size = max(1, config.positions_per_landing_page)
+        total_pages = max(1, -(-len(positions) // page_size))
+        if page_number > total_pages:
+            self.server.count('not_found')
+            self.send_body(404, '<html><body>No more positions</body></html>')
+            return
+
+        self.server.count('company_pages')
+        start = (page_number - 1) * page_size
+        items = ''.join(
+            f'<li class="position"><a href="{interview_path(company, employer_id, position)}">{escape(position)}</a>'
+            f' <span class="count">{count:,} interviews</span></li>'
+            for position, count in positions[start:start + page_size]
+        )
+        next_link = ''
+        if page_number < total_pages:
+            next_link = f'<a class="next" href="{company_path(company, employer_id, page_number + 1)}">Next</a>'
+        self.send_body(200, f'<!DOCTYPE html><html><head><title>{escape(company)} Interview Questions | Glassdoor'
+                            f'</title></head><body><ul class="positions">{items}</ul>{next_link}</body></html>')
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count('bytes', len(data))
+
+class MockGlassdoorServer(ThreadingHTTPServer):
+    """Threaded mock server; use as a context manager to run it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, config=None):
+        super().__init__((host, port), MockGlassdoorHandler)
+        self.config = config or MockServerConfig()
+        self.rng = random.Random(self.config.seed)
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url_for(self, company, employer_id, position, page_number=1):
+        return self.base_url + interview_path(company, employer_id, position, page_number)
+
+    def random_uniform(self, low, high):
+        with self.lock:
+            return self.rng.uniform(low, high)
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def stats_snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def start(self):
+        """Serve from a background thread"""
+        self.thread = threading.Thread(target=self.serve_forever, name='mock-glassdoor', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve mock Glassdoor interview pages locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--reviews-per-page', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=5, help='Result pages per position (_IPn.htm)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+    parser.add_argument('--padding-kb', type=int, default=0, help='Inert markup added to every page')
+    parser.add_argument('--challenge-rate', type=float, default=0.0, help='Share of "Just a moment..." pages')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of error responses')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = MockServerConfig(args.reviews_per_page, args.pages, args.latency, args.jitter, args.padding_kb,
+                              args.challenge_rate, args.error_rate, args.error_status, args.seed)
+    server = MockGlassdoorServer(args.host, args.port, config)
+
+    print(f"🧪 Mock Glassdoor serving on {server.base_url}")
+    print(f"   Example: {server.url_for('Tesla', 43129, 'Software Engineer')}")
+    print(f"   Company: {server.base_url}{company_path('Tesla', 43129)}")
+    print(f"   Stats:   {server.base_url}/__stats")
+    print(f"   Use:     GLASSDOOR_BASE_URL={server.base_url} python code/scrape_any_link.py "
+          f"\"https://www.glassdoor.com{interview_path('Tesla', 43129, 'Software Engineer')}\"")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
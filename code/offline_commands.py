@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Browser-free commands for working with data that has already been scraped
+Usage:
+  python offline_commands.py extract <interview_data.json> [--output qa.json]
+  python offline_commands.py render <interview_data.json>
+  python offline_commands.py stats <interview_data.json>
+  python offline_commands.py replay <checkpoint.jsonl> [--render]
+  python offline_commands.py --no-cache render <interview_data.json>   # redo every Q&A extraction
+
+None of these commands import selenium or the Chrome driver.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_qa_extractor import SmartQAExtractor
+from checkpoint_store import CheckpointStore, atomic_write_json
+from output_manifest import OutputManifest, save_pages_to_shards
+from qa_cache import get_qa_cache
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def qa_cache_for(args):
+    """The Q&A cache unless --no-cache was given"""
+    return None if getattr(args, 'no_cache', False) else get_qa_cache()
+
+def extract_command(args):
+    """Extract Q&A pairs from scraped JSON and write them out as JSON"""
+    extractor = SmartQAExtractor(args.json_file, cache=qa_cache_for(args))
+    qa_pairs = extractor.extract_questions_and_answers(tag_topics=True)
+
+    folder, name = os.path.split(args.json_file)
+    output = args.output or os.path.join(folder, f'qa_{name}')
+    atomic_write_json(output, qa_pairs)
+    print(f"📝 Wrote {len(qa_pairs)} Q&A pairs to {output}")
+    return 0
+
+def render_command(args):
+    """Render a DOCX from scraped JSON"""
+    from generate_docx import generate_docx_from_json
+
+    docx_path = generate_docx_from_json(args.json_file, use_cache=qa_cache_for(args) is not None)
+    if not docx_path:
+        print("❌ Failed to generate DOCX file")
+        return 1
+
+    print(f"✅ DOCX file generated: {docx_path}")
+    return 0
+
+def stats_command(args):
+    """Print Q&A statistics for scraped JSON"""
+    extractor = SmartQAExtractor(args.json_file, cache=qa_cache_for(args))
+    extractor.extract_questions_and_answers(tag_topics=True)
+    stats = extractor.get_statistics()
+
+    if not stats:
+        print("No question-answer pairs found")
+        return 1
+
+    print(f"Total Q&A pairs: {stats['total_qa_pairs']}")
+    print(f"Companies: {', '.join(stats['companies'])}")
+    print(f"Positions: {', '.join(stats['positions'])}")
+    print(f"Difficulty distribution: {stats['difficulty_distribution']}")
+    print(f"Outcome distribution: {stats['outcome_distribution']}")
+    print(f"Topic distribution: {stats['topic_distribution']}")
+    return 0
+
+def replay_command(args):
+    """Turn a checkpoint log from an interrupted run into JSON (and optionally DOCX) outputs"""
+    pages = CheckpointStore(args.checkpoint).load()
+    if not pages:
+        print(f"❌ No pages found in checkpoint: {args.checkpoint}")
+        return 1
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    saved_files = save_pages_to_shards(pages, BASE_DIR, f'interview_data_{timestamp}.json', OutputManifest())
+    print(f"♻️  Replayed {len(pages)} page(s) from {args.checkpoint}")
+
+    # Keep the similar-question index current if one has been built
+    if os.path.exists(os.path.join(BASE_DIR, 'scraped_data', 'question_index', 'index.json')):
+        from question_index import update_question_index
+        print(f"🗂️  Indexed {update_question_index(saved_files.values())} question(s)")
+
+    for (company, position), json_file in saved_files.items():
+        print(f"💾 {company}/{position}: {json_file}")
+        if args.render:
+            render_command(argparse.Namespace(json_file=json_file, no_cache=args.no_cache))
+
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Browser-free commands for scraped interview data')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the Q&A cache and extract every answer again')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extract_parser = subparsers.add_parser('extract', help='Extract Q&A pairs to JSON')
+    extract_parser.add_argument('json_file')
+    extract_parser.add_argument('--output', '-o', help='Output path (default: qa_<json_file> in the same folder)')
+    extract_parser.set_defaults(handler=extract_command)
+
+    render_parser = subparsers.add_parser('render', help='Render a DOCX from scraped JSON')
+    render_parser.add_argument('json_file')
+    render_parser.set_defaults(handler=render_command)
+
+    stats_parser = subparsers.add_parser('stats', help='Show Q&A statistics')
+    stats_parser.add_argument('json_file')
+    stats_parser.set_defaults(handler=stats_command)
+
+    replay_parser = subparsers.add_parser('replay', help='Write outputs from a checkpoint log')
+    replay_parser.add_argument('checkpoint')
+    replay_parser.add_argument('--render', action='store_true', help='Also render a DOCX for each shard')
+    replay_parser.set_defaults(handler=replay_command)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+    main()
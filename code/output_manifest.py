@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import argparse
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+ALL_POSITIONS = '*'
+
+def clean_folder_name(name):
+    """Clean a company or position name for use in folder names"""
+    if not name or name == "Unknown":
+        return "Unknown"
+
+    name = re.sub(r'[^\w\s-]', '', name)
+    name = re.sub(r'\s+', '_', name.strip())
+    name = name.replace('__', '_')
+
+    return name or "Unknown"
+
+def shard_dir(base_dir, company, position):
+    """Get the scraped_data/<Company>/<Position> folder for an artifact"""
+    return os.path.join(base_dir, 'scraped_data', clean_folder_name(company), clean_folder_name(position))
+
+def file_sha256(filepath):
+    """Hash a file's content in chunks"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ShardWriter:
+    """Streams one shard's pages into a JSON array, then renames it into place"""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), prefix='.tmp_', suffix='.json')
+        self.file = os.fdopen(fd, 'w', encoding='utf-8')
+        self.file.write('[')
+        self.first_url = ''
+        self.page_count = 0
+        self.row_count = 0
+
+    def write(self, page):
+        if self.page_count:
+            self.file.write(',')
+        else:
+            self.first_url = page.get('url', '')
+        self.file.write('\n' + json.dumps(page, indent=2, ensure_ascii=False))
+        self.page_count += 1
+        self.row_count += page.get('total_interviews', 0)
+
+    def commit(self):
+        self.file.write('\n]')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.filepath)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def shard_key(company, position):
+    """Cleaned (company, position) names; names that clean to the same folder share one shard"""
+    return clean_folder_name(company), clean_folder_name(position)
+
+def save_pages_to_shards(pages, base_dir, filename, manifest=None):
+    """Stream pages into one JSON file per company/position shard and record each in the manifest
+
+    Returns the saved files keyed by shard_key(company, position).
+    """
+    # Pages may be a generator, so only one page at a time needs to be in memory
+    writers = {}
+    try:
+        for page in pages:
+            key = shard_key(page.get('company', 'Unknown'), page.get('position', 'Unknown'))
+            if key not in writers:
+                writers[key] = ShardWriter(os.path.join(shard_dir(base_dir, *key), filename))
+            writers[key].write(page)
+    except Exception:
+        for writer in writers.values():
+            writer.abort()
+        raise
+
+    saved_files = {}
+    for (company, position), writer in writers.items():
+        writer.commit()
+
+        if manifest:
+            manifest.record_artifact(
+                'json', writer.filepath, company, position,
+                url=writer.first_url,
+                page_count=writer.page_count,
+                row_count=writer.row_count
+            )
+        saved_files[(company, position)] = writer.filepath
+
+    return saved_files
+
+class OutputManifest:
+    """SQLite index of every JSON/DOCX artifact, with O(1) latest-artifact lookups"""
+
+    def __init__(self, manifest_path=None):
+        if not manifest_path:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            manifest_path = os.path.join(base_dir, 'scraped_data', 'manifest.sqlite3')
+
+        self.manifest_path = manifest_path
+        os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+        self.setup_schema()
+
+    def connect(self):
+        """Open a connection that waits for concurrent writers"""
+        connection = sqlite3.connect(self.manifest_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def setup_schema(self):
+        """Create manifest tables"""
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    company TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    url TEXT NOT NULL DEFAULT '',
+                    content_hash TEXT NOT NULL,
+                    page_count INTEGER NOT NULL DEFAULT 0,
+                    row_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS artifacts_by_shard ON artifacts (company, position, kind);
+                CREATE TABLE IF NOT EXISTS latest (
+                    company TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    artifact_id INTEGER NOT NULL REFERENCES artifacts (id),
+                    PRIMARY KEY (company, position, kind)
+                );
+            """)
+
+    def record_artifact(self, kind, path, company, position, url='', page_count=0, row_count=0):
+        """Record an artifact and make it the latest one for its company/position"""
+        company = clean_folder_name(company)
+        position = clean_folder_name(position)
+        content_hash = file_sha256(path)
+        created_at = datetime.now().isoformat()
+
+        with self.connect() as connection:
+            cursor = connection.execute(
+                """INSERT INTO artifacts (kind, path, company, position, url, content_hash,
+                                          page_count, row_count, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (kind, os.path.abspath(path), company, position, url or '', content_hash,
+                 page_count, row_count, created_at)
+            )
+            artifact_id = cursor.lastrowid
+
+            # Keep one pointer per shard and one per company so lookups never scan
+            for shard_position in (position, ALL_POSITIONS):
+                connection.execute(
+                    "INSERT OR REPLACE INTO latest (company, position, kind, artifact_id) VALUES (?, ?, ?, ?)",
+                    (company, shard_position, kind, artifact_id)
+                )
+
+        return artifact_id
+
+    def latest_artifact(self, company, position=None, kind='json'):
+        """Get the latest artifact for a company (and optionally a position)"""
+        with self.connect() as connection:
+            row = connection.execute(
+                """SELECT artifacts.* FROM latest
+                   JOIN artifacts ON artifacts.id = latest.artifact_id
+                   WHERE latest.company = ? AND latest.position = ? AND latest.kind = ?""",
+                (clean_folder_name(company), clean_folder_name(position) if position else ALL_POSITIONS, kind)
+            ).fetchone()
+
+        return dict(row) if row else None
+
+    def list_artifacts(self, company=None, position=None, kind=None):
+        """List recorded artifacts, newest first"""
+        query = "SELECT * FROM artifacts WHERE 1 = 1"
+        params = []
+        if company:
+            query += " AND company = ?"
+            params.append(clean_folder_name(company))
+        if position:
+            query += " AND position = ?"
+            params.append(clean_folder_name(position))
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY id DESC"
+
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(query, params)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the scraped_data artifact manifest')
+    parser.add_argument('--manifest', help='Manifest database path (default: scraped_data/manifest.sqlite3)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    latest_parser = subparsers.add_parser('latest', help='Show the latest artifact for a company')
+    latest_parser.add_argument('company')
+    latest_parser.add_argument('--position', help='Restrict to one position')
+    latest_parser.add_argument('--kind', default='json', choices=['json', 'docx'])
+
+    list_parser = subparsers.add_parser('list', help='List recorded artifacts')
+    list_parser.add_argument('--company')
+    list_parser.add_argument('--position')
+    list_parser.add_argument('--kind', choices=['json', 'docx'])
+
+    args = parser.parse_args()
+    manifest = OutputManifest(args.manifest)
+
+    if args.command == 'latest':
+        artifact = manifest.latest_artifact(args.company, args.position, args.kind)
+        if not artifact:
+            print(f"No {args.kind} artifact recorded for {args.company}")
+            sys.exit(1)
+        print(artifact['path'])
+    else:
+        for artifact in manifest.list_artifacts(args.company, args.position, args.kind):
+            print(f"{artifact['created_at']}  {artifact['kind']:4}  {artifact['company']}/{artifact['position']}  "
+                  f"rows={artifact['row_count']}  {artifact['path']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_page_parser import InterviewPageParser
+from log_setup import setup_logging
+from stage_timer import SpanCollector, get_timer, set_timer
+
+# One parser per worker process, created by the pool initializer
+_worker_parser = None
+
+def _init_worker():
+    """Create the parser once per worker process, timing its stages for the parent to merge"""
+    global _worker_parser
+    set_timer(SpanCollector())
+    # Each worker process writes its own log file
+    _worker_parser = InterviewPageParser(setup_logging('parse_worker', console=False))
+
+def parse_page_source(url, page_source, scraped_at=None):
+    """Parse page HTML inside a worker process; returns the page record and its stage spans"""
+    page = _worker_parser.parse_page(url, page_source, scraped_at)
+    return page, get_timer().take()
+
+def parse_page_file(url, html_path, scraped_at=None):
+    """Parse a saved HTML file inside a worker process; returns the page record and its stage spans"""
+    page = _worker_parser.parse_file(url, html_path, scraped_at)
+    return page, get_timer().take()
+
+def merge_spans(worker_future):
+    """Future for the page record alone; the worker's spans go into this process's stage timer"""
+    page_future = Future()
+
+    def done(future):
+        try:
+            page, spans = future.result()
+        except BaseException as e:
+            page_future.set_exception(e)
+            return
+        get_timer().merge(spans)
+        page_future.set_result(page)
+
+    worker_future.add_done_callback(done)
+    return page_future
+
+class ParseWorkerPool:
+    """Process pool that parses fetched pages off the browser thread
+
+    Workers are spawned rather than forked: the pool starts its processes on the first submit,
+    which in the daemon happens on a browser thread while other threads (log writer, browser
+    workers, API server) may hold locks a forked child would inherit locked.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                            mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, url, page_source, scraped_at=None):
+        """Queue raw page source for parsing, returning a future page record"""
+        return merge_spans(self.executor.submit(parse_page_source, url, page_source, scraped_at))
+
+    def submit_file(self, url, html_path, scraped_at=None):
+        """Queue a saved HTML file for parsing, returning a future page record"""
+        return merge_spans(self.executor.submit(parse_page_file, url, html_path, scraped_at))
+
+    def close(self, wait=True):
+        """Shut down the worker processes"""
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Persistent memo of Q&A extraction results
+Usage:
+  python qa_cache.py stats
+  python qa_cache.py clear
+
+Entries are keyed by a hash of (full_text, question, pattern-set version) and hold the cleaned
+question and extracted answer, so re-rendering or replaying unchanged reviews skips the answer
+regexes. Changing the extractor's patterns changes the version, which empties the cache on the
+next open. The least recently used entries are evicted once the cache grows past max_entries.
+"""
+
+import os
+import sys
+import time
+import atexit
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'qa_cache.sqlite3'
+)
+
+def cache_key(full_text, question, version):
+    """Stable key for one question of one review under one pattern set"""
+    digest = hashlib.sha256()
+    for part in (version, full_text, question):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class QACache:
+    """SQLite-backed LRU of (cleaned question, answer) results
+
+    Lookups and stores are buffered in memory and written in batches, so a cache hit costs a
+    dictionary lookup plus one indexed read rather than a write transaction per question.
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, version='', max_entries=200000, flush_every=500):
+        self.cache_path = cache_path
+        self.version = version
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self.pending = {}
+        self.touched = set()
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        # Shared by the daemon's worker threads; every use goes through self.lock
+        self.connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+        self.setup_schema()
+        atexit.register(self.flush)
+
+    def setup_schema(self):
+        """Create the tables and drop every entry made under a different pattern set"""
+        with self.lock, self.connection:
+            self.connection.executescript("""
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    question TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            """)
+            row = self.connection.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                self.connection.execute("DELETE FROM entries")
+                self.connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)",
+                                        (self.version,))
+
+    def key(self, full_text, question):
+        return cache_key(full_text, question, self.version)
+
+    def get(self, key):
+        """Cached (cleaned question, answer) for a key, or None"""
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is None:
+                row = self.connection.execute("SELECT question, answer FROM entries WHERE key = ?",
+                                              (key,)).fetchone()
+                entry = tuple(row) if row else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.touched.add(key)
+        return entry
+
+    def put(self, key, question, answer):
+        with self.lock:
+            self.pending[key] = (question, answer)
+            should_flush = len(self.pending) + len(self.touched) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write buffered entries and recency updates, then evict down to max_entries"""
+        with self.lock:
+            if not self.pending and not self.touched:
+                return
+            now = time.time()
+            try:
+                with self.connection:
+                    self.connection.executemany(
+                        "INSERT OR REPLACE INTO entries (key, question, answer, last_used) VALUES (?, ?, ?, ?)",
+                        [(key, question, answer, now) for key, (question, answer) in self.pending.items()]
+                    )
+                    self.connection.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                                [(now, key) for key in self.touched - self.pending.keys()])
+                    excess = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+                    if excess > 0:
+                        self.connection.execute(
+                            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                            (excess,)
+                        )
+            except sqlite3.Error:
+                # A cache that can't be written only costs speed
+                pass
+            self.pending.clear()
+            self.touched.clear()
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.pending.clear()
+            self.touched.clear()
+            self.connection.execute("DELETE FROM entries")
+
+    def stats(self):
+        self.flush()
+        with self.lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_qa_cache(cache_path=None):
+    """Get the process-wide cache for the current pattern set (QA_CACHE_PATH overrides the location)"""
+    from smart_qa_extractor import PATTERN_SET_VERSION
+
+    cache_path = cache_path or os.environ.get('QA_CACHE_PATH') or DEFAULT_CACHE_PATH
+    with _caches_lock:
+        cache = _caches.get(cache_path)
+        if cache is None:
+            cache = _caches[cache_path] = QACache(cache_path, PATTERN_SET_VERSION)
+        return cache
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or clear the Q&A extraction cache')
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('--cache', help='Cache database path (default: scraped_data/qa_cache.sqlite3)')
+    args = parser.parse_args()
+
+    cache = get_qa_cache(args.cache)
+    if args.command == 'clear':
+        cache.clear()
+        print(f"🧹 Cleared {cache.cache_path}")
+        return
+
+    stats = cache.stats()
+    print(f"Entries: {stats['entries']} / {stats['max_entries']}")
+    print(f"Pattern set: {stats['version']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Similar-question search across every scraped company and position
+Usage:
+  python question_index.py build                                # index new/changed interview_data_*.json
+  python question_index.py query "Design a rate limiter" -k 10 [--exclude-company Tesla]
+  python question_index.py compact                              # merge segments, drop superseded files
+  python question_index.py stats
+
+The index lives in scraped_data/question_index as append-only segments. Each segment is an
+inverted index (term -> postings of document ids and weights) saved as .npy arrays that are
+memory-mapped at query time, so a query only touches the postings of its own terms. Questions
+are hashed into the same unigram + bigram features as topic_tagger and scored with lnc.ltc
+weighting (log-TF cosine on documents, log-TF * IDF on the query). Once the index exists, each
+scrape adds its new JSON shards as another segment.
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import shutil
+import argparse
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_tagger import HashingVectorizer
+from smart_qa_extractor import SmartQAExtractor
+from checkpoint_store import atomic_write_json
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INDEX_DIR = os.path.join(BASE_DIR, 'scraped_data', 'question_index')
+
+def find_interview_files(root):
+    """Every interview_data_*.json below root, skipping the index itself"""
+    found = []
+    for folder, subfolders, files in os.walk(root):
+        subfolders[:] = [name for name in subfolders if name not in ('question_index', 'checkpoints')]
+        found.extend(os.path.join(folder, name) for name in files
+                     if name.startswith('interview_data_') and name.endswith('.json'))
+    return sorted(found)
+
+def file_signature(path):
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+class Segment:
+    """One memory-mapped inverted index segment"""
+
+    def __init__(self, path):
+        self.path = path
+        self.term_ptr = np.load(os.path.join(path, 'term_ptr.npy'), mmap_mode='r')
+        self.doc_ids = np.load(os.path.join(path, 'doc_ids.npy'), mmap_mode='r')
+        self.weights = np.load(os.path.join(path, 'weights.npy'), mmap_mode='r')
+        self.sources = np.load(os.path.join(path, 'sources.npy'), mmap_mode='r')
+        self.doc_offsets = np.load(os.path.join(path, 'doc_offsets.npy'), mmap_mode='r')
+        self.doc_count = len(self.sources)
+
+    def document_frequency(self):
+        return np.diff(self.term_ptr)
+
+    def score(self, query_terms, query_weights):
+        """Accumulate query-weighted postings into one score per document"""
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        for term, weight in zip(query_terms, query_weights):
+            start, end = self.term_ptr[term], self.term_ptr[term + 1]
+            if start != end:
+                # A term appears at most once per document's postings, so fancy-index += is exact
+                scores[self.doc_ids[start:end]] += weight * self.weights[start:end]
+        return scores
+
+    def document(self, doc_id):
+        with open(os.path.join(self.path, 'docs.jsonl'), 'rb') as f:
+            f.seek(int(self.doc_offsets[doc_id]))
+            return json.loads(f.readline())
+
+    def iter_documents(self):
+        with open(os.path.join(self.path, 'docs.jsonl'), 'r', encoding='utf-8') as f:
+            for doc_id, line in enumerate(f):
+                yield doc_id, json.loads(line)
+
+class QuestionIndex:
+    """Segmented inverted index over every scraped interview question"""
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, n_features=2 ** 18):
+        self.index_dir = index_dir
+        self.manifest_path = os.path.join(index_dir, 'index.json')
+        self.manifest = self.load_manifest(n_features)
+        self.vectorizer = HashingVectorizer(self.manifest['n_features'])
+        self.extractor = SmartQAExtractor(pages=[])
+        self._segments = None
+        self._document_frequency = None
+
+    def load_manifest(self, n_features):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'n_features': n_features, 'segments': [], 'sources': {}, 'retired': [], 'next_source_id': 0}
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    @property
+    def segments(self):
+        if self._segments is None:
+            self._segments = [Segment(os.path.join(self.index_dir, name)) for name in self.manifest['segments']]
+        return self._segments
+
+    def document_count(self):
+        return sum(segment.doc_count for segment in self.segments)
+
+    def document_frequency(self):
+        if self._document_frequency is None:
+            frequency = np.zeros(self.manifest['n_features'], dtype=np.int64)
+            for segment in self.segments:
+                frequency += segment.document_frequency()
+            self._document_frequency = frequency
+        return self._document_frequency
+
+    def lock(self):
+        """Exclusive lock so concurrent scrapers don't interleave manifest updates"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.index_dir, 'index.lock'), 'w')
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def questions_in_file(self, path, source_id):
+        """Index documents for the unique cleaned questions of one scraped JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        source = os.path.relpath(path, BASE_DIR) if path.startswith(BASE_DIR + os.sep) else path
+        seen = set()
+        for page in (data if isinstance(data, list) else [data]):
+            company = page.get('company', 'Unknown')
+            position = page.get('position', 'Unknown')
+            for experience in page.get('interview_experiences', []):
+                for raw_question in experience.get('questions', []):
+                    question = self.extractor.clean_question(raw_question)
+                    key = (question.lower(), company, position)
+                    if len(question) < 10 or key in seen:
+                        continue
+                    seen.add(key)
+                    yield {
+                        'question': question,
+                        'company': company,
+                        'position': position,
+                        'date': experience.get('date', ''),
+                        'source': source,
+                        'source_id': source_id
+                    }
+
+    def update(self, paths=None, root=None):
+        """Index new or changed files as one new segment; returns how many questions were added"""
+        paths = paths if paths is not None else find_interview_files(root or os.path.join(BASE_DIR, 'scraped_data'))
+        lock_file = self.lock()
+        try:
+            # Another process may have added segments since this index was opened
+            self.manifest = self.load_manifest(self.manifest['n_features'])
+            sources = self.manifest['sources']
+            documents = []
+            for path in paths:
+                key = os.path.abspath(path)
+                if not os.path.exists(key):
+                    continue
+                signature = file_signature(key)
+                previous = sources.get(key)
+                if previous and previous['signature'] == signature:
+                    continue
+                if previous:
+                    # The file was rewritten; its old questions stay on disk but stop matching
+                    self.manifest['retired'].append(previous['id'])
+                source_id = self.manifest['next_source_id']
+                self.manifest['next_source_id'] += 1
+                sources[key] = {'signature': signature, 'id': source_id}
+                documents.extend(self.questions_in_file(key, source_id))
+
+            if documents:
+                self.manifest['segments'].append(self.write_segment(documents))
+            if documents or not self.exists():
+                atomic_write_json(self.manifest_path, self.manifest)
+        finally:
+            lock_file.close()
+
+        self._segments = None
+        self._document_frequency = None
+        return len(documents)
+
+    def write_segment(self, documents):
+        """Write documents as a new inverted index segment; returns its folder name"""
+        name = f'seg_{time.strftime("%Y%m%d_%H%M%S")}_{os.getpid()}_{len(self.manifest["segments"])}'
+        tmp_path = os.path.join(self.index_dir, f'.tmp_{name}')
+        os.makedirs(tmp_path, exist_ok=True)
+
+        # lnc document weights: log TF, cosine-normalized; IDF is applied on the query side
+        counts = self.vectorizer.counts([document['question'] for document in documents])
+        counts.data = (1.0 + np.log(counts.data)).astype(np.float32)
+        norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        counts.data /= np.repeat(norms, np.diff(counts.indptr)).astype(np.float32)
+        postings = counts.tocsc()
+        postings.sort_indices()
+
+        np.save(os.path.join(tmp_path, 'term_ptr.npy'), postings.indptr.astype(np.int64))
+        np.save(os.path.join(tmp_path, 'doc_ids.npy'), postings.indices.astype(np.int32))
+        np.save(os.path.join(tmp_path, 'weights.npy'), postings.data.astype(np.float32))
+        np.save(os.path.join(tmp_path, 'sources.npy'),
+                np.asarray([document['source_id'] for document in documents], dtype=np.int32))
+
+        offsets = []
+        with open(os.path.join(tmp_path, 'docs.jsonl'), 'wb') as f:
+            for document in documents:
+                offsets.append(f.tell())
+                f.write(json.dumps(document, ensure_ascii=False).encode('utf-8') + b'\n')
+        np.save(os.path.join(tmp_path, 'doc_offsets.npy'), np.asarray(offsets, dtype=np.int64))
+
+        os.replace(tmp_path, os.path.join(self.index_dir, name))
+        return name
+
+    def query_vector(self, question):
+        """ltc query weights over the hashed features: log TF * IDF, cosine-normalized"""
+        terms, counts = np.unique(
+            np.asarray([self.vectorizer.feature_index(token) for token in self.vectorizer.features(question)],
+                       dtype=np.int64),
+            return_counts=True
+        )
+        frequency = self.document_frequency()[terms]
+        weights = (1.0 + np.log(counts)) * (np.log((1.0 + self.document_count()) / (1.0 + frequency)) + 1.0)
+        norm = np.sqrt((weights ** 2).sum())
+        return terms, (weights / norm if norm else weights).astype(np.float32)
+
+    def search(self, question, k=10, exclude_company=None, min_score=0.05):
+        """Top-k most similar indexed questions (one per question text and company), best first"""
+        terms, weights = self.query_vector(question)
+        if not len(terms):
+            return []
+
+        retired = np.asarray(self.manifest['retired'], dtype=np.int32)
+        # Extra candidates leave room for duplicates and excluded companies
+        depth = k * 4
+        candidates = []
+        for segment_number, segment in enumerate(self.segments):
+            scores = segment.score(terms, weights)
+            if len(retired):
+                scores[np.isin(segment.sources, retired)] = 0.0
+            top = np.argpartition(-scores, depth)[:depth] if len(scores) > depth else np.arange(len(scores))
+            candidates.extend((float(scores[doc_id]), segment_number, int(doc_id))
+                              for doc_id in top if scores[doc_id] >= min_score)
+        candidates.sort(reverse=True)
+
+        results = []
+        seen = set()
+        for score, segment_number, doc_id in candidates:
+            document = self.segments[segment_number].document(doc_id)
+            if exclude_company and document['company'].lower() == exclude_company.lower():
+                continue
+            key = (document['question'].lower(), document['company'])
+            if key in seen:
+                continue
+            seen.add(key)
+            document.pop('source_id', None)
+            results.append(dict(document, score=round(score, 4)))
+            if len(results) == k:
+                break
+        return results
+
+    def compact(self):
+        """Rewrite every live question into a single segment; returns how many were kept"""
+        lock_file = self.lock()
+        try:
+            self.manifest = self.load_manifest(self.manifest['n_features'])
+            self._segments = None
+            retired = set(self.manifest['retired'])
+            documents = [document for segment in self.segments for _, document in segment.iter_documents()
+                         if document['source_id'] not in retired]
+
+            old_segments = list(self.manifest['segments'])
+            self.manifest['segments'] = [self.write_segment(documents)] if documents else []
+            live_ids = {document['source_id'] for document in documents}
+            self.manifest['retired'] = []
+            self.manifest['sources'] = {path: source for path, source in self.manifest['sources'].items()
+                                        if source['id'] in live_ids}
+            atomic_write_json(self.manifest_path, self.manifest)
+            for name in old_segments:
+                shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+        finally:
+            lock_file.close()
+
+        self._segments = None
+        self._document_frequency = None
+        return len(documents)
+
+def update_question_index(paths, index_dir=DEFAULT_INDEX_DIR):
+    """Add freshly saved shards to the index, if one has been built; returns questions added"""
+    index = QuestionIndex(index_dir)
+    if not index.exists():
+        return 0
+    return index.update(paths=list(paths))
+
+def main():
+    parser = argparse.ArgumentParser(description='Find similar interview questions across companies')
+    parser.add_argument('--index', default=DEFAULT_INDEX_DIR, help='Index folder')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Index new or changed interview_data_*.json files')
+    build_parser.add_argument('--root', default=os.path.join(BASE_DIR, 'scraped_data'), help='Folder to scan')
+
+    query_parser = subparsers.add_parser('query', help='Show the most similar indexed questions')
+    query_parser.add_argument('question')
+    query_parser.add_argument('-k', type=int, default=10)
+    query_parser.add_argument('--exclude-company', help='Leave out questions from this company')
+    query_parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    subparsers.add_parser('compact', help='Merge segments and drop questions from rewritten files')
+    subparsers.add_parser('stats', help='Show index size')
+
+    args = parser.parse_args()
+    index = QuestionIndex(args.index)
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        added = index.update(root=args.root)
+        print(f"🗂️  Indexed {added} new question(s) in {time.perf_counter() - started:.1f}s "
+              f"({index.document_count()} total, {len(index.segments)} segment(s))")
+
+    elif args.command == 'query':
+        if not index.exists():
+            print(f"❌ No index at {args.index}; run 'build' first")
+            sys.exit(1)
+        started = time.perf_counter()
+        results = index.search(args.question, args.k, args.exclude_company)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+        print(f"🔎 {len(results)} result(s) in {elapsed_ms:.1f} ms")
+        for result in results:
+            print(f"  {result['score']:.3f}  {result['company']} / {result['position']}  {result['date']}")
+            print(f"         {result['question']}")
+
+    elif args.command == 'compact':
+        kept = index.compact()
+        print(f"🧹 Compacted to {len(index.segments)} segment(s) with {kept} question(s)")
+
+    elif args.command == 'stats':
+        print(f"Questions: {index.document_count()}")
+        print(f"Segments: {len(index.segments)}")
+        print(f"Files indexed: {len(index.manifest['sources'])} ({len(index.manifest['retired'])} superseded)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import json
+import os
+import sys
+import sqlite3
+import threading
+import time
+import argparse
+from urllib.parse import urlparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint_store import atomic_write_json
+
+# Responses that mean the host is throttling us, so the limiter backs off as well as slowing down
+THROTTLE_STATUS_CODES = (429, 503)
+
+class HostRateState:
+    """Token bucket and AIMD state for one host"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = 1.0
+        # Wall-clock time, so state shared between processes refills consistently
+        self.last_refill = time.time()
+        self.backoff_until = 0.0
+        self.consecutive_challenges = 0
+        self.successes = 0
+        self.challenges = 0
+        self.errors = 0
+        self.avg_latency = None
+
+    def to_dict(self):
+        """Serialize the learned state (tokens are not worth persisting)"""
+        return {
+            'rate': self.rate,
+            'backoff_until': self.backoff_until,
+            'consecutive_challenges': self.consecutive_challenges,
+            'successes': self.successes,
+            'challenges': self.challenges,
+            'errors': self.errors,
+            'avg_latency': self.avg_latency
+        }
+
+    @classmethod
+    def from_dict(cls, data, default_rate):
+        state = cls(data.get('rate', default_rate))
+        state.backoff_until = data.get('backoff_until', 0.0)
+        state.consecutive_challenges = data.get('consecutive_challenges', 0)
+        state.successes = data.get('successes', 0)
+        state.challenges = data.get('challenges', 0)
+        state.errors = data.get('errors', 0)
+        state.avg_latency = data.get('avg_latency')
+        return state
+
+class AdaptiveRateLimiter:
+    """Per-host token bucket whose rate grows additively on success and halves on challenges or errors"""
+
+    def __init__(self, state_path=None, initial_rate=0.2, min_rate=0.02, max_rate=1.0,
+                 additive_increase=0.01, decrease_factor=0.5, latency_threshold=20.0,
+                 base_backoff=10.0, max_backoff=600.0):
+        self.state_path = state_path
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def host_key(self, url):
+        """Get the host a URL is rate limited under"""
+        return urlparse(url).netloc.lower() or url
+
+    def get_state(self, url):
+        host = self.host_key(url)
+        if host not in self.hosts:
+            self.hosts[host] = HostRateState(self.initial_rate)
+        return self.hosts[host]
+
+    def update_state(self, url, change):
+        """Apply change(state) to a host's state atomically and return its result"""
+        with self.lock:
+            return change(self.get_state(url))
+
+    def refill(self, state, now):
+        state.tokens = min(1.0, state.tokens + max(0.0, now - state.last_refill) * state.rate)
+        state.last_refill = now
+
+    def take_token(self, state):
+        """Spend a token if the host allows a request now; otherwise return how long to wait"""
+        now = time.time()
+        self.refill(state, now)
+
+        backoff_remaining = state.backoff_until - now
+        if backoff_remaining <= 0 and state.tokens >= 1.0:
+            state.tokens -= 1.0
+            return 0.0
+
+        token_wait = (1.0 - state.tokens) / state.rate
+        return max(backoff_remaining, token_wait, 0.05)
+
+    def acquire(self, url):
+        """Block until a request to this URL's host is allowed; returns seconds waited"""
+        waited = 0.0
+        while True:
+            delay = self.update_state(url, self.take_token)
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def record_success(self, url, latency=None):
+        """Additive increase after a clean fetch, unless latency says the host is struggling"""
+        def change(state):
+            state.successes += 1
+            state.consecutive_challenges = 0
+
+            if latency is not None:
+                state.avg_latency = latency if state.avg_latency is None else 0.8 * state.avg_latency + 0.2 * latency
+
+            if latency is not None and latency > self.latency_threshold:
+                state.rate = max(self.min_rate, state.rate * 0.8)
+            else:
+                state.rate = min(self.max_rate, state.rate + self.additive_increase)
+
+        self.update_state(url, change)
+
+    def record_challenge(self, url):
+        """Multiplicative decrease plus exponential back-off; returns the back-off in seconds"""
+        def change(state):
+            state.challenges += 1
+            state.consecutive_challenges += 1
+            state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+
+            backoff = min(self.max_backoff, self.base_backoff * (2 ** (state.consecutive_challenges - 1)))
+            state.backoff_until = time.time() + backoff
+            state.tokens = 0.0
+            return backoff
+
+        backoff = self.update_state(url, change)
+        self.save()
+        return backoff
+
+    def record_error(self, url, status_code=None):
+        """Multiplicative decrease after a failed fetch; 429/503 also back off"""
+        def change(state):
+            state.errors += 1
+            state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+
+            if status_code in THROTTLE_STATUS_CODES:
+                state.backoff_until = max(state.backoff_until, time.time() + self.base_backoff)
+
+        self.update_state(url, change)
+
+    def status(self, url=None):
+        """Get the current rate and back-off state for one host or all hosts"""
+        with self.lock:
+            hosts = {self.host_key(url): self.get_state(url)} if url else dict(self.hosts)
+            now = time.time()
+            return {
+                host: dict(state.to_dict(), backoff_remaining=max(0.0, state.backoff_until - now))
+                for host, state in hosts.items()
+            }
+
+    def load(self):
+        """Load what earlier runs learned about each host"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        for host, host_data in data.items():
+            self.hosts[host] = HostRateState.from_dict(host_data, self.initial_rate)
+
+    def save(self):
+        """Persist the learned per-host state"""
+        if not self.state_path:
+            return
+
+        with self.lock:
+            data = {host: state.to_dict() for host, state in self.hosts.items()}
+        atomic_write_json(self.state_path, data)
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """The same per-host limiter with its state in SQLite, shared by every process that uses the file
+
+    Worker processes on one store then draw from one token bucket per host and learn from each
+    other's challenges, instead of each pacing the host at the full rate on its own. Every
+    update runs in a write transaction, so there is nothing to save separately.
+    """
+
+    def __init__(self, db_path, **kwargs):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        super().__init__(None, **kwargs)
+        self.setup_schema()
+
+    def connect(self):
+        """Open a connection; writers serialize on the database lock"""
+        return sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+
+    def setup_schema(self):
+        connection = self.connect()
+        try:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS host_rates (
+                    host TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    tokens REAL NOT NULL,
+                    last_refill REAL NOT NULL
+                )
+            """)
+        finally:
+            connection.close()
+
+    def row_state(self, row):
+        state = HostRateState.from_dict(json.loads(row[0]), self.initial_rate)
+        state.tokens, state.last_refill = row[1], row[2]
+        return state
+
+    def update_state(self, url, change):
+        """Read, change and write back a host's state in one transaction"""
+        host = self.host_key(url)
+        connection = self.connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT state, tokens, last_refill FROM host_rates WHERE host = ?", (host,)
+            ).fetchone()
+            state = self.row_state(row) if row else HostRateState(self.initial_rate)
+            result = change(state)
+            connection.execute(
+                "INSERT OR REPLACE INTO host_rates (host, state, tokens, last_refill) VALUES (?, ?, ?, ?)",
+                (host, json.dumps(state.to_dict()), state.tokens, state.last_refill)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+
+        with self.lock:
+            self.hosts[host] = state
+        return result
+
+    def status(self, url=None):
+        """Get the current rate and back-off state from the shared file"""
+        connection = self.connect()
+        try:
+            rows = connection.execute("SELECT host, state, tokens, last_refill FROM host_rates").fetchall()
+        finally:
+            connection.close()
+        with self.lock:
+            self.hosts.update((row[0], self.row_state(row[1:])) for row in rows)
+        return super().status(url)
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the learned per-host rate limits')
+    parser.add_argument('--state', default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'rate_limits.json'))
+    args = parser.parse_args()
+
+    # Crawl-queue workers keep their shared state in rate_limits.sqlite3
+    limiter = SharedRateLimiter(args.state) if args.state.endswith('.sqlite3') else AdaptiveRateLimiter(args.state)
+    status = limiter.status()
+    if not status:
+        print("No rate limit state recorded yet")
+        return
+
+    for host, state in status.items():
+        print(f"{host}: {state['rate']:.3f} req/s, backoff {state['backoff_remaining']:.0f}s, "
+              f"successes={state['successes']} challenges={state['challenges']} errors={state['errors']}")
+
+if __name__ == "__main__":
+    main()
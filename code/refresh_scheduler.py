@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Staleness-driven refresh scheduling for the company/position catalog
+Usage:
+  python refresh_scheduler.py add <url> [<url> ...]
+  python refresh_scheduler.py import-manifest
+  python refresh_scheduler.py plan --budget-minutes 30
+  python refresh_scheduler.py enqueue --budget-minutes 30     # push the plan into the crawl queue
+  python refresh_scheduler.py status
+
+Each scrape records when a page was fetched, how long it took, whether it failed and the review
+dates it contained. Planning estimates how many new reviews each page has gained since its last
+fetch and picks the pages with the most expected new reviews per browser-minute within the budget.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_canonicalizer import canonicalize_url
+
+DEFAULT_SCHEDULE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'refresh_schedule.sqlite3'
+)
+
+REVIEW_DATE_FORMATS = ['%b %d, %Y', '%m/%d/%Y', '%Y-%m-%d']
+SECONDS_PER_DAY = 86400.0
+
+def parse_review_date(value):
+    """Get a review date as a Unix timestamp, or None if it can't be read"""
+    for date_format in REVIEW_DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), date_format).timestamp()
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+def review_arrival_rate(review_times):
+    """Reviews per day implied by the spread of dates on one page"""
+    if len(review_times) < 2:
+        return None
+    span_days = (max(review_times) - min(review_times)) / SECONDS_PER_DAY
+    # Same-day bursts would otherwise look infinitely hot
+    return (len(review_times) - 1) / max(span_days, 1.0)
+
+class RefreshScheduler:
+    """Per-URL fetch history and review arrival estimates in SQLite"""
+
+    def __init__(self, schedule_path=DEFAULT_SCHEDULE_PATH, smoothing=0.3, prior_rate=0.05,
+                 default_fetch_seconds=60.0, page_capacity=10):
+        self.schedule_path = schedule_path
+        # Weight of the newest observation in the moving averages
+        self.smoothing = smoothing
+        # Reviews per day assumed for pages with too few dated reviews
+        self.prior_rate = prior_rate
+        self.default_fetch_seconds = default_fetch_seconds
+        # One fetch can only pick up the reviews shown on the page
+        self.page_capacity = page_capacity
+        os.makedirs(os.path.dirname(os.path.abspath(schedule_path)), exist_ok=True)
+        self.setup_schema()
+
+    def connect(self):
+        """Open a connection that waits for concurrent writers"""
+        connection = sqlite3.connect(self.schedule_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def setup_schema(self):
+        """Create the pages table"""
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    company TEXT,
+                    position TEXT,
+                    added_at REAL NOT NULL,
+                    last_fetch REAL,
+                    last_success REAL,
+                    fetches INTEGER NOT NULL DEFAULT 0,
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    failure_rate REAL NOT NULL DEFAULT 0,
+                    fetch_seconds REAL,
+                    newest_review REAL,
+                    arrival_rate REAL,
+                    reviews_per_fetch REAL,
+                    last_new_reviews INTEGER
+                );
+            """)
+
+    def catalog_url(self, url):
+        """The URL a page is catalogued under: its canonical form, so every variant shares one history"""
+        return canonicalize_url(url) or url
+
+    def add(self, url, company=None, position=None):
+        """Add a URL to the catalog; returns True if it was new"""
+        url = self.catalog_url(url)
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO pages (url, company, position, added_at) VALUES (?, ?, ?, ?)",
+                (url, company, position, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def blend(self, previous, value):
+        """Exponential moving average step"""
+        if previous is None:
+            return value
+        return (1 - self.smoothing) * previous + self.smoothing * value
+
+    def record_fetch(self, url, page_data, fetch_seconds=None):
+        """Record a successful scrape and what it says about the page's review flow"""
+        url = self.catalog_url(url)
+        self.add(url, page_data.get('company'), page_data.get('position'))
+        experiences = page_data.get('interview_experiences', [])
+        review_times = [t for t in (parse_review_date(e.get('date', '')) for e in experiences) if t]
+        now = time.time()
+
+        with self.connect() as connection:
+            row = connection.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+
+            # Reviews newer than the newest one we saw last time are the ones this fetch gained
+            previous_newest = row['newest_review']
+            new_reviews = sum(1 for t in review_times if previous_newest is None or t > previous_newest)
+            newest = max(review_times + ([previous_newest] if previous_newest else [])) if review_times else previous_newest
+
+            arrival_rate = row['arrival_rate']
+            page_rate = review_arrival_rate(review_times)
+            if page_rate is not None:
+                arrival_rate = self.blend(arrival_rate, page_rate)
+            if previous_newest is not None and row['last_success']:
+                # Observed arrivals since the last successful fetch are the best evidence we have
+                elapsed_days = max((now - row['last_success']) / SECONDS_PER_DAY, 1.0 / 24)
+                arrival_rate = self.blend(arrival_rate, new_reviews / elapsed_days)
+
+            connection.execute(
+                """UPDATE pages SET company = COALESCE(?, company), position = COALESCE(?, position),
+                                    last_fetch = ?, last_success = ?, fetches = fetches + 1,
+                                    failure_rate = ?, fetch_seconds = ?, newest_review = ?, arrival_rate = ?,
+                                    reviews_per_fetch = ?, last_new_reviews = ?
+                   WHERE url = ?""",
+                (page_data.get('company'), page_data.get('position'), now, now,
+                 self.blend(row['failure_rate'] if row['fetches'] else None, 0.0),
+                 self.blend(row['fetch_seconds'], fetch_seconds) if fetch_seconds else row['fetch_seconds'],
+                 newest, arrival_rate, self.blend(row['reviews_per_fetch'], len(experiences)),
+                 new_reviews if previous_newest is not None else None, url)
+            )
+        return new_reviews
+
+    def record_failure(self, url, fetch_seconds=None):
+        """Record a failed fetch; failures count against a page's expected yield"""
+        url = self.catalog_url(url)
+        self.add(url)
+        with self.connect() as connection:
+            row = connection.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+            connection.execute(
+                """UPDATE pages SET last_fetch = ?, fetches = fetches + 1, failures = failures + 1,
+                                    failure_rate = ?, fetch_seconds = ?
+                   WHERE url = ?""",
+                (time.time(), self.blend(row['failure_rate'] if row['fetches'] else None, 1.0),
+                 self.blend(row['fetch_seconds'], fetch_seconds) if fetch_seconds else row['fetch_seconds'], url)
+            )
+
+    def estimate(self, row, now=None):
+        """Expected new reviews, cost in browser-minutes and their ratio for fetching a page now"""
+        now = now or time.time()
+        capacity = max(row['reviews_per_fetch'] or self.page_capacity, 1.0)
+        rate = row['arrival_rate'] if row['arrival_rate'] is not None else self.prior_rate
+
+        if row['last_success'] is None:
+            # Never scraped: everything on the page is new to us
+            expected = capacity
+        else:
+            days_stale = (now - row['last_success']) / SECONDS_PER_DAY
+            expected = min(rate * days_stale, capacity)
+
+        expected *= 1.0 - min(row['failure_rate'] or 0.0, 0.95)
+        minutes = (row['fetch_seconds'] or self.default_fetch_seconds) / 60.0
+        return {
+            'url': row['url'],
+            'company': row['company'],
+            'position': row['position'],
+            'expected_new_reviews': expected,
+            'browser_minutes': minutes,
+            'score': expected / minutes if minutes else expected
+        }
+
+    def plan(self, budget_minutes, now=None, min_expected=0.0):
+        """Pick pages greedily by expected new reviews per browser-minute until the budget is spent"""
+        with self.connect() as connection:
+            rows = connection.execute("SELECT * FROM pages").fetchall()
+
+        candidates = [self.estimate(row, now) for row in rows]
+        candidates = [c for c in candidates if c['expected_new_reviews'] > min_expected]
+        candidates.sort(key=lambda c: c['score'], reverse=True)
+
+        selected = []
+        remaining = budget_minutes
+        for candidate in candidates:
+            if candidate['browser_minutes'] <= remaining:
+                selected.append(candidate)
+                remaining -= candidate['browser_minutes']
+        return selected
+
+    def pages(self):
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute("SELECT * FROM pages ORDER BY url")]
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan refresh scrapes by expected new reviews per browser-minute')
+    parser.add_argument('--schedule', default=DEFAULT_SCHEDULE_PATH, help='Schedule database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Add URLs to the catalog')
+    add_parser.add_argument('urls', nargs='*')
+    add_parser.add_argument('--file', help='File with one URL per line')
+
+    subparsers.add_parser('import-manifest', help='Add every URL recorded in the artifact manifest')
+
+    for name, help_text in [('plan', 'Show the next batch'), ('enqueue', 'Push the next batch into the crawl queue')]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--budget-minutes', type=float, default=30.0, help='Browser-minutes to spend')
+        sub.add_argument('--min-expected', type=float, default=0.1,
+                         help='Skip pages expected to have fewer new reviews than this')
+        if name == 'enqueue':
+            sub.add_argument('--queue', help='Crawl queue database (default: scraped_data/crawl_queue.sqlite3)')
+
+    subparsers.add_parser('status', help='Show what is known about each page')
+
+    args = parser.parse_args()
+    scheduler = RefreshScheduler(args.schedule)
+
+    if args.command == 'add':
+        urls = list(args.urls)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                urls.extend(line.strip() for line in f if line.strip())
+        added = sum(1 for url in urls if scheduler.add(url))
+        print(f"📥 Added {added} new URL(s) to the catalog")
+
+    elif args.command == 'import-manifest':
+        from output_manifest import OutputManifest
+        artifacts = OutputManifest().list_artifacts(kind='json')
+        added = sum(1 for a in artifacts if a['url'] and scheduler.add(a['url'], a['company'], a['position']))
+        print(f"📥 Added {added} new URL(s) from the manifest")
+
+    elif args.command in ('plan', 'enqueue'):
+        batch = scheduler.plan(args.budget_minutes, min_expected=args.min_expected)
+        spent = sum(item['browser_minutes'] for item in batch)
+        print(f"🗓️  {len(batch)} page(s), {spent:.1f} of {args.budget_minutes:.1f} browser-minutes, "
+              f"~{sum(item['expected_new_reviews'] for item in batch):.1f} new reviews expected")
+        for item in batch:
+            print(f"   {item['expected_new_reviews']:6.1f} new  {item['browser_minutes']:5.1f} min  "
+                  f"{item['score']:6.2f}/min  {item['url']}")
+
+        if args.command == 'enqueue':
+            from crawl_queue import CrawlQueue, DEFAULT_QUEUE_PATH
+            from entity_registry import page_key
+            queue = CrawlQueue(args.queue or DEFAULT_QUEUE_PATH)
+            # Higher expected yield per minute leases first; the run tag keeps refreshes from deduping
+            # against the same URL's earlier jobs
+            run_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
+            added = sum(1 for rank, item in enumerate(batch)
+                        if queue.enqueue(item['url'], dedupe_key=f"{page_key(item['url'])}#refresh-{run_tag}",
+                                         priority=len(batch) - rank))
+            print(f"📥 Enqueued {added} refresh job(s)")
+
+    elif args.command == 'status':
+        for page in scheduler.pages():
+            last = datetime.fromtimestamp(page['last_success']).strftime('%Y-%m-%d %H:%M') if page['last_success'] else 'never'
+            rate = f"{page['arrival_rate']:.3f}/day" if page['arrival_rate'] is not None else 'unknown'
+            print(f"{last:16}  rate={rate:14}  fail={page['failure_rate']:.2f}  "
+                  f"fetches={page['fetches']:3}  {page['url']}")
+
+if __name__ == "__main__":
+    main()
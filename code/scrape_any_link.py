@@ -12,22 +12,44 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from universal_interview_scraper import UniversalInterviewScraper
 from smart_qa_extractor import SmartQAExtractor
-from docx_generator import generate_docx_from_qa
+from qa_cache import get_qa_cache
+from stage_timer import StageTimer, set_timer
+from url_canonicalizer import canonicalize_url
 
-def scrape_and_generate_docx(url, output_prefix=None):
+def scrape_and_generate_docx(url, output_prefix=None, checkpoint_path=None, scraper=None, memory_limit_mb=None,
+                             base_url=None, http_first=False, extraction_mode='html'):
     """Scrape a Glassdoor interview URL and generate DOCX file"""
+    # Every variant of the page (locale domain, tracking or sort parameters) fetches the same URL
+    url = canonicalize_url(url) or url
     print(f"🚀 Starting scrape for: {url}")
     
-    scraper = UniversalInterviewScraper()
+    # Imported here so importing this module doesn't load selenium or the Chrome driver
+    from universal_interview_scraper import UniversalInterviewScraper
+    from docx_generator import generate_docx_from_qa
+    
+    # A pre-warmed scraper already has its driver running
+    if scraper is None:
+        scraper = UniversalInterviewScraper(checkpoint_path=checkpoint_path, memory_limit_mb=memory_limit_mb,
+                                            base_url=base_url, http_first=http_first,
+                                            extraction_mode=extraction_mode)
     
     try:
-        # Setup driver
-        if not scraper.setup_driver():
+        # Replay pages a crashed run already fetched
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            resumed = scraper.resume_from_checkpoint(checkpoint_path)
+            print(f"♻️  Resumed {resumed} page(s) from checkpoint: {checkpoint_path}")
+        
+        # Setup driver (not needed when the page is already checkpointed or pre-warmed)
+        if not scraper.get_scraped_page(url) and not scraper.driver and not scraper.setup_driver():
             print("❌ Failed to setup Chrome driver")
             return None
         
+        # Enforce --max-memory-mb here too; the multi-URL crawl checks it between pages
+        if not scraper.memory.within_limit():
+            print(f"❌ Memory ceiling reached before fetching: {scraper.memory.format_report()}")
+            return None
+        
         # Scrape the interview page
         print("📊 Scraping interview page...")
         data = scraper.scrape_interview_page(url)
@@ -43,7 +65,7 @@ def scrape_and_generate_docx(url, output_prefix=None):
         # Save to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         json_filename = f'interview_data_{timestamp}.json'
-        json_file = scraper.save_to_json(json_filename)
+        json_file = scraper.save_to_json(json_filename, page_data=data)
         
         if not json_file:
             print("❌ Failed to save JSON file")
@@ -53,7 +75,7 @@ def scrape_and_generate_docx(url, output_prefix=None):
         
         # Extract Q&A pairs
         print("🔍 Extracting questions and answers...")
-        extractor = SmartQAExtractor(json_file)
+        extractor = SmartQAExtractor(json_file, cache=get_qa_cache())
         qa_pairs = extractor.extract_questions_and_answers()
         
         if not qa_pairs:
@@ -62,14 +84,18 @@ def scrape_and_generate_docx(url, output_prefix=None):
         
         print(f"📝 Extracted {len(qa_pairs)} question-answer pairs")
         
+        if not scraper.memory.within_limit():
+            print(f"❌ Memory ceiling reached before rendering the DOCX: {scraper.memory.format_report()}")
+            print(f"   The JSON is saved; render it later with: python code/offline_commands.py render {json_file}")
+            return None
+        
         # Generate DOCX in company-specific folder
         print("📄 Generating DOCX file...")
         company = data['company']
         position = data['position']
         
-        # Create company-specific folder
-        company_folder = os.path.join('scraped_data', company)
-        os.makedirs(company_folder, exist_ok=True)
+        # Write the DOCX into the same company/position shard as the JSON
+        company_folder = os.path.dirname(json_file)
         
         if output_prefix:
             docx_filename = f'{output_prefix}_{company}_{position}_{timestamp}.docx'
@@ -85,6 +111,9 @@ def scrape_and_generate_docx(url, output_prefix=None):
                 os.rename(docx_path, new_docx_path)
                 docx_path = new_docx_path
             
+            scraper.manifest.record_artifact('docx', docx_path, company, position,
+                                             url=data['url'], row_count=len(qa_pairs))
+            
             print(f"✅ DOCX file generated: {docx_path}")
             
             # Show summary
@@ -93,6 +122,8 @@ def scrape_and_generate_docx(url, output_prefix=None):
             print(f"   Position: {position}")
             print(f"   Total Experiences: {data['total_interviews']}")
             print(f"   Q&A Pairs: {len(qa_pairs)}")
+            if scraper.startup_timings:
+                print(f"   Browser Startup: {scraper.format_startup_timings()}")
             print(f"   JSON File: {json_file}")
             print(f"   DOCX File: {docx_path}")
             
@@ -123,17 +154,35 @@ def main():
 Examples:
   python scrape_any_link.py "https://www.glassdoor.com/Interview/Tesla-Software-Engineer-Interview-Questions-EI_IE43129.0,5_KO6,23.htm"
   python scrape_any_link.py "https://www.glassdoor.com/Interview/Google-Software-Engineer-Interview-Questions-EI_IE9079.0,6_KO7,20.htm" --output google_swe
+  python scrape_any_link.py "<url>" --profile --trace logs/trace.json
+  python scrape_any_link.py "<url>" --resume scraped_data/checkpoints/checkpoint_20250916_021104.jsonl
+  python scrape_any_link.py "<url>" --base-url http://127.0.0.1:8765   # against mock_glassdoor_server.py
+  python scrape_any_link.py "<url>" --http-first   # Chrome only if the plain-HTTP fetch is challenged
+  python scrape_any_link.py "<url>" --extraction-mode dom   # read reviews in-page, skip the page source
         """
     )
     
     parser.add_argument('url', help='Glassdoor interview URL to scrape')
     parser.add_argument('--output', '-o', help='Output filename prefix (optional)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--resume', help='Checkpoint log (.jsonl) from an interrupted run to resume from')
+    parser.add_argument('--profile', action='store_true',
+                        help='Dump cProfile stats for the CPU stages (parse, extraction, DOCX render) to logs/')
+    parser.add_argument('--trace', help='Also write stage spans in Chrome trace format to this path')
+    parser.add_argument('--max-memory-mb', type=float,
+                        help='Bounded-memory mode: spill records to disk and enforce this resident-memory ceiling')
+    parser.add_argument('--base-url', help='Fetch pages from this origin instead, e.g. a local mock server '
+                                           '(default: $GLASSDOOR_BASE_URL)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this local port while scraping')
+    parser.add_argument('--http-first', action='store_true',
+                        help='Fetch over plain HTTP and start Chrome only for challenged or incomplete pages')
+    parser.add_argument('--extraction-mode', choices=['html', 'dom'], default='html',
+                        help="'dom' reads reviews with one in-page script instead of parsing the page source")
     
     args = parser.parse_args()
     
     # Validate URL
-    if 'glassdoor.com' not in args.url or 'Interview' not in args.url:
+    if not canonicalize_url(args.url):
         print("❌ Error: Please provide a valid Glassdoor interview URL")
         print("   Example: https://www.glassdoor.com/Interview/Company-Position-Interview-Questions-EI_IE12345.0,5_KO6,23.htm")
         sys.exit(1)
@@ -141,7 +190,30 @@ Examples:
     print("🔧 Universal Glassdoor Interview Scraper")
     print("=" * 50)
     
-    result = scrape_and_generate_docx(args.url, args.output)
+    # Every stage span is written as a JSON line and summarized at the end
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timer = set_timer(StageTimer(os.path.join('logs', f'timings_{timestamp}.jsonl'), profile=args.profile,
+                                 keep_events=bool(args.trace)))
+    if args.metrics_port:
+        from metrics import start_metrics_server
+        start_metrics_server(args.metrics_port)
+        print(f"📈 Metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+    
+    result = scrape_and_generate_docx(args.url, args.output, args.resume, memory_limit_mb=args.max_memory_mb,
+                                      base_url=args.base_url, http_first=args.http_first,
+                                      extraction_mode=args.extraction_mode)
+    
+    print(f"\n⏱️  Stage timings (spans in {timer.output_path}):")
+    print(timer.format_summary())
+    timer.close()
+    
+    if args.trace:
+        print(f"🧭 Chrome trace written: {timer.write_chrome_trace(args.trace)}")
+    
+    if args.profile:
+        profile_path = os.path.join('logs', f'profile_{timestamp}.pstats')
+        print(timer.dump_profile(profile_path))
+        print(f"🔬 Profile written: {profile_path} (open with: python -m pstats {profile_path})")
     
     if result:
         print(f"\n🎉 Scraping completed successfully!")
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Long-running scraper daemon with warm browsers, parse workers and a local job API
+Usage:
+  python scraper_daemon.py serve [--port 8766 | --socket /tmp/glassdoor.sock] [--browsers 2] [--parse-workers 2]
+  python scraper_daemon.py submit <url> [--wait]
+  python scraper_daemon.py status [<job_id>]
+  python scraper_daemon.py fetch <job_id> <artifact_name> [--output path]
+
+API (JSON):
+  POST /jobs                          {"url": "...", "priority": 0, "refresh": false} -> job
+  GET  /jobs/<id>                     -> job
+  GET  /jobs/<id>/artifacts           -> [{"name", "kind", "size"}]
+  GET  /jobs/<id>/artifacts/<name>    -> file contents
+  GET  /status                        -> job counts and browser workers
+  GET  /metrics                       -> Prometheus metrics
+
+Jobs are stored in scraped_data/daemon_jobs.sqlite3, so queued work survives a restart.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import argparse
+import threading
+import http.client
+from datetime import datetime
+from socketserver import ThreadingMixIn, UnixStreamServer
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl_queue import CrawlQueue, LeaseHeartbeat
+from entity_registry import page_key
+from url_canonicalizer import canonicalize_url
+from rate_limiter import AdaptiveRateLimiter
+from browser_session import BrowserSessionStore
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, get_registry, start_metrics_server, watch_queue
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_JOBS_PATH = os.path.join(BASE_DIR, 'scraped_data', 'daemon_jobs.sqlite3')
+DEFAULT_PORT = 8766
+
+class BrowserWorker(threading.Thread):
+    """Owns one warm browser and runs leased jobs through it until the daemon stops"""
+
+    def __init__(self, daemon, index):
+        super().__init__(name=f'browser-worker-{index}', daemon=True)
+        self.scraper_daemon = daemon
+        self.worker_id = f'{daemon.owner_prefix}{index}'
+        self.scraper = None
+        self.current_job = None
+        self.jobs_run = 0
+
+    def start_browser(self):
+        """Start (or restart) this worker's browser; returns True when it is ready"""
+        if self.scraper:
+            self.scraper.close()
+        self.scraper = self.scraper_daemon.create_scraper()
+        if self.scraper.setup_driver():
+            return True
+        self.scraper.close()
+        self.scraper = None
+        return False
+
+    def browser_alive(self):
+        try:
+            return bool(self.scraper and self.scraper.driver and self.scraper.driver.current_url is not None)
+        except Exception:
+            return False
+
+    def run(self):
+        stop = self.scraper_daemon.stop_event
+        queue = self.scraper_daemon.queue
+
+        while not stop.is_set():
+            if not self.browser_alive() and not self.start_browser():
+                print(f"❌ [{self.worker_id}] Chrome failed to start; retrying in 30s")
+                stop.wait(30)
+                continue
+
+            job = queue.lease(self.worker_id, self.scraper_daemon.visibility_timeout)
+            if not job:
+                stop.wait(self.scraper_daemon.poll_interval)
+                continue
+
+            self.current_job = job['id']
+            try:
+                with LeaseHeartbeat(queue, job['id'], self.worker_id, self.scraper_daemon.visibility_timeout) as heartbeat:
+                    result = self.run_job(job)
+                if heartbeat.lost or not queue.complete(job['id'], self.worker_id, result):
+                    print(f"⚠️  [{self.worker_id}] Lease on job {job['id']} was lost before completion")
+            except Exception as e:
+                queue.fail(job['id'], self.worker_id, e)
+                print(f"❌ [{self.worker_id}] Job {job['id']} failed: {e}")
+            finally:
+                self.scraper.clear_pages()
+                self.current_job = None
+                self.jobs_run += 1
+
+        if self.scraper:
+            self.scraper.close()
+
+    def run_job(self, job):
+        """Fetch in this thread's browser, parse in the shared pool, then write JSON and DOCX"""
+        scraper = self.scraper
+        url = job['url']
+        print(f"🔗 [{self.worker_id}] Job {job['id']}: {url}")
+
+        pool = self.scraper_daemon.parse_pool
+        if pool and scraper.extraction_mode == 'html':
+            fetched = scraper.fetch_page_source(url)
+            if not fetched:
+                raise RuntimeError("page failed to load")
+            page_source, html_filename = fetched
+            page_data = pool.submit_file(url, html_filename, datetime.now().isoformat()).result()
+        else:
+            page_data = scraper.fetch_page_data(url)
+            if not page_data:
+                raise RuntimeError("page failed to load")
+        scraper.record_page(page_data)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        saved_files = scraper.save_shards(f'interview_data_{timestamp}_job{job["id"]}.json')
+        json_files = list(saved_files.values())
+        docx_files = []
+        if self.scraper_daemon.render_docx:
+            for json_file in json_files:
+                docx_path = scraper.process_and_generate_docx(json_file)
+                if docx_path:
+                    docx_files.append(docx_path)
+
+        print(f"✅ [{self.worker_id}] Job {job['id']} done: {page_data['total_interviews']} experiences")
+        return {
+            'company': page_data.get('company'),
+            'position': page_data.get('position'),
+            'total_interviews': page_data.get('total_interviews', 0),
+            'json_files': json_files,
+            'docx_files': docx_files
+        }
+
+class ScraperDaemon:
+    """Keeps browsers and parse workers warm and feeds them jobs from a persisted queue"""
+
+    def __init__(self, jobs_path=DEFAULT_JOBS_PATH, browsers=1, parse_workers=0, render_docx=True,
+                 base_dir=None, visibility_timeout=900, poll_interval=1.0, name=None, extraction_mode='html'):
+        self.queue = CrawlQueue(jobs_path)
+        self.browsers = browsers
+        self.parse_workers = parse_workers
+        self.render_docx = render_docx
+        self.extraction_mode = extraction_mode
+        self.base_dir = base_dir or BASE_DIR
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.owner_prefix = f'{name or socket.gethostname()}-daemon-'
+        self.stop_event = threading.Event()
+        self.workers = []
+        self.parse_pool = None
+        self.started_at = None
+
+        # All browsers pace the site together and share one session store
+        self.rate_limiter = AdaptiveRateLimiter(os.path.join(self.base_dir, 'scraped_data', 'rate_limits.json'))
+        self.session_store = BrowserSessionStore(os.path.join(self.base_dir, 'scraped_data', 'browser_sessions.json'))
+
+    def create_scraper(self):
+        from universal_interview_scraper import UniversalInterviewScraper
+        return UniversalInterviewScraper(rate_limiter=self.rate_limiter, base_dir=self.base_dir,
+                                         session_store=self.session_store, extraction_mode=self.extraction_mode)
+
+    def start(self):
+        """Recover jobs a previous run left leased, then start parse workers and browsers"""
+        released = self.queue.release_owned(self.owner_prefix)
+        if released:
+            print(f"♻️  Requeued {released} job(s) interrupted by the last shutdown")
+
+        if self.parse_workers:
+            from parse_workers import ParseWorkerPool
+            self.parse_pool = ParseWorkerPool(self.parse_workers)
+
+        for index in range(self.browsers):
+            worker = BrowserWorker(self, index)
+            worker.start()
+            self.workers.append(worker)
+
+        watch_queue(self.queue, 'daemon')
+        self.started_at = time.time()
+        return self
+
+    def stop(self):
+        """Let running jobs finish, then close browsers and parse workers"""
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join()
+        if self.parse_pool:
+            self.parse_pool.close()
+        self.rate_limiter.save()
+
+    def submit(self, url, priority=0, refresh=False):
+        """Queue a URL; returns the job (an existing one for the same URL unless refresh is set)"""
+        dedupe_key = f'{page_key(url)}#{time.time()}' if refresh else page_key(url)
+        self.queue.enqueue(url, dedupe_key=dedupe_key, priority=priority)
+        return self.queue.find_job(dedupe_key)
+
+    def status(self):
+        return {
+            'uptime': round(time.time() - self.started_at, 1) if self.started_at else 0,
+            'jobs': self.queue.counts(),
+            'parse_workers': self.parse_workers,
+            'browsers': [{
+                'worker_id': worker.worker_id,
+                'alive': worker.is_alive(),
+                'browser_ready': worker.scraper is not None and worker.scraper.driver is not None,
+                'current_job': worker.current_job,
+                'jobs_run': worker.jobs_run
+            } for worker in self.workers]
+        }
+
+def format_job(job):
+    """Job row as returned by the API"""
+    result = json.loads(job['result']) if job.get('result') else None
+    return {
+        'id': job['id'],
+        'url': job['url'],
+        'status': job['status'],
+        'priority': job['priority'],
+        'attempts': job['attempts'],
+        'max_attempts': job['max_attempts'],
+        'last_error': job['last_error'],
+        'result': result,
+        'created_at': job['created_at'],
+        'updated_at': job['updated_at']
+    }
+
+def job_artifacts(job):
+    """Files a finished job produced, keyed by file name"""
+    result = json.loads(job['result']) if job.get('result') else {}
+    artifacts = {}
+    for kind, key in [('json', 'json_files'), ('docx', 'docx_files')]:
+        for path in result.get(key, []):
+            if os.path.exists(path):
+                artifacts[os.path.basename(path)] = (kind, path)
+    return artifacts
+
+class JobAPIHandler(BaseHTTPRequestHandler):
+    server_version = 'GlassdoorScraperDaemon/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def scraper_daemon(self):
+        return self.server.scraper_daemon
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self.send_json(400, {'error': 'body must be JSON'})
+            return
+
+        url = canonicalize_url(payload.get('url'))
+        if not url:
+            self.send_json(400, {'error': 'url must be a Glassdoor interview URL'})
+            return
+
+        job = self.scraper_daemon.submit(url, int(payload.get('priority', 0)), bool(payload.get('refresh')))
+        self.send_json(202, format_job(job))
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+
+        if parts == ['status']:
+            self.send_json(200, self.scraper_daemon.status())
+            return
+
+        if parts == ['metrics']:
+            body = get_registry().render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', METRICS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if len(parts) < 2 or parts[0] != 'jobs' or not parts[1].isdigit():
+            self.send_json(404, {'error': 'not found'})
+            return
+
+        job = self.scraper_daemon.queue.get_job(int(parts[1]))
+        if not job:
+            self.send_json(404, {'error': f'no job {parts[1]}'})
+            return
+
+        if len(parts) == 2:
+            self.send_json(200, format_job(job))
+        elif parts[2:] == ['artifacts']:
+            self.send_json(200, [{'name': name, 'kind': kind, 'size': os.path.getsize(path)}
+                                 for name, (kind, path) in job_artifacts(job).items()])
+        elif len(parts) == 4 and parts[2] == 'artifacts':
+            # Only files recorded on the job can be fetched
+            artifact = job_artifacts(job).get(parts[3])
+            if not artifact:
+                self.send_json(404, {'error': f'no artifact {parts[3]}'})
+                return
+            self.send_file(*artifact)
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def send_json(self, status, data):
+        body = json.dumps(data, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file(self, kind, path):
+        content_type = ('application/json' if kind == 'json' else
+                        'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f'attachment; filename="{os.path.basename(path)}"')
+        self.end_headers()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('local', 0)
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP client connection over a Unix socket"""
+
+    def __init__(self, socket_path, timeout=60):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+def make_api_server(scraper_daemon, host='127.0.0.1', port=DEFAULT_PORT, socket_path=None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, JobAPIHandler)
+        os.chmod(socket_path, 0o600)
+    else:
+        server = ThreadingHTTPServer((host, port), JobAPIHandler)
+        server.daemon_threads = True
+    server.scraper_daemon = scraper_daemon
+    return server
+
+def api_request(args, method, path, payload=None):
+    """Call the daemon API; returns (status, headers, body bytes)"""
+    if args.socket:
+        connection = UnixHTTPConnection(args.socket)
+    else:
+        connection = http.client.HTTPConnection(args.host, args.port, timeout=60)
+    try:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+def serve_command(args):
+    scraper_daemon = ScraperDaemon(args.jobs, args.browsers, args.parse_workers, not args.no_docx,
+                                   args.store, args.visibility_timeout, name=args.name,
+                                   extraction_mode=args.extraction_mode)
+    server = make_api_server(scraper_daemon, args.host, args.port, args.socket)
+    scraper_daemon.start()
+    
+    # The API also serves /metrics; a separate port suits a Prometheus scraper that can't reach a Unix socket
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    # SIGTERM (e.g. from a service manager) shuts down like Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+
+    where = args.socket or f'http://{args.host}:{args.port}'
+    print(f"🛰️  Scraper daemon listening on {where} with {args.browsers} browser(s), "
+          f"{args.parse_workers} parse worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("🛑 Stopping: waiting for running jobs to finish...")
+        server.server_close()
+        scraper_daemon.stop()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+def submit_command(args):
+    status, _, body = api_request(args, 'POST', '/jobs', {'url': args.url, 'priority': args.priority,
+                                                          'refresh': args.refresh})
+    job = json.loads(body)
+    if status != 202:
+        print(f"❌ {job.get('error')}")
+        return 1
+
+    print(f"📥 Job {job['id']}: {job['status']}")
+    while args.wait and job['status'] in ('queued', 'leased'):
+        time.sleep(2)
+        job = json.loads(api_request(args, 'GET', f"/jobs/{job['id']}")[2])
+
+    print(json.dumps(job, indent=2))
+    return 0 if job['status'] != 'dead' else 1
+
+def status_command(args):
+    path = f'/jobs/{args.job_id}' if args.job_id else '/status'
+    status, _, body = api_request(args, 'GET', path)
+    print(json.dumps(json.loads(body), indent=2))
+    return 0 if status == 200 else 1
+
+def fetch_command(args):
+    status, _, body = api_request(args, 'GET', f'/jobs/{args.job_id}/artifacts/{args.name}')
+    if status != 200:
+        print(f"❌ {json.loads(body).get('error')}")
+        return 1
+
+    output = args.output or args.name
+    with open(output, 'wb') as f:
+        f.write(body)
+    print(f"💾 Saved {len(body)} bytes to {output}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Scraper daemon with warm browsers and a local job API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', help='Serve/connect over this Unix socket instead of TCP')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the daemon')
+    serve_parser.add_argument('--browsers', type=int, default=1, help='Warm Chrome instances')
+    serve_parser.add_argument('--parse-workers', type=int, default=0, help='Parse worker processes')
+    serve_parser.add_argument('--jobs', default=DEFAULT_JOBS_PATH, help='Job database path')
+    serve_parser.add_argument('--store', help='Output root (default: this checkout)')
+    serve_parser.add_argument('--visibility-timeout', type=int, default=900, help='Job lease length in seconds')
+    serve_parser.add_argument('--name', help='Daemon name used in lease owners (default: hostname)')
+    serve_parser.add_argument('--no-docx', action='store_true', help='Only write JSON for each job')
+    serve_parser.add_argument('--extraction-mode', choices=['html', 'dom'], default='html',
+                              help="'dom' reads reviews with one in-page script instead of parsing the page source")
+    serve_parser.add_argument('--metrics-port', type=int, help='Also serve Prometheus metrics on this local port')
+    serve_parser.set_defaults(handler=serve_command)
+
+    submit_parser = subparsers.add_parser('submit', help='Submit a URL')
+    submit_parser.add_argument('url')
+    submit_parser.add_argument('--priority', type=int, default=0)
+    submit_parser.add_argument('--refresh', action='store_true', help='Scrape again even if already done')
+    submit_parser.add_argument('--wait', action='store_true', help='Wait for the job to finish')
+    submit_parser.set_defaults(handler=submit_command)
+
+    status_parser = subparsers.add_parser('status', help='Show daemon status or one job')
+    status_parser.add_argument('job_id', nargs='?')
+    status_parser.set_defaults(handler=status_command)
+
+    fetch_parser = subparsers.add_parser('fetch', help='Download a job artifact')
+    fetch_parser.add_argument('job_id')
+    fetch_parser.add_argument('name')
+    fetch_parser.add_argument('--output', '-o')
+    fetch_parser.set_defaults(handler=fetch_command)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import json
 import re
+import hashlib
 from datetime import datetime
 import os
 import sys
@@ -7,10 +8,96 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from stage_timer import get_timer
+
+QUESTION_PREFIXES = [
+    "Question 1",
+    "Question 2",
+    "Question 3",
+    "Question 4",
+    "Question 5",
+    "[1]",
+    "[2]",
+    "[3]",
+    "Interview questions [1]",
+    "Interview questions [2]",
+    "Interview questions [3]"
+]
+
+ANSWER_PATTERNS = [
+    r'I interviewed at Tesla.*?Interview\s*(.+?)(?=Interview questions|$)',
+    r'got the HR call.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'Interviewer was.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'Was asked to.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'Problem quite hard.*?react\s*(.+?)(?=Interview questions|$)',
+    r'Not a simple.*?react\s*(.+?)(?=Interview questions|$)',
+    r'comprehensive and ask.*?react\s*(.+?)(?=Interview questions|$)',
+    r'understanding of.*?react\s*(.+?)(?=Interview questions|$)',
+    r'write a library.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'worded in a way.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'unnecessarily difficult\s*(.+?)(?=Interview questions|$)',
+    r'medium question.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'little bland.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'help me out.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'feel the question.*?difficult\s*(.+?)(?=Interview questions|$)',
+    r'The interview process.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'There was an HR rep.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'engineers at the panel.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'I would recommend.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'practicing leetcode.*?interview\s*(.+?)(?=Interview questions|$)',
+    r'before the interview.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Interview questions.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Question 1.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Leetcode like.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'question about algorithms.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Design a frontend.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'for a system.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Past projects.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'current work.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'hobbies etc.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Tell me about.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'your experience.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'large-scale distributed.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'systems.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'If you were to.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'describe yourself.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'in two words.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'what would they be.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Does a hotdog.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'split lengthwise.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'or widthwise.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'why.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Describe your most.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'difficult problem.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'you solved.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Some hardware.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'related questions.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'Power system.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'and LabView.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'They asked about.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'my experience.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'why I wanna.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'work there.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'I was asked.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'a question on.*?questions\s*(.+?)(?=Interview questions|$)',
+    r'DP.*?questions\s*(.+?)(?=Interview questions|$)'
+]
+
+# Bump when clean_question or extract_answer_from_full_text change in ways the lists above don't show
+EXTRACTOR_REVISION = 1
+
+# Identifies the extraction rules; cached Q&A results from any other version are discarded
+PATTERN_SET_VERSION = hashlib.sha256(
+    json.dumps([EXTRACTOR_REVISION, QUESTION_PREFIXES, ANSWER_PATTERNS]).encode('utf-8')
+).hexdigest()[:16]
+
 class SmartQAExtractor:
-    def __init__(self, json_file_path):
+    def __init__(self, json_file_path=None, pages=None, cache=None):
         self.json_file_path = json_file_path
-        self.data = self.load_json_data()
+        # Optional QACache (see qa_cache.get_qa_cache) that memoizes cleaning and answer extraction
+        self.cache = cache
+        # Page records can be passed in directly (any iterable, e.g. a checkpoint stream)
+        self.data = pages if pages is not None else self.load_json_data()
         self.extracted_qa = []
         
     def load_json_data(self):
@@ -37,21 +124,7 @@ class SmartQAExtractor:
         question = question.strip()
         
         # Remove common prefixes
-        prefixes_to_remove = [
-            "Question 1",
-            "Question 2", 
-            "Question 3",
-            "Question 4",
-            "Question 5",
-            "[1]",
-            "[2]",
-            "[3]",
-            "Interview questions [1]",
-            "Interview questions [2]",
-            "Interview questions [3]"
-        ]
-        
-        for prefix in prefixes_to_remove:
+        for prefix in QUESTION_PREFIXES:
             if question.startswith(prefix):
                 question = question[len(prefix):].strip()
         
@@ -67,66 +140,7 @@ class SmartQAExtractor:
             return "No answer found"
         
         # Look for answer patterns in the full text
-        answer_patterns = [
-            r'I interviewed at Tesla.*?Interview\s*(.+?)(?=Interview questions|$)',
-            r'got the HR call.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'Interviewer was.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'Was asked to.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'Problem quite hard.*?react\s*(.+?)(?=Interview questions|$)',
-            r'Not a simple.*?react\s*(.+?)(?=Interview questions|$)',
-            r'comprehensive and ask.*?react\s*(.+?)(?=Interview questions|$)',
-            r'understanding of.*?react\s*(.+?)(?=Interview questions|$)',
-            r'write a library.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'worded in a way.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'unnecessarily difficult\s*(.+?)(?=Interview questions|$)',
-            r'medium question.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'little bland.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'help me out.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'feel the question.*?difficult\s*(.+?)(?=Interview questions|$)',
-            r'The interview process.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'There was an HR rep.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'engineers at the panel.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'I would recommend.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'practicing leetcode.*?interview\s*(.+?)(?=Interview questions|$)',
-            r'before the interview.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Interview questions.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Question 1.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Leetcode like.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'question about algorithms.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Design a frontend.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'for a system.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Past projects.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'current work.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'hobbies etc.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Tell me about.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'your experience.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'large-scale distributed.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'systems.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'If you were to.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'describe yourself.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'in two words.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'what would they be.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Does a hotdog.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'split lengthwise.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'or widthwise.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'why.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Describe your most.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'difficult problem.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'you solved.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Some hardware.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'related questions.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'Power system.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'and LabView.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'They asked about.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'my experience.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'why I wanna.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'work there.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'I was asked.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'a question on.*?questions\s*(.+?)(?=Interview questions|$)',
-            r'DP.*?questions\s*(.+?)(?=Interview questions|$)'
-        ]
-        
-        for pattern in answer_patterns:
+        for pattern in ANSWER_PATTERNS:
             match = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
             if match:
                 answer = match.group(1).strip()
@@ -157,64 +171,102 @@ class SmartQAExtractor:
         
         return "No specific answer found in the interview experience."
     
-    def extract_questions_and_answers(self):
-        """Extract questions and answers from interview experiences"""
-        print("Extracting questions and answers from interview experiences...")
+    def clean_and_answer(self, full_text, question):
+        """Cleaned question and its answer, served from the cache when this review was seen before"""
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(full_text, question or '')
+            cached = self.cache.get(key)
+            if cached:
+                return cached
+        
+        cleaned_question = self.clean_question(question)
+        # Very short questions are skipped, so their answers are never needed
+        answer = self.extract_answer_from_full_text(full_text, cleaned_question) if len(cleaned_question) >= 10 else ''
+        
+        if key is not None:
+            self.cache.put(key, cleaned_question, answer)
+        return cleaned_question, answer
+    
+    def build_qa_pair(self, experience, question, company, position):
+        """Build the Q&A record for one question of an experience, or None if the question is too short"""
+        full_text = experience.get('full_text', '')
+        cleaned_question, answer = self.clean_and_answer(full_text, question)
+        
+        if len(cleaned_question) < 10:  # Skip very short questions
+            return None
+        
+        return {
+            'question': cleaned_question,
+            'answer': answer,
+            'company': company,
+            'position': position,
+            'experience_index': experience.get('index', 0),
+            'date': experience.get('date', ''),
+            'location': experience.get('location', ''),
+            'outcome': experience.get('outcome', ''),
+            'difficulty': experience.get('difficulty', ''),
+            'experience_rating': experience.get('experience_rating', ''),
+            'source_text': full_text[:200] + '...' if len(full_text) > 200 else full_text
+        }
+    
+    def iter_experience_qa(self, experience, company='Unknown', position='Unknown', seen_questions=None):
+        """Yield unique Q&A pairs from one experience; seen_questions carries deduplication across calls"""
+        full_text = experience.get('full_text', '')
+        questions = experience.get('questions', [])
+        
+        if not full_text or not questions:
+            return
+        
+        for question in questions:
+            qa_pair = self.build_qa_pair(experience, question, company, position)
+            if not qa_pair:
+                continue
+            
+            # Remove duplicates based on question similarity
+            question_key = qa_pair['question'].lower().strip()
+            if len(question_key) <= 10:
+                continue
+            if seen_questions is not None:
+                if question_key in seen_questions:
+                    continue
+                seen_questions.add(question_key)
+            
+            yield qa_pair
+    
+    def iter_questions_and_answers(self, pages=None):
+        """Yield unique Q&A pairs as soon as each one is extracted, without building a full list"""
+        seen_questions = set()
         
-        for page_data in self.data:
+        for page_data in (self.data if pages is None else pages):
             if 'interview_experiences' not in page_data:
                 continue
-                
+            
             company = page_data.get('company', 'Unknown')
             position = page_data.get('position', 'Unknown')
             
             for experience in page_data['interview_experiences']:
-                full_text = experience.get('full_text', '')
-                questions = experience.get('questions', [])
-                
-                if not full_text or not questions:
-                    continue
-                
-                # Process each question
-                for question in questions:
-                    cleaned_question = self.clean_question(question)
-                    
-                    if len(cleaned_question) < 10:  # Skip very short questions
-                        continue
-                    
-                    # Extract answer from full_text
-                    answer = self.extract_answer_from_full_text(full_text, cleaned_question)
-                    
-                    qa_pair = {
-                        'question': cleaned_question,
-                        'answer': answer,
-                        'company': company,
-                        'position': position,
-                        'experience_index': experience.get('index', 0),
-                        'date': experience.get('date', ''),
-                        'location': experience.get('location', ''),
-                        'outcome': experience.get('outcome', ''),
-                        'difficulty': experience.get('difficulty', ''),
-                        'experience_rating': experience.get('experience_rating', ''),
-                        'source_text': full_text[:200] + '...' if len(full_text) > 200 else full_text
-                    }
-                    
-                    self.extracted_qa.append(qa_pair)
-        
-        # Remove duplicates based on question similarity
-        unique_qa = []
-        seen_questions = set()
-        
-        for qa in self.extracted_qa:
-            question_key = qa['question'].lower().strip()
-            if question_key not in seen_questions and len(question_key) > 10:
-                unique_qa.append(qa)
-                seen_questions.add(question_key)
+                yield from self.iter_experience_qa(experience, company, position, seen_questions)
+    
+    def extract_questions_and_answers(self, tag_topics=False):
+        """Extract questions and answers from interview experiences
+
+        tag_topics sets each pair's 'topic' now; otherwise DOCX rendering tags them when it groups
+        by topic, so extraction alone never loads NumPy/SciPy.
+        """
+        with get_timer().span('qa_extraction', cpu=True):
+            print("Extracting questions and answers from interview experiences...")
+            
+            self.extracted_qa = list(self.iter_questions_and_answers())
+            if self.cache is not None:
+                self.cache.flush()
+            print(f"Extracted {len(self.extracted_qa)} unique question-answer pairs")
         
-        self.extracted_qa = unique_qa
-        print(f"Extracted {len(self.extracted_qa)} unique question-answer pairs")
+        if tag_topics:
+            from topic_tagger import ensure_tagged
+            ensure_tagged(self.extracted_qa)
         return self.extracted_qa
-    
+
     def get_statistics(self):
         """Get statistics about extracted Q&A"""
         if not self.extracted_qa:
@@ -224,13 +276,15 @@ class SmartQAExtractor:
         positions = set(qa['position'] for qa in self.extracted_qa)
         difficulties = [qa['difficulty'] for qa in self.extracted_qa if qa['difficulty']]
         outcomes = [qa['outcome'] for qa in self.extracted_qa if qa['outcome']]
+        topics = [qa.get('topic', 'general') for qa in self.extracted_qa]
         
         return {
             'total_qa_pairs': len(self.extracted_qa),
             'companies': list(companies),
             'positions': list(positions),
             'difficulty_distribution': {d: difficulties.count(d) for d in set(difficulties)},
-            'outcome_distribution': {o: outcomes.count(o) for o in set(outcomes)}
+            'outcome_distribution': {o: outcomes.count(o) for o in set(outcomes)},
+            'topic_distribution': {t: topics.count(t) for t in set(topics)}
         }
 
 def main():
@@ -241,7 +295,7 @@ def main():
         return
     
     extractor = SmartQAExtractor(json_file)
-    qa_pairs = extractor.extract_questions_and_answers()
+    qa_pairs = extractor.extract_questions_and_answers(tag_topics=True)
     
     if qa_pairs:
         print(f"\nExtracted {len(qa_pairs)} unique question-answer pairs")
@@ -266,6 +320,7 @@ def main():
         print(f"Positions: {', '.join(stats['positions'])}")
         print(f"Difficulty distribution: {stats['difficulty_distribution']}")
         print(f"Outcome distribution: {stats['outcome_distribution']}")
+        print(f"Topic distribution: {stats['topic_distribution']}")
         
         return qa_pairs
     else:
@@ -0,0 +1,223 @@
+import cProfile
+import json
+import math
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    # Rounding first keeps e.g. 0.7 * 10 = 7.000000000000001 from stepping up a rank
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+# Durations sampled per stage for the percentiles; exact until a stage has this many spans
+RESERVOIR_SIZE = 2048
+
+class StageStats:
+    """Streaming count, total and max of one stage's span durations, plus a bounded reservoir sample"""
+
+    def __init__(self, rng, capacity=RESERVOIR_SIZE):
+        self.rng = rng
+        self.capacity = capacity
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, duration_ms):
+        self.count += 1
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        if len(self.samples) < self.capacity:
+            self.samples.append(duration_ms)
+        else:
+            # Reservoir sampling keeps every span equally likely to be in the sample
+            slot = self.rng.randrange(self.count)
+            if slot < self.capacity:
+                self.samples[slot] = duration_ms
+
+class StageTimer:
+    """Records timing spans per pipeline stage as JSON lines, with optional Chrome trace and cProfile output
+
+    Memory stays bounded in long runs: stages keep streaming aggregates and a fixed-size sample,
+    and individual spans are only held in memory when keep_events is set for a Chrome trace.
+    """
+
+    def __init__(self, output_path=None, profile=False, keep_events=False):
+        self.output_path = output_path
+        self.keep_events = keep_events
+        self.events = []
+        self.stages = {}
+        self.rng = random.Random(0)
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.listeners = []
+
+        # Only CPU-bound spans are profiled, so browser waits don't drown the profile
+        self.profiler = cProfile.Profile() if profile else None
+        self.profile_depth = 0
+
+        self.output_file = None
+        if output_path:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            self.output_file = open(output_path, 'a', encoding='utf-8')
+
+    def add_listener(self, listener):
+        """Call listener(stage, seconds, attrs) whenever a span finishes"""
+        self.listeners.append(listener)
+
+    @contextmanager
+    def span(self, stage, cpu=False, **attrs):
+        """Time a block of work under a stage name"""
+        profiling = self.profiler is not None and cpu and threading.current_thread() is threading.main_thread()
+        if profiling:
+            self.profile_depth += 1
+            if self.profile_depth == 1:
+                self.profiler.enable()
+
+        started = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            elapsed = time.perf_counter() - started
+
+            if profiling:
+                self.profile_depth -= 1
+                if self.profile_depth == 0:
+                    self.profiler.disable()
+
+            self.record(stage, started, elapsed, attrs)
+
+    def record(self, stage, started, elapsed, attrs, pid=None, tid=None):
+        event = {
+            'stage': stage,
+            'start_ms': round((started - self.origin) * 1000, 3),
+            'duration_ms': round(elapsed * 1000, 3),
+            'pid': pid or os.getpid(),
+            'tid': tid or threading.get_ident(),
+            'attrs': attrs
+        }
+
+        with self.lock:
+            if self.keep_events:
+                self.events.append(event)
+            if stage not in self.stages:
+                self.stages[stage] = StageStats(self.rng)
+            self.stages[stage].add(elapsed * 1000)
+            if self.output_file:
+                self.output_file.write(json.dumps(event, default=str) + '\n')
+
+        for listener in self.listeners:
+            listener(stage, elapsed, attrs)
+
+    def merge(self, spans):
+        """Record spans a SpanCollector timed in another process"""
+        for span in spans:
+            self.record(**span)
+
+    def summary(self):
+        """Get count, total and p50/p90/p99/max per stage, in milliseconds"""
+        with self.lock:
+            stages = {stage: (stats.count, stats.total, stats.max, sorted(stats.samples))
+                      for stage, stats in self.stages.items()}
+
+        return {
+            stage: {
+                'count': count,
+                'total_ms': round(total, 3),
+                'p50_ms': round(percentile(samples, 0.50), 3),
+                'p90_ms': round(percentile(samples, 0.90), 3),
+                'p99_ms': round(percentile(samples, 0.99), 3),
+                'max_ms': round(maximum, 3)
+            }
+            for stage, (count, total, maximum, samples) in stages.items()
+        }
+
+    def format_summary(self):
+        """Format the per-stage summary as a table, slowest total first"""
+        lines = [f"{'stage':24} {'count':>6} {'total ms':>11} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for stage, stats in sorted(self.summary().items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{stage:24} {stats['count']:6} {stats['total_ms']:11.1f} {stats['p50_ms']:9.1f} "
+                         f"{stats['p90_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+        return '\n'.join(lines)
+
+    def write_chrome_trace(self, trace_path):
+        """Write spans in Chrome trace format (load in chrome://tracing or Perfetto); needs keep_events"""
+        with self.lock:
+            trace_events = [{
+                'name': event['stage'],
+                'ph': 'X',
+                'ts': event['start_ms'] * 1000,
+                'dur': event['duration_ms'] * 1000,
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': event['attrs']
+            } for event in self.events]
+
+        os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events}, f, default=str)
+        return trace_path
+
+    def dump_profile(self, profile_path, top=25):
+        """Write cProfile stats for the CPU stages and return the top functions as text"""
+        if not self.profiler:
+            return None
+
+        os.makedirs(os.path.dirname(os.path.abspath(profile_path)), exist_ok=True)
+        self.profiler.dump_stats(profile_path)
+
+        from io import StringIO
+        buffer = StringIO()
+        pstats.Stats(profile_path, stream=buffer).sort_stats('cumulative').print_stats(top)
+        return buffer.getvalue()
+
+    def close(self):
+        if self.output_file:
+            self.output_file.close()
+            self.output_file = None
+
+class SpanCollector(StageTimer):
+    """Timer for worker processes: holds raw spans until take() hands them to the parent's merge()
+
+    perf_counter is a system-wide monotonic clock on Linux, so merged spans line up in traces there.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.spans = []
+
+    def record(self, stage, started, elapsed, attrs, pid=None, tid=None):
+        span = {'stage': stage, 'started': started, 'elapsed': elapsed, 'attrs': attrs,
+                'pid': pid or os.getpid(), 'tid': tid or threading.get_ident()}
+        with self.lock:
+            self.spans.append(span)
+
+    def take(self):
+        """Get and clear the spans recorded so far"""
+        with self.lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+# Process-wide timer; modules time their stages through get_timer()
+_timer = StageTimer()
+
+def get_timer():
+    """Get the process-wide stage timer"""
+    return _timer
+
+def set_timer(timer):
+    """Replace the process-wide stage timer (e.g. one that writes to disk or profiles)"""
+    global _timer
+    _timer = timer
+    return timer
@@ -0,0 +1,179 @@
+"""
+Streaming library API: interview experiences and Q&A pairs as iterators, sync or async
+
+    from streaming_api import iter_experiences, iter_qa_pairs, stream_url, JsonLinesSink
+
+    for experience in iter_experiences(page_source, url):
+        ...
+    for qa_pair in iter_qa_pairs(iter_pages('scraped_data/checkpoints/checkpoint_20250916_021104.jsonl')):
+        ...
+
+    async for qa_pair in aiter_qa_pairs(pages):
+        ...
+
+Items are yielded as soon as each one is parsed, so consumers can start on the first results
+while the rest of the page is still being processed and memory stays flat. Every function
+also accepts sinks: callables, or objects with write(item) (and optionally close()).
+"""
+
+import os
+import sys
+import json
+import asyncio
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_page_parser import InterviewPageParser
+from smart_qa_extractor import SmartQAExtractor
+from checkpoint_store import CheckpointStore
+
+class JsonLinesSink:
+    """Append each item to a JSON Lines file"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, item):
+        self.file.write(json.dumps(item, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def tee(items, sinks=None):
+    """Pass items through, handing each one to every sink first"""
+    sinks = [sink for sink in (sinks or []) if sink]
+    try:
+        for item in items:
+            for sink in sinks:
+                if callable(sink):
+                    sink(item)
+                else:
+                    sink.write(item)
+            yield item
+    finally:
+        for sink in sinks:
+            if hasattr(sink, 'close'):
+                sink.close()
+
+def drain(items):
+    """Run a stream for its sinks' side effects; returns how many items went through"""
+    count = 0
+    for _ in items:
+        count += 1
+    return count
+
+def iter_experiences(page_source, url='', parser=None, sinks=None):
+    """Yield the experiences on a page's HTML one at a time"""
+    return tee(_parse_experiences(page_source, url, parser or InterviewPageParser()), sinks)
+
+def _parse_experiences(page_source, url, parser, page_info=None):
+    """Yield experiences; page-level fields go into page_info if given, else onto each experience"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    try:
+        company, position = parser.extract_company_and_position(url, soup)
+        if page_info is not None:
+            title_element = soup.find('title')
+            page_info.update(company=company, position=position,
+                             title=title_element.get_text(strip=True) if title_element else '')
+
+        for experience in parser.iter_interview_experiences(soup):
+            if page_info is None:
+                experience.setdefault('company', company)
+                experience.setdefault('position', position)
+            yield experience
+    finally:
+        soup.decompose()
+
+def iter_pages(path):
+    """Yield page records from scraped JSON (.json) or a checkpoint log (.jsonl)"""
+    if path.endswith('.jsonl'):
+        yield from CheckpointStore(path).iter_pages()
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from (data if isinstance(data, list) else [data])
+
+def iter_qa_pairs(pages, extractor=None, sinks=None):
+    """Yield unique Q&A pairs from page records (any iterable) as each one is extracted"""
+    extractor = extractor or SmartQAExtractor(pages=[])
+    return tee(extractor.iter_questions_and_answers(pages), sinks)
+
+def iter_experience_qa_pairs(experiences, extractor=None, sinks=None):
+    """Yield unique Q&A pairs from a stream of experiences (e.g. straight from iter_experiences)"""
+    extractor = extractor or SmartQAExtractor(pages=[])
+
+    def generate():
+        seen_questions = set()
+        for experience in experiences:
+            yield from extractor.iter_experience_qa(
+                experience, experience.get('company', 'Unknown'), experience.get('position', 'Unknown'),
+                seen_questions
+            )
+
+    return tee(generate(), sinks)
+
+def stream_url(url, scraper, experience_sinks=None, qa_sinks=None):
+    """Fetch a page with a ready scraper and yield ('experience', item) / ('qa', item) as they are parsed
+
+    The page is written to the scraper's checkpoint once it has been streamed, as a normal scrape would.
+    """
+    fetched = scraper.fetch_page_source(url)
+    if not fetched:
+        return
+
+    page_source, _ = fetched
+    scraped_at = datetime.now().isoformat()
+    page_info = {}
+    experiences = []
+    extractor = SmartQAExtractor(pages=[])
+    seen_questions = set()
+
+    parsed = _parse_experiences(page_source, url, scraper.parser, page_info)
+    for experience in tee(parsed, experience_sinks):
+        experiences.append(experience)
+        yield 'experience', experience
+        qa_pairs = extractor.iter_experience_qa(experience, page_info['company'], page_info['position'],
+                                                seen_questions)
+        for qa_pair in tee(qa_pairs, qa_sinks):
+            yield 'qa', qa_pair
+
+    scraper.record_page({
+        'url': url,
+        'scraped_at': scraped_at,
+        'title': page_info.get('title', ''),
+        'company': page_info.get('company', 'Unknown'),
+        'position': page_info.get('position', 'Unknown'),
+        'total_interviews': len(experiences),
+        'interview_experiences': experiences
+    })
+
+_DONE = object()
+
+async def aiterate(items):
+    """Turn a blocking iterator into an async one; each step runs in a worker thread"""
+    iterator = iter(items)
+    while True:
+        item = await asyncio.to_thread(next, iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
+
+def aiter_experiences(page_source, url='', parser=None, sinks=None):
+    """Async version of iter_experiences"""
+    return aiterate(iter_experiences(page_source, url, parser, sinks))
+
+def aiter_qa_pairs(pages, extractor=None, sinks=None):
+    """Async version of iter_qa_pairs"""
+    return aiterate(iter_qa_pairs(pages, extractor, sinks))
+
+def astream_url(url, scraper, experience_sinks=None, qa_sinks=None):
+    """Async version of stream_url; the browser work stays on one worker thread at a time"""
+    return aiterate(stream_url(url, scraper, experience_sinks, qa_sinks))
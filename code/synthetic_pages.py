@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Synthetic Glassdoor-like interview pages for benchmarks and load tests
+Usage: python synthetic_pages.py <num_reviews> [--output page.html] [--json data.json]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import date, timedelta
+from html import escape
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LOCATIONS = ['Palo Alto, CA', 'Austin, TX', 'Fremont, CA', 'Seattle, WA', 'New York, NY', 'Reno, NV', 'Berlin, Germany']
+OUTCOMES = ['No offer', 'Accepted offer', 'Declined offer']
+DIFFICULTIES = ['Easy interview', 'Average interview', 'Difficult interview']
+EXPERIENCES = ['Positive experience', 'Neutral experience', 'Negative experience']
+CHANNELS = ['I applied online', 'I applied through a recruiter', 'I applied through an employee referral',
+            'I applied through college or university']
+
+SYSTEMS = ['URL shortener', 'rate limiter', 'news feed', 'chat service', 'ride sharing backend',
+           'distributed cache', 'telemetry pipeline for vehicles', 'payment system']
+CONCEPTS = [('a process', 'a thread'), ('TCP', 'UDP'), ('a mutex', 'a semaphore'), ('SQL', 'NoSQL'),
+            ('an array', 'a linked list'), ('REST', 'gRPC'), ('a stack', 'a queue')]
+ALGORITHMS = ['LRU cache', 'binary search', 'topological sort', 'merge intervals', 'Dijkstra',
+              'trie autocomplete', 'two sum', 'sliding window maximum']
+LANGUAGES = ['Python', 'C++', 'Java', 'JavaScript', 'Go']
+BEHAVIORS = ['disagreed with your manager', 'missed a deadline', 'led a project under pressure',
+             'had to learn a new technology quickly', 'resolved a production outage']
+
+QUESTION_TEMPLATES = [
+    lambda rng: f"How would you design a {rng.choice(SYSTEMS)}?",
+    lambda rng: "What is the difference between {} and {}?".format(*rng.choice(CONCEPTS)),
+    lambda rng: f"Implement {rng.choice(ALGORITHMS)} in {rng.choice(LANGUAGES)}.",
+    lambda rng: f"Tell me about a time you {rng.choice(BEHAVIORS)}.",
+    lambda rng: "Describe your most difficult project and why it was hard.",
+    lambda rng: "Why do you want to work at this company and what would you improve?",
+    lambda rng: f"Explain how {rng.choice(ALGORITHMS)} works and its time complexity.",
+    lambda rng: f"Leetcode like question about {rng.choice(ALGORITHMS)} with follow ups."
+]
+
+PROCESS_SENTENCES = [
+    "The interview process started with a recruiter phone screen.",
+    "Then there was a technical phone interview with an engineer on the team.",
+    "The onsite had four rounds including coding, system design and behavioral.",
+    "The interviewers were friendly but the pace was fast.",
+    "I was asked to share my screen and code in a shared editor.",
+    "There was an HR rep at the end who explained the next steps.",
+    "I would recommend practicing leetcode medium questions before the interview.",
+    "The hiring manager asked a lot about past projects and current work."
+]
+
+def generate_reviews(num_reviews, company='Tesla', position='Software Engineer', seed=0):
+    """Generate review records deterministically from a seed"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    reviews = []
+
+    for index in range(num_reviews):
+        review_date = start - timedelta(days=rng.randint(0, 1500))
+        location = rng.choice(LOCATIONS)
+        questions = [rng.choice(QUESTION_TEMPLATES)(rng) for _ in range(rng.randint(1, 3))]
+        process = ' '.join(rng.sample(PROCESS_SENTENCES, rng.randint(2, 5)))
+
+        reviews.append({
+            'index': index + 1,
+            'title': f'{position} Interview',
+            'date': review_date.strftime('%b %d, %Y').replace(' 0', ' '),
+            'location': location,
+            'outcome': rng.choice(OUTCOMES),
+            'experience': rng.choice(EXPERIENCES),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'application': f"{rng.choice(CHANNELS)}. The process took {rng.randint(1, 8)} weeks.",
+            'interview': f"I interviewed at {company} ({location}) in {review_date.strftime('%b %Y')}. {process}",
+            'questions': questions
+        })
+
+    return reviews
+
+def review_text(review):
+    """Get the visible text of a review the way it reads on the page"""
+    parts = [
+        review['title'],
+        review['date'],
+        f"Anonymous Interview Candidate in {review['location']}",
+        review['outcome'],
+        review['experience'],
+        review['difficulty'],
+        'Application',
+        review['application'],
+        'Interview',
+        review['interview'],
+        f"Interview questions [{len(review['questions'])}]"
+    ]
+    for number, question in enumerate(review['questions'], 1):
+        parts.append(f"Question {number}")
+        parts.append(question)
+        parts.append('Answer questionHelpfulShare')
+    return '\n'.join(parts)
+
+def render_review(review):
+    """Render one review container like Glassdoor's markup"""
+    questions_html = ''.join(
+        f'<li><span class="question-label">Question {number}</span>'
+        f'<p class="interview-question">{escape(question)}</p>'
+        f'<button>Answer question</button><button>Helpful</button><button>Share</button></li>'
+        for number, question in enumerate(review['questions'], 1)
+    )
+    return (
+        '<div data-test="InterviewReview" class="interview-details review-container">'
+        f'<h3 class="review-title">{escape(review["title"])}</h3>'
+        f'<span class="timestamp">{review["date"]}</span>'
+        f'<div class="author">Anonymous Interview Candidate in {escape(review["location"])}</div>'
+        f'<div class="outcomes"><span>{review["outcome"]}</span><span>{review["experience"]}</span>'
+        f'<span>{review["difficulty"]}</span></div>'
+        f'<h4 class="section-header">Application</h4><p>{escape(review["application"])}</p>'
+        f'<h4 class="section-header">Interview</h4><p class="interview-process">{escape(review["interview"])}</p>'
+        f'<h4 class="section-header">Interview questions [{len(review["questions"])}]</h4>'
+        f'<ul>{questions_html}</ul>'
+        '</div>'
+    )
+
+def page_href(base_href, number):
+    """Link to a results page the way Glassdoor paginates (page 1 is the plain URL, then _IP2.htm, ...)"""
+    if not base_href:
+        return f'?page={number}'
+    return f'{base_href}.htm' if number == 1 else f'{base_href}_IP{number}.htm'
+
+def render_interview_page(reviews, company='Tesla', position='Software Engineer', page_number=1,
+                          total_pages=1, padding_kb=0, base_href=None):
+    """Render a full interview page; padding_kb adds inert markup to mimic Glassdoor's page weight"""
+    title = f'{company} {position} Interview Questions | Glassdoor'
+    pagination = ''.join(
+        f'<a class="page" href="{page_href(base_href, number)}">{number}</a>' for number in range(1, total_pages + 1)
+    )
+    padding = f'<script type="application/json" id="apollo-state">{"x" * (padding_kb * 1024)}</script>' if padding_kb else ''
+
+    return (
+        '<!DOCTYPE html><html><head>'
+        f'<title>{escape(title)}</title><meta charset="utf-8"></head><body>'
+        f'<header><h1>{escape(company)} {escape(position)} Interview Questions</h1>'
+        f'<div class="count">{len(reviews)} interview questions and {len(reviews)} interview reviews</div></header>'
+        f'<main id="interviews" data-page="{page_number}">'
+        + ''.join(render_review(review) for review in reviews) +
+        f'</main><nav class="pagination">{pagination}</nav>{padding}'
+        '</body></html>'
+    )
+
+def build_page_record(reviews, url, company='Tesla', position='Software Engineer'):
+    """Build the scraped JSON record for the same reviews, as the scraper would save it"""
+    experiences = []
+    for review in reviews:
+        experiences.append({
+            'index': review['index'],
+            'title': review['title'],
+            'date': review['date'],
+            'location': review['location'],
+            'outcome': review['outcome'].lower(),
+            'difficulty': review['difficulty'].split()[0].lower(),
+            'experience_rating': review['experience'].split()[0].lower(),
+            'interview_process': '',
+            'questions': list(review['questions']),
+            'advice': '',
+            'full_text': review_text(review)
+        })
+
+    return {
+        'url': url,
+        'scraped_at': '2024-01-01T00:00:00',
+        'title': f'{company} {position} Interview Questions | Glassdoor',
+        'company': company,
+        'position': position,
+        'total_interviews': len(experiences),
+        'interview_experiences': experiences
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Glassdoor-like interview page')
+    parser.add_argument('num_reviews', type=int)
+    parser.add_argument('--company', default='Tesla')
+    parser.add_argument('--position', default='Software Engineer')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the HTML page here')
+    parser.add_argument('--json', help='Write the matching scraped JSON here')
+    args = parser.parse_args()
+
+    reviews = generate_reviews(args.num_reviews, args.company, args.position, args.seed)
+    html = render_interview_page(reviews, args.company, args.position)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"📄 Wrote {args.num_reviews} reviews ({len(html) / 1024:.0f} KB) to {args.output}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([build_page_record(reviews, 'https://www.glassdoor.com/Interview/synthetic.htm',
+                                         args.company, args.position)], f, indent=2)
+        print(f"💾 Wrote matching scraped JSON to {args.json}")
+    if not args.output and not args.json:
+        print(html)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Plain-HTTP fast path for interview pages, with Chrome only as the fallback
+Usage: python tiered_fetcher.py <url> [<url> ...] [--concurrency 8] [--base-url http://127.0.0.1:8765]
+
+Pages are first requested through one pooled async HTTP client: keep-alive connections, HTTP/2
+when httpx and h2 are installed (aiohttp over HTTP/1.1 otherwise), and a cookie jar seeded with
+the cookies and user agent of saved browser sessions. A response is only used when it isn't a
+challenge page and already has review markup - the same checks wait_for_page_load makes in
+Chrome. Anything else escalates to the browser, and a host that keeps escalating skips the HTTP
+tier for a cooldown period.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import threading
+import importlib.util
+from urllib.parse import urlsplit
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interview_page_parser import is_challenge_page, has_review_markup
+
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/120.0.0.0 Safari/537.36')
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+def http2_available():
+    return bool(importlib.util.find_spec('httpx') and importlib.util.find_spec('h2'))
+
+def classify_response(status, page_source, expect_reviews=True):
+    """None when a response can replace a browser fetch, otherwise why it has to escalate"""
+    if is_challenge_page(page_source):
+        return 'challenge'
+    if status >= 400 or not page_source.strip():
+        return 'error'
+    if expect_reviews and not has_review_markup(page_source):
+        return 'no_reviews'
+    return None
+
+class HttpFetcher:
+    """Pooled keep-alive HTTP client running on its own event loop thread
+
+    fetch() can be called from any thread; fetch_many() runs a batch concurrently over the
+    same connections, at most `concurrency` requests at a time.
+    """
+
+    def __init__(self, session_store=None, concurrency=8, timeout=20, http2=True):
+        self.session_store = session_store
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.backend = 'httpx' if http2 and http2_available() else 'aiohttp'
+        self.client = None
+        self.semaphore = None
+        # saved_at of the browser session last copied into the cookie jar, per host
+        self.synced_sessions = {}
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='http-fetcher', daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def open_client(self):
+        if self.client is not None:
+            return self.client
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        if self.backend == 'httpx':
+            import httpx
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency,
+                                  keepalive_expiry=60)
+            self.client = httpx.AsyncClient(http2=True, limits=limits, timeout=self.timeout,
+                                            headers=DEFAULT_HEADERS, follow_redirects=True)
+        else:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60, ttl_dns_cache=300)
+            # unsafe=True keeps cookies for IP hosts such as the local mock server
+            self.client = aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS,
+                                                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                                cookie_jar=aiohttp.CookieJar(unsafe=True))
+        return self.client
+
+    def sync_cookies(self, url):
+        """Copy a host's saved browser cookies into the jar whenever the browser saved a newer session"""
+        if not self.session_store:
+            return
+        host = self.session_store.host_key(url)
+        session = self.session_store.sessions.get(host)
+        if not session or self.synced_sessions.get(host) == session.get('saved_at'):
+            return
+        self.synced_sessions[host] = session.get('saved_at')
+
+        cookies = {cookie['name']: cookie['value'] for cookie in self.session_store.get_cookies(url)}
+        if self.backend == 'httpx':
+            for name, value in cookies.items():
+                self.client.cookies.set(name, value, domain=urlsplit(url).hostname)
+        else:
+            from yarl import URL
+            self.client.cookie_jar.update_cookies(cookies, response_url=URL(url))
+
+    def user_agent(self, url):
+        # Clearance cookies are only honoured with the user agent that earned them
+        return (self.session_store and self.session_store.get_user_agent(url)) or DEFAULT_USER_AGENT
+
+    async def fetch_async(self, url):
+        """GET a page; returns (status, page_source, protocol)"""
+        client = await self.open_client()
+        self.sync_cookies(url)
+        headers = {'User-Agent': self.user_agent(url)}
+
+        async with self.semaphore:
+            if self.backend == 'httpx':
+                response = await client.get(url, headers=headers)
+                return response.status_code, response.text, response.http_version
+            async with client.get(url, headers=headers) as response:
+                page_source = await response.text(errors='replace')
+                return response.status, page_source, f'HTTP/{response.version.major}.{response.version.minor}'
+
+    def fetch(self, url):
+        return self.run(self.fetch_async(url))
+
+    def fetch_many(self, urls):
+        """Fetch several pages concurrently; failed requests come back as their exception"""
+        async def fetch_all():
+            return await asyncio.gather(*(self.fetch_async(url) for url in urls), return_exceptions=True)
+        return self.run(fetch_all())
+
+    def close(self):
+        if self.client is not None:
+            close = self.client.aclose() if self.backend == 'httpx' else self.client.close()
+            self.run(close)
+            self.client = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+class TieredFetcher:
+    """Tries the HTTP tier first and tells the caller when a page needs the browser"""
+
+    def __init__(self, session_store=None, http_fetcher=None, escalation_limit=3, cooldown=600, logger=None):
+        self.http = http_fetcher or HttpFetcher(session_store)
+        self.escalation_limit = escalation_limit
+        self.cooldown = cooldown
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        # Consecutive escalations and HTTP-tier pause deadline, per host
+        self.escalation_streaks = {}
+        self.paused_until = {}
+        self.stats = {'http': 0, 'challenge': 0, 'no_reviews': 0, 'error': 0, 'paused': 0}
+
+    def host_paused(self, host):
+        with self.lock:
+            if self.paused_until.get(host, 0) > time.time():
+                self.stats['paused'] += 1
+                return True
+            return False
+
+    def record(self, host, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+            if outcome == 'http':
+                self.escalation_streaks[host] = 0
+                return
+            streak = self.escalation_streaks.get(host, 0) + 1
+            self.escalation_streaks[host] = streak
+            if streak >= self.escalation_limit:
+                # A browser fetch in the meantime may save fresh cookies that get the HTTP tier through again
+                self.paused_until[host] = time.time() + self.cooldown
+                self.escalation_streaks[host] = 0
+                self.logger.info(f"HTTP tier escalated {streak} times in a row for {host}; "
+                                 f"using the browser for {self.cooldown:.0f}s")
+
+    def try_http(self, url, expect_reviews=True):
+        """Fetch a page over plain HTTP; returns (page_source, reason, status)
+
+        page_source is None when the page has to go to the browser, and reason says why: 'paused',
+        'error', 'challenge' or 'no_reviews'. status is None when no response arrived.
+        """
+        host = urlsplit(url).netloc.lower()
+        if self.host_paused(host):
+            return None, 'paused', None
+
+        started = time.time()
+        try:
+            status, page_source, protocol = self.http.fetch(url)
+        except Exception as e:
+            self.record(host, 'error')
+            self.logger.info(f"HTTP tier failed for {url} ({e}); escalating to the browser")
+            return None, 'error', None
+
+        reason = classify_response(status, page_source, expect_reviews)
+        self.record(host, reason or 'http')
+        if reason:
+            self.logger.info(f"HTTP tier got {reason} ({status}) for {url}; escalating to the browser")
+            return None, reason, status
+
+        self.logger.info(f"Fetched over {protocol} in {time.time() - started:.2f}s "
+                         f"({len(page_source)} characters), no browser needed")
+        return page_source, None, status
+
+    def close(self):
+        self.http.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Check which interview pages the plain-HTTP tier can fetch')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--base-url', help='Fetch from this origin instead, e.g. a local mock server')
+    parser.add_argument('--sessions', help='Browser session file (default: scraped_data/browser_sessions.json)')
+    args = parser.parse_args()
+
+    from browser_session import BrowserSessionStore
+
+    urls = args.urls
+    if args.base_url:
+        urls = [args.base_url.rstrip('/') + urlsplit(url).path for url in urls]
+
+    fetcher = HttpFetcher(BrowserSessionStore(args.sessions), concurrency=args.concurrency)
+    print(f"🌐 HTTP tier: {fetcher.backend}{' (HTTP/2)' if fetcher.backend == 'httpx' else ''}")
+    started = time.time()
+    try:
+        results = fetcher.fetch_many(urls)
+    finally:
+        fetcher.close()
+
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            print(f"❌ {url}: {result}")
+            continue
+        status, page_source, protocol = result
+        reason = classify_response(status, page_source)
+        verdict = f"needs the browser ({reason})" if reason else "complete"
+        print(f"{'✅' if not reason else '🧭'} {url}: {status} {protocol}, {len(page_source)} characters, {verdict}")
+    print(f"⏱️  {len(urls)} page(s) in {time.time() - started:.2f}s")
+
+if __name__ == "__main__":
+    main()
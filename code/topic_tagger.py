@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Topic tagging of interview questions (coding, system design, CS fundamentals, behavioral, domain-specific)
+Usage:
+  python topic_tagger.py tag <qa.json>                         # add a 'topic' to every Q&A pair in place
+  python topic_tagger.py train <labelled.jsonl> --output scraped_data/topic_model.npz
+  python topic_tagger.py bench --count 1000000                 # throughput on synthetic questions
+
+Questions are vectorized in batches as hashed TF-IDF rows of a SciPy sparse matrix and scored
+against one centroid per topic in a single sparse product. The default centroids come from the
+keyword lists below; train builds them from labelled questions ({"question": ..., "topic": ...}
+per line) instead. Questions that match no topic well enough are tagged 'general'.
+
+NumPy and SciPy are imported where vectors are built, so the labels don't load them and
+group_by_topic() (used by DOCX rendering) only does when some pairs still need a topic.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stage_timer import get_timer
+
+TOPIC_KEYWORDS = {
+    'coding': [
+        'algorithm', 'algorithms', 'leetcode', 'coding', 'code', 'implement', 'write a function', 'array',
+        'arrays', 'string', 'strings', 'linked list', 'binary tree', 'tree', 'graph', 'dynamic programming', 'dp', 'recursion',
+        'sort', 'sorting', 'binary search', 'hash map', 'hashmap', 'data structure', 'data structures',
+        'stack', 'queue', 'heap', 'matrix', 'palindrome', 'reverse', 'time complexity', 'big o',
+        'python', 'java', 'c++', 'sql query', 'substring', 'integer', 'integers', 'bfs', 'dfs', 'two sum'
+    ],
+    'system_design': [
+        'system design', 'design a', 'design an', 'design the', 'scalable', 'scale', 'scaling',
+        'distributed', 'large-scale', 'architecture', 'database', 'cache', 'caching', 'load balancer',
+        'microservices', 'api', 'throughput', 'latency', 'url shortener', 'high level design',
+        'low level design', 'sharding', 'availability', 'consistency', 'message queue', 'backend', 'storage'
+    ],
+    'fundamentals': [
+        'tcp', 'udp', 'tcp ip', 'http', 'https', 'dns', 'ip address', 'osi model', 'network', 'networking',
+        'socket', 'sockets', 'router', 'handshake', 'packet', 'packets', 'tls', 'ssl', 'bandwidth',
+        'operating system', 'operating systems', 'kernel', 'processes', 'thread', 'threads', 'multithreading',
+        'concurrency', 'deadlock', 'mutex', 'semaphore', 'race condition', 'virtual memory', 'paging',
+        'memory management', 'context switch', 'garbage collection', 'interrupt', 'linux', 'unix', 'cpu scheduling'
+    ],
+    'behavioral': [
+        'tell me about', 'yourself', 'a time when', 'time you', 'conflict', 'challenge', 'weakness',
+        'strength', 'strengths', 'why do you want', 'why are you', 'why this', 'team', 'teammate',
+        'leadership', 'mistake', 'failure', 'proud', 'motivation', 'motivates', 'describe a situation',
+        'manager', 'deadline', 'hobbies', 'in two words', 'describe yourself', 'past projects',
+        'your experience', 'work there', 'wanna work', 'most difficult problem', 'career', 'goals', 'salary'
+    ],
+    'domain': [
+        'hardware', 'circuit', 'circuits', 'power system', 'power systems', 'labview', 'battery', 'embedded',
+        'firmware', 'mechanical', 'electrical', 'signal', 'voltage', 'current', 'manufacturing', 'physics',
+        'thermal', 'controls', 'motor', 'sensor', 'react', 'frontend', 'javascript', 'css', 'html',
+        'machine learning', 'neural network', 'statistics', 'probability', 'finance', 'accounting',
+        'autopilot', 'vehicle', 'materials', 'cad'
+    ]
+}
+
+# Fallback for questions no centroid scores at least min_score against
+GENERAL_TOPIC = 'general'
+
+# Display order and section titles for reports
+TOPIC_LABELS = {
+    'coding': 'Coding & Algorithms',
+    'system_design': 'System Design',
+    'fundamentals': 'CS Fundamentals',
+    'behavioral': 'Behavioral',
+    'domain': 'Domain-Specific',
+    GENERAL_TOPIC: 'General'
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:'[a-z]+)?")
+
+# Kept inside bigrams ("tell me", "design a") but too common to count on their own
+STOP_WORDS = frozenset([
+    'a', 'an', 'the', 'to', 'of', 'and', 'or', 'in', 'on', 'at', 'for', 'with', 'is', 'are', 'was', 'be',
+    'you', 'your', 'me', 'my', 'i', 'it', 'its', 'what', 'how', 'do', 'does', 'did', 'that', 'this', 'there'
+])
+
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scraped_data', 'topic_model.npz'
+)
+
+class HashingVectorizer:
+    """Unigram + bigram features hashed into a fixed number of columns (stable across processes)"""
+
+    def __init__(self, n_features=2 ** 18):
+        self.n_features = n_features
+        # Vocabularies repeat heavily across questions; memoizing the hash keeps tokenization cheap
+        self.index_cache = {}
+
+    def feature_index(self, token):
+        index = self.index_cache.get(token)
+        if index is None:
+            index = zlib.crc32(token.encode('utf-8')) % self.n_features
+            if len(self.index_cache) < 1000000:
+                self.index_cache[token] = index
+        return index
+
+    def features(self, text):
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        return [t for t in tokens if t not in STOP_WORDS] + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+
+    def counts(self, texts):
+        """Sparse term counts, one row per text"""
+        import numpy as np
+        import scipy.sparse as sp
+
+        feature_index = self.feature_index
+        columns = []
+        indptr = [0]
+        for text in texts:
+            columns.extend(feature_index(token) for token in self.features(text or ''))
+            indptr.append(len(columns))
+
+        indices = np.asarray(columns, dtype=np.int32)
+        data = np.ones(len(indices), dtype=np.float32)
+        matrix = sp.csr_matrix((data, indices, np.asarray(indptr, dtype=np.int64)),
+                               shape=(len(indptr) - 1, self.n_features))
+        matrix.sum_duplicates()
+        return matrix
+
+def tfidf(counts, idf=None):
+    """Sublinear TF, times IDF (smoothed, from the batch itself unless given), L2-normalized rows"""
+    import numpy as np
+
+    matrix = counts.copy()
+    matrix.data = 1.0 + np.log(matrix.data)
+    if idf is None:
+        document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        idf = np.log((1.0 + matrix.shape[0]) / (1.0 + document_frequency)) + 1.0
+    matrix.data *= idf[matrix.indices].astype(np.float32)
+    return normalize_rows(matrix)
+
+def normalize_rows(matrix):
+    import numpy as np
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr)).astype(matrix.data.dtype)
+    return matrix
+
+class TopicTagger:
+    """Nearest-centroid topic classifier over hashed TF-IDF vectors"""
+
+    def __init__(self, topics=None, centroids=None, n_features=2 ** 18, min_score=0.02):
+        self.vectorizer = HashingVectorizer(n_features)
+        self.min_score = min_score
+        if centroids is None:
+            topics, centroids = self.keyword_centroids(TOPIC_KEYWORDS)
+        self.topics = list(topics)
+        self.centroids = centroids
+
+    def keyword_centroids(self, keywords):
+        """One L2-normalized centroid per topic from its keyword phrases"""
+        import numpy as np
+        import scipy.sparse as sp
+
+        topics = list(keywords)
+        # Phrases are vectorized separately so no bigram spans two of them
+        rows = [sp.csr_matrix(self.vectorizer.counts(keywords[topic]).sum(axis=0)) for topic in topics]
+        centroids = sp.vstack(rows).tocsr().astype(np.float32)
+        centroids.data = np.ones_like(centroids.data)
+        return topics, normalize_rows(centroids)
+
+    def fit(self, questions, labels):
+        """Replace the centroids with the mean TF-IDF vector of each topic's labelled questions"""
+        import numpy as np
+        import scipy.sparse as sp
+
+        vectors = tfidf(self.vectorizer.counts(questions))
+        labels = np.asarray(labels)
+        self.topics = sorted(set(labels) - {GENERAL_TOPIC})
+        rows = []
+        for topic in self.topics:
+            members = vectors[np.flatnonzero(labels == topic)]
+            rows.append(sp.csr_matrix(members.mean(axis=0)))
+        self.centroids = normalize_rows(sp.vstack(rows).tocsr().astype(np.float32))
+        return self
+
+    def save(self, path):
+        import numpy as np
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        centroids = self.centroids.tocsr()
+        np.savez_compressed(path, topics=np.asarray(self.topics), data=centroids.data, indices=centroids.indices,
+                            indptr=centroids.indptr, shape=np.asarray(centroids.shape),
+                            min_score=np.asarray(self.min_score))
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+        import scipy.sparse as sp
+
+        saved = np.load(path)
+        shape = tuple(saved['shape'])
+        centroids = sp.csr_matrix((saved['data'], saved['indices'], saved['indptr']), shape=shape)
+        return cls([str(topic) for topic in saved['topics']], centroids, n_features=shape[1], min_score=float(saved['min_score']))
+
+    def scores(self, questions):
+        """Cosine similarity of each question to each topic centroid (dense, questions x topics)"""
+        vectors = tfidf(self.vectorizer.counts(questions))
+        return (vectors @ self.centroids.T).toarray()
+
+    def tag(self, questions):
+        """Topic for each question in one batch"""
+        if not questions:
+            return []
+        import numpy as np
+
+        scores = self.scores(questions)
+        best = scores.argmax(axis=1)
+        confident = scores[np.arange(len(questions)), best] >= self.min_score
+        return [self.topics[index] if ok else GENERAL_TOPIC for index, ok in zip(best, confident)]
+
+_tagger = None
+
+def get_tagger():
+    """Process-wide tagger: the trained model at TOPIC_MODEL_PATH if set, else keyword centroids"""
+    global _tagger
+    if _tagger is None:
+        model_path = os.environ.get('TOPIC_MODEL_PATH')
+        _tagger = TopicTagger.load(model_path) if model_path else TopicTagger()
+    return _tagger
+
+def tag_qa_pairs(qa_pairs, tagger=None, batch_size=50000):
+    """Set 'topic' on every Q&A pair, vectorizing batch_size questions at a time"""
+    tagger = tagger or get_tagger()
+    for start in range(0, len(qa_pairs), batch_size):
+        batch = qa_pairs[start:start + batch_size]
+        for qa_pair, topic in zip(batch, tagger.tag([qa.get('question', '') for qa in batch])):
+            qa_pair['topic'] = topic
+    return qa_pairs
+
+def iter_tagged(qa_pairs, tagger=None, batch_size=1000):
+    """Tag a stream of Q&A pairs (e.g. from streaming_api) in batches, yielding them in order"""
+    batch = []
+    for qa_pair in qa_pairs:
+        batch.append(qa_pair)
+        if len(batch) >= batch_size:
+            yield from tag_qa_pairs(batch, tagger, batch_size)
+            batch = []
+    if batch:
+        yield from tag_qa_pairs(batch, tagger, batch_size)
+
+def ensure_tagged(qa_pairs, tagger=None):
+    """Tag the pairs that have no 'topic' yet; NumPy and SciPy only load when there are some"""
+    untagged = [qa_pair for qa_pair in qa_pairs if 'topic' not in qa_pair]
+    if untagged:
+        with get_timer().span('topic_tagging', cpu=True, qa_pairs=len(untagged)):
+            tag_qa_pairs(untagged, tagger)
+    return qa_pairs
+
+def group_by_topic(qa_pairs):
+    """[(topic, pairs)] in TOPIC_LABELS order, then any other topics, skipping empty ones
+
+    Pairs extracted without topics are tagged first.
+    """
+    ensure_tagged(qa_pairs)
+    groups = {}
+    for qa_pair in qa_pairs:
+        groups.setdefault(qa_pair.get('topic') or GENERAL_TOPIC, []).append(qa_pair)
+    order = [topic for topic in TOPIC_LABELS if topic in groups] + sorted(set(groups) - set(TOPIC_LABELS))
+    return [(topic, groups[topic]) for topic in order]
+
+def synthetic_questions(count, seed=0):
+    """Questions assembled from the keyword lists, for throughput checks"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    templates = ['How would you {}?', 'Tell me about {}.', 'Explain {} and when you would use it.',
+                 'Write code to handle {} efficiently.', 'What is your approach to {}?']
+    phrases = [phrase for keywords in TOPIC_KEYWORDS.values() for phrase in keywords]
+    picks = rng.integers(0, len(phrases), size=(count, 2))
+    shapes = rng.integers(0, len(templates), size=count)
+    return [templates[shape].format(f'{phrases[a]} with {phrases[b]}') for shape, (a, b) in zip(shapes, picks)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Tag interview questions by topic')
+    parser.add_argument('--model', help='Trained centroids (.npz) to use instead of the keyword centroids')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    tag_parser = subparsers.add_parser('tag', help="Add a 'topic' to each pair of a Q&A JSON file")
+    tag_parser.add_argument('qa_file')
+
+    train_parser = subparsers.add_parser('train', help='Build centroids from labelled questions')
+    train_parser.add_argument('labelled_file', help='JSON Lines with question and topic fields')
+    train_parser.add_argument('--output', default=DEFAULT_MODEL_PATH)
+
+    bench_parser = subparsers.add_parser('bench', help='Tag synthetic questions and report throughput')
+    bench_parser.add_argument('--count', type=int, default=1000000)
+    bench_parser.add_argument('--batch-size', type=int, default=50000)
+
+    args = parser.parse_args()
+    tagger = TopicTagger.load(args.model) if args.model else TopicTagger()
+
+    if args.command == 'tag':
+        from checkpoint_store import atomic_write_json
+
+        with open(args.qa_file, 'r', encoding='utf-8') as f:
+            qa_pairs = json.load(f)
+        tag_qa_pairs(qa_pairs, tagger)
+        atomic_write_json(args.qa_file, qa_pairs)
+        for topic, pairs in group_by_topic(qa_pairs):
+            print(f"{TOPIC_LABELS.get(topic, topic):22} {len(pairs)}")
+
+    elif args.command == 'train':
+        with open(args.labelled_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        tagger.fit([r['question'] for r in records], [r['topic'] for r in records])
+        tagger.save(args.output)
+        print(f"🏷️  Trained {len(tagger.topics)} topic centroid(s) from {len(records)} question(s): {args.output}")
+
+    elif args.command == 'bench':
+        qa_pairs = [{'question': question} for question in synthetic_questions(args.count)]
+        started = time.perf_counter()
+        tag_qa_pairs(qa_pairs, tagger, args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"🏷️  Tagged {args.count} questions in {elapsed:.1f}s ({args.count / elapsed:,.0f}/s)")
+
+if __name__ == "__main__":
+    main()
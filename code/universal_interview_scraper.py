@@ -1,69 +1,223 @@
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
 import time
-import random
-import json
 import logging
 from datetime import datetime
 import os
 import sys
-import re
 import argparse
+import itertools
 from urllib.parse import urlparse
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from question_answer_extractor import QuestionAnswerExtractor
-from docx_generator import generate_docx_from_qa
+# Browser, Chrome driver and DOCX modules are imported where they are first used, so
+# importing this module (e.g. for replay or re-rendering) stays cheap
+from smart_qa_extractor import SmartQAExtractor
+from qa_cache import get_qa_cache
+from checkpoint_store import CheckpointStore
+from output_manifest import OutputManifest, shard_dir, shard_key, save_pages_to_shards
+from interview_page_parser import InterviewPageParser, REVIEW_CONTAINER_SELECTOR, is_challenge_page
+from rate_limiter import AdaptiveRateLimiter, THROTTLE_STATUS_CODES
+from browser_session import BrowserSessionStore
+from driver_startup import ChromedriverCache, detect_chrome_major
+from memory_monitor import MemoryMonitor
+from stage_timer import StageTimer, get_timer, set_timer
+from parse_workers import ParseWorkerPool
+from log_setup import setup_logging
+from refresh_scheduler import RefreshScheduler
+from metrics import get_scrape_metrics, watch_stage_timer, start_metrics_server
+from entity_registry import get_entity_registry, page_key
 
-# Setup logging
-def setup_logging():
-    """Setup comprehensive logging"""
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f'logs/universal_scraper_{timestamp}.log'
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
-    
-    logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized. Log file: {log_filename}")
-    return logger
+# Numbers the default checkpoint logs of the scrapers in this process
+_checkpoint_ids = itertools.count(1)
 
 class UniversalInterviewScraper:
-    def __init__(self):
-        self.logger = setup_logging()
+    def __init__(self, checkpoint_path=None, rate_limiter=None, render_wait=5, base_dir=None,
+                 session_store=None, profile_dir=None, bounded_memory=False, memory_limit_mb=None,
+                 base_url=None, http_first=False, extraction_mode='html'):
+        # Logging is set up once per process; later scrapers reuse the same log file
+        setup_logging('universal_scraper')
+        self.logger = logging.getLogger(__name__)
         self.driver = None
+        self.render_wait = render_wait
+        self.last_page_challenged = False
+        self.last_page_source = None
+        # 'dom' reads reviews with one in-page script instead of transferring and parsing the page source
+        self.extraction_mode = extraction_mode
+        self.last_dom_result = None
+        
+        # Bounded-memory mode keeps only page summaries in memory; full records live in the checkpoint
+        self.bounded_memory = bounded_memory or bool(memory_limit_mb)
+        self.memory = MemoryMonitor(memory_limit_mb)
+        self.parser = InterviewPageParser(self.logger)
         self.scraped_data = []
-        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Scraped pages by page_key, so URL variants of a page are found without scanning scraped_data
+        self.pages_by_key = {}
+        # Outputs go under base_dir/scraped_data; workers on several hosts can share one base_dir
+        self.base_dir = base_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        
+        # Every parsed page is written through to an append log so a crash keeps it
+        if not checkpoint_path:
+            # Workers and daemon threads starting together on one store each get their own log
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            checkpoint_name = f'checkpoint_{timestamp}_{os.getpid()}_{next(_checkpoint_ids)}.jsonl'
+            checkpoint_path = os.path.join(self.base_dir, 'scraped_data', 'checkpoints', checkpoint_name)
+        self.checkpoint = CheckpointStore(checkpoint_path)
+        self.logger.info(f"Checkpoint log: {checkpoint_path}")
+        self.manifest = OutputManifest(os.path.join(self.base_dir, 'scraped_data', 'manifest.sqlite3'))
+        
+        # Employer IDs in the URLs map every slug variant to one cached company/position name
+        self.entities = get_entity_registry(os.path.join(self.base_dir, 'scraped_data', 'entities.sqlite3'))
+        
+        # Fetch outcomes and review dates feed the refresh scheduler's staleness estimates
+        self.refresh_schedule = RefreshScheduler(os.path.join(self.base_dir, 'scraped_data', 'refresh_schedule.sqlite3'))
+        self.fetch_seconds = {}
+        
+        # Shared limiter instances let several scrapers pace the same host together
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(
+            os.path.join(self.base_dir, 'scraped_data', 'rate_limits.json')
+        )
+        
+        # Cookies and storage from browsers that passed the challenge are reused by new drivers
+        self.session_store = session_store or BrowserSessionStore(
+            os.path.join(self.base_dir, 'scraped_data', 'browser_sessions.json')
+        )
+        self.profile_dir = profile_dir
+        self.session_refreshed_at = {}
+        
+        # Send navigation to another origin (e.g. the local mock server) while records keep the real URL
+        self.base_url = (base_url or os.environ.get('GLASSDOOR_BASE_URL') or '').rstrip('/') or None
+        if self.base_url:
+            self.logger.info(f"Fetching pages from {self.base_url} instead of their own host")
+        self.driver_cache = ChromedriverCache()
+        self.startup_timings = {}
+        
+        # Pages that arrive complete over plain HTTP never start Chrome; the browser is the fallback
+        self.tiered_fetcher = None
+        if http_first:
+            from tiered_fetcher import TieredFetcher
+            self.tiered_fetcher = TieredFetcher(self.session_store, logger=self.logger)
+        
+        # Counters and stage latencies for the metrics endpoint, if one is running
+        self.metrics = get_scrape_metrics()
+        watch_stage_timer(get_timer())
         self.logger.info("UniversalInterviewScraper initialized")
+    
+    def resume_from_checkpoint(self, checkpoint_path=None):
+        """Replay pages from the checkpoint log into scraped_data
+
+        With a checkpoint_path (e.g. a pre-warmed scraper resuming an earlier run), the scraper
+        switches to that log first, so replayed and newly scraped pages end up in one file. The log
+        is compacted first, so pages re-scraped by earlier resumes are replayed once.
+        """
+        if checkpoint_path and os.path.abspath(checkpoint_path) != os.path.abspath(self.checkpoint.checkpoint_path):
+            self.checkpoint = CheckpointStore(checkpoint_path)
+            self.logger.info(f"Checkpoint log: {checkpoint_path}")
+        
+        if os.path.exists(self.checkpoint.checkpoint_path):
+            self.checkpoint.compact()
+        
+        resumed = 0
+        for page in self.checkpoint.iter_pages():
+            resumed += 1
+            if not self.get_scraped_page(page.get('url', '')):
+                self.keep_page(self.summarize_page(page) if self.bounded_memory else page)
+        
+        self.logger.info(f"Resumed {resumed} pages from checkpoint {self.checkpoint.checkpoint_path}")
+        return resumed
+    
+    def summarize_page(self, page_data):
+        """Get a page record without its experiences, for bounded-memory mode"""
+        return {key: value for key, value in page_data.items() if key != 'interview_experiences'}
+    
+    def get_scraped_page(self, url):
+        """Get an already scraped page by URL (or another URL for the same entity page), if any"""
+        return self.pages_by_key.get(page_key(url))
+    
+    def clear_pages(self):
+        """Forget scraped pages once they are saved, so the next job starts empty"""
+        self.scraped_data = []
+        self.pages_by_key = {}
+    
+    def keep_page(self, page_data):
+        """Add a page (or its summary) to scraped_data and the lookup index"""
+        self.scraped_data.append(page_data)
+        self.pages_by_key[page_key(page_data.get('url', ''))] = page_data
+    
+    def apply_entity(self, page_data):
+        """Replace a page's parsed names with the canonical ones for its employer ID"""
+        entity = self.entities.resolve(page_data['url'], page_data.get('title'))
+        if entity:
+            page_data['company'] = self.parser.clean_company_name(entity['company'])
+            page_data['position'] = entity['position'] or page_data.get('position', 'Unknown')
+            page_data['employer_id'] = entity['employer_id']
+            page_data['entity_key'] = entity['entity_key']
+        return page_data
         
     def setup_driver(self):
         """Setup undetected Chrome driver with minimal options"""
+        if self.tiered_fetcher:
+            self.logger.info("HTTP-first mode: Chrome starts on the first page that needs it")
+            return True
+        return self.ensure_driver()
+    
+    def ensure_driver(self):
+        """Start the Chrome driver unless it is already running; returns True when it is ready"""
+        if self.driver:
+            return True
+        with get_timer().span('driver_setup'):
+            return self.start_driver()
+    
+    def driver_alive(self):
+        """Check whether Chrome still answers; with none started yet, only HTTP-first mode is fine"""
+        if not self.driver:
+            return self.tiered_fetcher is not None
+        try:
+            return self.driver.current_url is not None
+        except Exception:
+            return False
+    
+    def restart_driver(self):
+        """Quit a crashed or wedged Chrome and set up a fresh one; returns True when it is ready"""
+        self.logger.info("Restarting Chrome driver...")
+        self.quit_driver()
+        return self.setup_driver()
+    
+    def start_driver(self):
+        """Start the Chrome driver; returns True on success"""
         self.logger.info("Setting up undetected Chrome driver...")
         
         try:
+            import undetected_chromedriver as uc
+            
             # Use minimal options to avoid compatibility issues
             options = uc.ChromeOptions()
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
             options.add_argument('--window-size=1920,1080')
             
+            # Reuse a patched chromedriver pinned to the installed Chrome build
+            chrome_kwargs = {}
+            chrome_major = detect_chrome_major()
+            if chrome_major:
+                driver_path, patch_seconds = self.driver_cache.prepare(chrome_major)
+                chrome_kwargs['driver_executable_path'] = driver_path
+                chrome_kwargs['version_main'] = chrome_major
+                self.startup_timings['patch'] = patch_seconds
+            
+            # A persistent profile keeps its own cookies between launches
+            if self.profile_dir:
+                chrome_kwargs['user_data_dir'] = self.profile_dir
+            
             # Create driver
-            self.driver = uc.Chrome(options=options)
+            launch_started = time.time()
+            self.driver = uc.Chrome(options=options, **chrome_kwargs)
+            self.startup_timings['launch'] = time.time() - launch_started
+            self.metrics.browsers.inc()
+            
+            restored_hosts = self.session_store.restore(self.driver)
+            if restored_hosts:
+                self.logger.info(f"Restored saved browser sessions for: {', '.join(restored_hosts)}")
             
             self.logger.info("Chrome driver setup completed successfully")
             return True
@@ -72,27 +226,61 @@ class UniversalInterviewScraper:
             self.logger.error(f"Failed to setup Chrome driver: {e}")
             return False
     
-    def wait_for_page_load(self, timeout=30):
-        """Wait for page to load completely"""
+    def format_startup_timings(self):
+        """Format the patch/launch/first navigation breakdown"""
+        return ', '.join(f"{stage} {self.startup_timings[stage]:.2f}s"
+                         for stage in ['patch', 'launch', 'first_navigation'] if stage in self.startup_timings)
+    
+    def wait_for_review_markup(self, max_wait):
+        """Poll until review containers appear, for at most max_wait seconds"""
+        from selenium.webdriver.common.by import By
+        
+        deadline = time.time() + max_wait
+        while time.time() < deadline:
+            if self.driver.find_elements(By.CSS_SELECTOR, REVIEW_CONTAINER_SELECTOR):
+                return True
+            time.sleep(0.5)
+        return False
+    
+    def wait_for_page_load(self, timeout=30, read_dom=False):
+        """Wait for page to load completely
+
+        read_dom runs the in-page review read (DOM extraction mode only); callers that only want
+        the page source, such as landing pages and session refreshes, skip the script.
+        """
         self.logger.info("Waiting for page to load...")
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             # Wait for body element
             WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Additional wait for dynamic content
-            time.sleep(5)
+            # Wait for review markup to render instead of a fixed delay
+            self.wait_for_review_markup(self.render_wait)
             
-            # Check if we're still on a challenge page
-            page_source = self.driver.page_source.lower()
-            if any(indicator in page_source for indicator in [
-                "cloudflare", "checking your browser", "just a moment", 
-                "ddos protection", "security check"
-            ]):
-                self.logger.info("Challenge page detected, waiting longer...")
-                time.sleep(10)
+            # Check if we're still on a challenge page; the limiter decides how long to back off.
+            # The source (or in DOM mode, the in-page review read) is kept so it isn't read twice.
+            if read_dom and self.extraction_mode == 'dom':
+                from dom_extraction import read_reviews, is_challenge_result
+                self.last_dom_result = read_reviews(self.driver)
+                self.last_page_challenged = is_challenge_result(self.last_dom_result)
+            else:
+                with get_timer().span('page_source'):
+                    self.last_page_source = self.driver.page_source
+                self.last_page_challenged = is_challenge_page(self.last_page_source)
+            if self.last_page_challenged:
+                self.last_page_source = None
+                self.last_dom_result = None
+                self.metrics.challenges.inc()
+                backoff = self.rate_limiter.record_challenge(self.driver.current_url)
+                self.logger.info(f"Challenge page detected, backing off {backoff:.0f}s...")
+                time.sleep(backoff)
             
             self.logger.info("Page loaded successfully")
             return True
@@ -106,375 +294,345 @@ class UniversalInterviewScraper:
     
     def extract_company_and_position(self, url, soup):
         """Extract company and position from URL and page content"""
-        # Extract from URL
-        url_parts = url.split('/')
-        company = "Unknown"
-        position = "Unknown"
-        
-        # Look for company and position in URL
-        for part in url_parts:
-            if 'Interview' in part:
-                # Extract company and position from URL pattern
-                # Example: Tesla-Software-Engineer-Interview-Questions
-                if '-' in part:
-                    parts = part.split('-')
-                    if len(parts) >= 3:
-                        company = parts[0]
-                        position = ' '.join(parts[1:-2])  # Everything between company and "Interview"
-        
-        # Try to extract from page title
-        title_element = soup.find('title')
-        if title_element:
-            title = title_element.get_text()
-            # Pattern: "Company Position Interview Questions | Glassdoor"
-            if 'Interview Questions' in title:
-                title_parts = title.split('Interview Questions')[0].strip()
-                if '|' in title_parts:
-                    title_parts = title_parts.split('|')[0].strip()
-                
-                # Split by common separators
-                for separator in [' ', '-', '_']:
-                    if separator in title_parts:
-                        parts = title_parts.split(separator)
-                        if len(parts) >= 2:
-                            company = parts[0]
-                            position = ' '.join(parts[1:])
-                        break
-        
-        # Clean company name for folder usage
-        company = self.clean_company_name(company)
-        
-        return company, position
+        return self.parser.extract_company_and_position(url, soup)
     
     def clean_company_name(self, company):
         """Clean company name for use in folder names"""
-        if not company or company == "Unknown":
-            return "Unknown"
-        
-        # Remove special characters and normalize
-        import re
-        company = re.sub(r'[^\w\s-]', '', company)
-        company = re.sub(r'\s+', '_', company.strip())
-        company = company.replace('__', '_')
-        
-        return company
+        return self.parser.clean_company_name(company)
     
     def extract_interview_experiences(self, soup):
         """Extract detailed interview experiences from the page"""
-        self.logger.info("Extracting interview experiences...")
-        
-        experiences = []
-        
-        # Look for interview experience containers
-        experience_selectors = [
-            'div[data-test="InterviewReview"]',
-            '.interview-review',
-            '.review-container',
-            'div[class*="interview"]',
-            'div[class*="review"]',
-            'article[class*="interview"]',
-            'section[class*="interview"]'
-        ]
-        
-        for selector in experience_selectors:
-            elements = soup.select(selector)
-            if elements:
-                self.logger.info(f"Found {len(elements)} elements with selector: {selector}")
-                
-                for i, element in enumerate(elements):
-                    try:
-                        experience = self.parse_interview_experience(element, i+1)
-                        if experience:
-                            experiences.append(experience)
-                            self.logger.info(f"Extracted experience {i+1}: {experience.get('title', 'No title')[:50]}...")
-                    except Exception as e:
-                        self.logger.error(f"Error parsing experience {i+1}: {e}")
-                        continue
-                
-                if experiences:
-                    break
-        
-        # If no specific containers found, try to extract from general content
-        if not experiences:
-            self.logger.info("No specific interview containers found, trying general extraction...")
-            experiences = self.extract_from_general_content(soup)
-        
-        self.logger.info(f"Total experiences extracted: {len(experiences)}")
-        return experiences
-    
-    def parse_interview_experience(self, element, index):
-        """Parse individual interview experience"""
-        experience = {
-            'index': index,
-            'title': '',
-            'date': '',
-            'location': '',
-            'outcome': '',
-            'difficulty': '',
-            'experience_rating': '',
-            'interview_process': '',
-            'questions': [],
-            'advice': '',
-            'full_text': ''
-        }
-        
-        # Extract title/header
-        title_selectors = ['h3', 'h4', '.title', '.header', '[class*="title"]', '[class*="header"]']
-        for selector in title_selectors:
-            title_elem = element.select_one(selector)
-            if title_elem:
-                experience['title'] = title_elem.get_text(strip=True)
-                break
-        
-        # Extract date
-        date_patterns = [
-            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}',
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{4}-\d{2}-\d{2}'
-        ]
-        
-        text = element.get_text()
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                experience['date'] = match.group()
-                break
-        
-        # Extract location
-        location_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z]{2})',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s+[A-Z][a-z]+)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text)
-            if match:
-                experience['location'] = match.group()
-                break
-        
-        # Extract outcome
-        outcome_keywords = ['offer', 'no offer', 'declined', 'accepted', 'rejected']
-        for keyword in outcome_keywords:
-            if keyword.lower() in text.lower():
-                experience['outcome'] = keyword
-                break
-        
-        # Extract difficulty
-        difficulty_keywords = ['difficult', 'easy', 'average', 'hard', 'medium']
-        for keyword in difficulty_keywords:
-            if keyword.lower() in text.lower():
-                experience['difficulty'] = keyword
-                break
-        
-        # Extract experience rating
-        rating_patterns = [
-            r'(positive|negative|neutral)\s+experience',
-            r'experience.*?(positive|negative|neutral)'
-        ]
-        
-        for pattern in rating_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                experience['experience_rating'] = match.group(1).lower()
-                break
-        
-        # Extract questions from text
-        questions = self.extract_questions_from_text(text)
-        experience['questions'] = questions
-        
-        # Extract full text
-        experience['full_text'] = text
-        
-        return experience
+        return self.parser.extract_interview_experiences(soup)
     
     def extract_questions_from_text(self, text):
         """Extract interview questions from text"""
-        questions = []
-        
-        # Look for specific question patterns in Glassdoor format
-        question_patterns = [
-            r'Question\s+\d+[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Question\s+\d+|$)',
-            r'Q\d*[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Q\d*|$)',
-            r'Interview questions?\s*\[?\d*\]?\s*[:\-]?\s*(.+?)(?=Answer question|Helpful|Share|Interview|$)',
-            r'What\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'How\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Why\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Describe\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Explain\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Tell me about\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'If you were to\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Does\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Some\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'They asked about\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'I was asked\s+(.+?)(?=\?|Answer question|Helpful|Share|$)',
-            r'Leetcode like\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Design a\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Past projects\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'current work\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'hobbies etc\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Tell me about your experience\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'large-scale distributed\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'If you were to describe yourself\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Does a hotdog\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Describe your most difficult\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Some hardware related\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'Power system and LabView\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'They asked about my experience\s+(.+?)(?=Answer question|Helpful|Share|$)',
-            r'I was asked a question on\s+(.+?)(?=Answer question|Helpful|Share|$)'
-        ]
-        
-        for pattern in question_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                question = match.strip()
-                if len(question) > 10 and len(question) < 500:
-                    # Clean up the question
-                    question = question.replace("Answer questionHelpfulShare", "")
-                    question = question.replace("HelpfulShare", "")
-                    question = re.sub(r'\s+', ' ', question)
-                    questions.append(question)
-        
-        # Remove duplicates and clean up
-        questions = list(set(questions))
-        questions = [q.strip() for q in questions if q.strip()]
-        
-        return questions[:10]  # Limit to 10 questions per experience
-    
-    def extract_from_general_content(self, soup):
-        """Extract experiences from general page content"""
-        experiences = []
-        
-        # Get all text and split into potential interview experiences
-        all_text = soup.get_text()
-        
-        # Look for interview experience indicators
-        experience_indicators = [
-            'I interviewed at',
-            'Interview process',
-            'Interview questions',
-            'Software Engineer Interview',
-            'Anonymous Interview Candidate'
-        ]
-        
-        # Split text into sections
-        sections = re.split(r'\n\s*\n', all_text)
-        
-        current_experience = None
-        for section in sections:
-            section = section.strip()
-            if not section or len(section) < 50:
-                continue
-            
-            # Check if this section contains interview experience
-            if any(indicator in section for indicator in experience_indicators):
-                if current_experience:
-                    experiences.append(current_experience)
-                
-                current_experience = {
-                    'index': len(experiences) + 1,
-                    'title': 'Interview Experience',
-                    'date': '',
-                    'location': '',
-                    'outcome': '',
-                    'difficulty': '',
-                    'experience_rating': '',
-                    'interview_process': '',
-                    'questions': [],
-                    'advice': '',
-                    'full_text': section
-                }
-            elif current_experience:
-                # Continue building current experience
-                current_experience['full_text'] += '\n\n' + section
-        
-        if current_experience:
-            experiences.append(current_experience)
-        
-        return experiences
+        return self.parser.extract_questions_from_text(text)
+    
+    def persist_session(self, url):
+        """Save the browser session after a clean page load when it changed or is close to expiring"""
+        try:
+            if self.session_store.save_if_changed(self.driver, url):
+                self.logger.info(f"Browser session saved for {self.session_store.host_key(url)}")
+        except Exception as e:
+            self.logger.warning(f"Could not save browser session: {e}")
+    
+    def refresh_session(self, url):
+        """Renew a session that is about to expire by revisiting the site's landing page"""
+        parsed = urlparse(url)
+        landing_url = f'{parsed.scheme}://{parsed.netloc}/'
+        self.logger.info(f"Browser session for {parsed.netloc} expires soon, refreshing via {landing_url}")
+        
+        self.rate_limiter.acquire(landing_url)
+        self.driver.get(landing_url)
+        if self.wait_for_page_load() and not self.last_page_challenged:
+            self.session_store.save(self.driver, landing_url)
+    
+    def refresh_session_if_due(self, url):
+        """Renew a saved session ahead of its expiry rather than hitting a challenge mid-crawl"""
+        host = self.session_store.host_key(url)
+        if (self.session_store.is_valid(url) and self.session_store.needs_refresh(url)
+                and time.time() - self.session_refreshed_at.get(host, 0) > self.session_store.refresh_margin):
+            self.session_refreshed_at[host] = time.time()
+            self.refresh_session(url)
+    
+    def resolve_url(self, url):
+        """Get the URL to navigate to, honouring the base-URL override"""
+        if not self.base_url:
+            return url
+        parsed = urlparse(url)
+        target = self.base_url + (parsed.path or '/')
+        if parsed.query:
+            target += '?' + parsed.query
+        return target
+    
+    def fetch_over_http(self, page_url, url, expect_reviews=True):
+        """Try the plain-HTTP tier; returns the page source, or None to use the browser
+
+        The caller has already waited for the rate limiter; the browser fetch that follows an
+        escalation is part of the same page and only waits again after a 429 or 503.
+        """
+        started = time.time()
+        with get_timer().span('http_fetch', url=url):
+            page_source, reason, status = self.tiered_fetcher.try_http(url, expect_reviews)
+        if page_source is None:
+            if reason == 'challenge':
+                # Slow the host down, but let Chrome try the page now: it may get through the challenge
+                self.metrics.challenges.inc()
+                self.rate_limiter.record_challenge(url)
+            elif reason == 'error':
+                self.metrics.fetch_errors.inc()
+                self.rate_limiter.record_error(url, status)
+                if status in THROTTLE_STATUS_CODES:
+                    # The host is throttling; Chrome would hit the same limit, so wait out the back-off first
+                    waited = self.rate_limiter.acquire(url)
+                    self.logger.info(f"HTTP tier got {status}; waited {waited:.1f}s before trying the browser")
+            return None
+        
+        self.metrics.pages_fetched.inc()
+        self.rate_limiter.record_success(url, time.time() - started)
+        self.fetch_seconds[page_url] = time.time() - started
+        self.last_page_challenged = False
+        return page_source
+    
+    def fetch_page_source(self, url, expect_reviews=True):
+        """Fetch a page (over plain HTTP if it arrives complete, else in Chrome); returns its source and saved HTML path
+
+        expect_reviews=False accepts HTTP responses without review markup, e.g. employer landing pages.
+        """
+        if not self.load_page(url, expect_reviews):
+            return None
+        return self.read_loaded_page()
+    
+    def read_loaded_page(self):
+        """Get the loaded page's source (reusing the copy read during the load check) and its saved HTML path"""
+        page_source = self.last_page_source if self.last_page_source is not None else self.driver.page_source
+        self.last_page_source = None
+        self.last_dom_result = None
+        self.logger.info(f"Page source length: {len(page_source)} characters")
+        
+        return page_source, self.save_html(page_source)
+    
+    def fetch_page_data(self, url):
+        """Fetch a page and parse it into a page record
+
+        In DOM extraction mode the reviews were already read in the browser during the load
+        check, so the page source is only transferred when that script found no review containers.
+        """
+        if not self.load_page(url, read_dom=True):
+            return None
+        
+        dom_result, self.last_dom_result = self.last_dom_result, None
+        if dom_result and dom_result.get('reviews'):
+            from dom_extraction import page_data_from_dom, result_size
+            self.last_page_source = None
+            self.logger.info(f"Read {len(dom_result['reviews'])} reviews in-page ({result_size(dom_result)} characters, "
+                             f"{dom_result.get('expanded', 0)} sections expanded)")
+            return page_data_from_dom(url, dom_result, self.parser)
+        
+        # HTML mode, pages served by the HTTP tier, or nothing for the script to read
+        page_source, html_filename = self.read_loaded_page()
+        return self.parser.parse_page(url, page_source)
+    
+    def load_page(self, url, expect_reviews=True, read_dom=False):
+        """Load a page over plain HTTP or in Chrome; returns True once it is loaded
+
+        The HTTP tier and the browser's load check leave the page source in last_page_source,
+        or with read_dom in DOM extraction mode the in-page review read in last_dom_result.
+        """
+        page_url = url
+        url = self.resolve_url(url)
+        self.last_page_source = None
+        self.last_dom_result = None
+        
+        if self.driver:
+            self.refresh_session_if_due(url)
+        
+        # Wait for the host's rate limiter once per page, whichever tier fetches it
+        waited = self.rate_limiter.acquire(url)
+        if waited:
+            self.logger.info(f"Rate limiter delayed the fetch by {waited:.1f}s")
+        
+        if self.tiered_fetcher:
+            page_source = self.fetch_over_http(page_url, url, expect_reviews)
+            if page_source is not None:
+                self.last_page_source = page_source
+                return True
+            if not self.driver:
+                if not self.ensure_driver():
+                    raise RuntimeError("Chrome driver failed to start for a page the HTTP tier couldn't fetch")
+                self.refresh_session_if_due(url)
+        
+        # Navigate to the page
+        self.logger.info("Navigating to page...")
+        started = time.time()
+        try:
+            with get_timer().span('navigation', url=url):
+                self.driver.get(url)
+            if 'first_navigation' not in self.startup_timings:
+                self.startup_timings['first_navigation'] = time.time() - started
+                self.logger.info(f"Startup timings: {self.format_startup_timings()}")
+            with get_timer().span('readiness_wait', url=url):
+                loaded = self.wait_for_page_load(read_dom=read_dom)
+        except Exception:
+            self.rate_limiter.record_error(url)
+            self.metrics.fetch_errors.inc()
+            self.refresh_schedule.record_failure(page_url, time.time() - started)
+            raise
+        
+        if not loaded:
+            self.rate_limiter.record_error(url)
+            self.metrics.fetch_errors.inc()
+            self.refresh_schedule.record_failure(page_url, time.time() - started)
+            self.logger.error("Page failed to load properly")
+            return False
+        
+        self.metrics.pages_fetched.inc()
+        if not self.last_page_challenged:
+            self.rate_limiter.record_success(url, time.time() - started)
+            self.persist_session(url)
+            self.fetch_seconds[page_url] = time.time() - started
+        else:
+            self.refresh_schedule.record_failure(page_url, time.time() - started)
+        return True
+    
+    def save_html(self, page_source):
+        """Save fetched HTML for debugging and for parse workers; returns its path"""
+        # Microseconds keep back-to-back fetches apart
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        html_folder = os.path.join(self.base_dir, 'scraped_data')
+        os.makedirs(html_folder, exist_ok=True)
+        html_filename = os.path.join(html_folder, f'interview_page_{timestamp}.html')
+        with open(html_filename, 'w', encoding='utf-8') as f:
+            f.write(page_source)
+        self.logger.info(f"HTML saved to {html_filename}")
+        return html_filename
+    
+    def record_page(self, page_data):
+        """Keep a parsed page and write it through to the checkpoint log"""
+        self.logger.info(f"Successfully extracted {page_data['total_interviews']} interview experiences")
+        self.apply_entity(page_data)
+        self.checkpoint.append(page_data)
+        self.metrics.record_page(page_data)
+        if page_data['url'] in self.fetch_seconds:
+            self.refresh_schedule.record_fetch(page_data['url'], page_data, self.fetch_seconds.pop(page_data['url']))
+        
+        if self.bounded_memory:
+            # The full record is on disk now; keep only its summary
+            page_data = self.summarize_page(page_data)
+            self.memory.sample()
+            self.logger.info(f"Memory: {self.memory.format_report()}")
+        
+        self.keep_page(page_data)
+        return page_data
     
     def scrape_interview_page(self, url):
         """Scrape interview page with Cloudflare bypass"""
         self.logger.info(f"Starting to scrape interview page: {url}")
         
+        # Pages replayed from a checkpoint don't need another browser fetch
+        existing_page = self.get_scraped_page(url)
+        if existing_page:
+            self.logger.info(f"Page already in checkpoint, skipping fetch: {url}")
+            return existing_page
+        
         try:
-            # Navigate to the page
-            self.logger.info("Navigating to page...")
-            self.driver.get(url)
-            
-            # Wait for page to load
-            if not self.wait_for_page_load():
-                self.logger.error("Page failed to load properly")
+            page_data = self.fetch_page_data(url)
+            if not page_data:
                 return None
-            
-            # Get page source
-            page_source = self.driver.page_source
-            self.logger.info(f"Page source length: {len(page_source)} characters")
-            
-            # Save HTML for debugging
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            html_filename = os.path.join(self.base_dir, 'scraped_data', f'interview_page_{timestamp}.html')
-            with open(html_filename, 'w', encoding='utf-8') as f:
-                f.write(page_source)
-            self.logger.info(f"HTML saved to {html_filename}")
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract company and position
-            company, position = self.extract_company_and_position(url, soup)
-            
-            # Extract page metadata
-            page_data = {
-                'url': url,
-                'scraped_at': datetime.now().isoformat(),
-                'title': '',
-                'company': company,
-                'position': position,
-                'total_interviews': 0,
-                'interview_experiences': []
-            }
-            
-            # Extract title
-            title_element = soup.find('title')
-            if title_element:
-                page_data['title'] = title_element.get_text(strip=True)
-                self.logger.info(f"Page title: {page_data['title']}")
-            
-            # Extract interview experiences
-            experiences = self.extract_interview_experiences(soup)
-            page_data['interview_experiences'] = experiences
-            page_data['total_interviews'] = len(experiences)
-            
-            self.logger.info(f"Successfully extracted {len(experiences)} interview experiences")
-            
-            self.scraped_data.append(page_data)
-            return page_data
+            return self.record_page(page_data)
             
         except Exception as e:
             self.logger.error(f"Error scraping interview page: {e}")
             return None
     
-    def save_to_json(self, filename=None):
-        """Save scraped data to JSON file in company-specific folder"""
-        try:
-            # Get company name from scraped data
-            company = "Unknown"
-            if self.scraped_data and len(self.scraped_data) > 0:
-                company = self.scraped_data[0].get('company', 'Unknown')
-            
-            # Create company-specific folder
-            company_folder = os.path.join(self.base_dir, 'scraped_data', company)
-            os.makedirs(company_folder, exist_ok=True)
-            
-            if not filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f'interview_data_{timestamp}.json'
+    def scrape_urls(self, urls, parse_workers=None):
+        """Scrape several pages, handing parsing to worker processes while the browser moves on"""
+        # DOM extraction leaves nothing worth a worker process to parse
+        if not parse_workers or self.extraction_mode == 'dom':
+            results = []
+            for url in urls:
+                if not self.memory.within_limit():
+                    self.logger.error(f"Stopping crawl: {self.memory.format_report()}; progress is in the checkpoint")
+                    break
+                results.append(self.scrape_interview_page(url))
+            return results + [None] * (len(urls) - len(results))
+        
+        results = {}
+        pending = {}
+        
+        def collect(future_url, future):
+            try:
+                results[future_url] = self.record_page(future.result())
+            except Exception as e:
+                self.logger.error(f"Error parsing {future_url}: {e}")
+                results[future_url] = None
+        
+        with ParseWorkerPool(parse_workers) as pool:
+            for url in urls:
+                if not self.memory.within_limit():
+                    self.logger.error(f"Stopping crawl: {self.memory.format_report()}; progress is in the checkpoint")
+                    break
+                
+                existing_page = self.get_scraped_page(url)
+                if existing_page:
+                    results[url] = existing_page
+                    continue
+                
+                try:
+                    fetched = self.fetch_page_source(url)
+                except Exception as e:
+                    self.logger.error(f"Error fetching {url}: {e}")
+                    fetched = None
+                
+                if not fetched:
+                    results[url] = None
+                    continue
+                
+                # Workers read the saved HTML so the page source isn't pickled across processes
+                page_source, html_filename = fetched
+                pending[url] = pool.submit_file(url, html_filename, datetime.now().isoformat())
+                
+                # Write finished pages through as soon as they are ready
+                for done_url in [u for u, f in pending.items() if f.done()]:
+                    collect(done_url, pending.pop(done_url))
             
-            filepath = os.path.join(company_folder, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.scraped_data, f, indent=2, ensure_ascii=False)
-            self.logger.info(f"Data saved to {filepath}")
-            return filepath
+            for done_url, future in pending.items():
+                collect(done_url, future)
+        
+        return [results.get(url) for url in urls]
+    
+    def save_shards(self, filename=None):
+        """Save scraped data to one JSON file per company/position shard"""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f'interview_data_{timestamp}.json'
+        
+        # In bounded-memory mode full records are streamed back from the checkpoint
+        pages = self.scraped_data
+        if self.bounded_memory:
+            wanted_urls = set(page.get('url') for page in self.scraped_data)
+            pages = (page for page in self.checkpoint.iter_pages() if page.get('url') in wanted_urls)
+        
+        with get_timer().span('json_save'):
+            saved_files = save_pages_to_shards(pages, self.base_dir, filename, self.manifest)
+        for (company, position), filepath in saved_files.items():
+            self.logger.info(f"Data for {company}/{position} saved to {filepath}")
+        
+        self.update_question_index(saved_files.values())
+        return saved_files
+    
+    def update_question_index(self, json_files):
+        """Add new shards to the similar-question index once one has been built"""
+        index_dir = os.path.join(self.base_dir, 'scraped_data', 'question_index')
+        # Checked here so scrapes without an index never load NumPy
+        if not json_files or not os.path.exists(os.path.join(index_dir, 'index.json')):
+            return
+        try:
+            from question_index import update_question_index
+            with get_timer().span('question_index', cpu=True):
+                added = update_question_index(json_files, index_dir)
+            self.logger.info(f"Indexed {added} question(s) for similar-question search")
+        except Exception as e:
+            # The scrape is already saved; a later 'question_index.py build' picks these files up
+            self.logger.warning(f"Could not update the question index: {e}")
+    
+    def save_to_json(self, filename=None, page_data=None):
+        """Save scraped data to JSON files in company/position folders
+
+        Returns the file of page_data's shard; without page_data (or when it wasn't saved), the first one.
+        Resumed runs hold pages from several shards, so callers pass the page they just scraped.
+        """
+        try:
+            saved_files = self.save_shards(filename)
+            if not saved_files:
+                self.logger.warning("No scraped data to save")
+                return None
+            if page_data:
+                key = shard_key(page_data.get('company', 'Unknown'), page_data.get('position', 'Unknown'))
+                if key in saved_files:
+                    return saved_files[key]
+                self.logger.warning(f"No shard saved for {key[0]}/{key[1]}; returning the first one")
+            return next(iter(saved_files.values()))
         except Exception as e:
             self.logger.error(f"Error saving to JSON: {e}")
             return None
@@ -484,7 +642,7 @@ class UniversalInterviewScraper:
         self.logger.info("Processing JSON data and generating DOCX...")
         
         # Extract Q&A pairs
-        extractor = QuestionAnswerExtractor(json_file_path)
+        extractor = SmartQAExtractor(json_file_path, cache=get_qa_cache())
         qa_pairs = extractor.extract_questions_and_answers()
         
         if not qa_pairs:
@@ -495,27 +653,71 @@ class UniversalInterviewScraper:
         company = qa_pairs[0].get('company', 'Unknown')
         position = qa_pairs[0].get('position', 'Unknown')
         
-        # Generate DOCX in company-specific folder
-        company_folder = os.path.join(self.base_dir, 'scraped_data', company)
-        docx_path = generate_docx_from_qa(qa_pairs, company, position, company_folder)
+        # Generate DOCX next to its JSON in the company/position folder
+        from docx_generator import generate_docx_from_qa
+        output_folder = shard_dir(self.base_dir, company, position)
+        docx_path = generate_docx_from_qa(qa_pairs, company, position, output_folder)
+        self.manifest.record_artifact('docx', docx_path, company, position, row_count=len(qa_pairs))
         
         self.logger.info(f"DOCX file generated: {docx_path}")
         return docx_path
     
     def close(self):
-        """Close the driver"""
-        if self.driver:
+        """Close the driver and persist what the rate limiter learned"""
+        self.rate_limiter.save()
+        if self.tiered_fetcher:
+            self.logger.info(f"Fetch tiers: {self.tiered_fetcher.stats}")
+            self.tiered_fetcher.close()
+            self.tiered_fetcher = None
+        if self.bounded_memory:
+            self.memory.sample()
+            self.logger.info(f"Final memory: {self.memory.format_report()}")
+        self.quit_driver()
+    
+    def quit_driver(self):
+        """Quit Chrome if it is running; a crashed driver may fail to quit cleanly"""
+        if not self.driver:
+            return
+        try:
             self.driver.quit()
-            self.logger.info("Chrome driver closed")
+        except Exception as e:
+            self.logger.warning(f"Error quitting Chrome driver: {e}")
+        self.driver = None
+        self.metrics.browsers.dec()
+        self.logger.info("Chrome driver closed")
 
 def main():
     parser = argparse.ArgumentParser(description='Universal Interview Scraper for Glassdoor')
-    parser.add_argument('url', help='Glassdoor interview URL to scrape')
+    parser.add_argument('urls', nargs='+', help='Glassdoor interview URL(s) to scrape')
     parser.add_argument('--output', '-o', help='Output filename prefix (optional)')
+    parser.add_argument('--resume', help='Checkpoint log to resume from (optional)')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Parse pages in this many worker processes while the browser keeps fetching')
+    parser.add_argument('--bounded-memory', action='store_true',
+                        help='Keep only page summaries in memory and stream full records from the checkpoint')
+    parser.add_argument('--max-memory-mb', type=float,
+                        help='Stop crawling once resident memory exceeds this ceiling (implies --bounded-memory)')
+    parser.add_argument('--base-url', help='Fetch pages from this origin instead, e.g. a local mock server '
+                                           '(default: $GLASSDOOR_BASE_URL)')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this local port')
+    parser.add_argument('--http-first', action='store_true',
+                        help='Fetch over plain HTTP and start Chrome only for challenged or incomplete pages')
+    parser.add_argument('--extraction-mode', choices=['html', 'dom'], default='html',
+                        help="'dom' reads reviews with one in-page script instead of parsing the page source")
     
     args = parser.parse_args()
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
     
-    scraper = UniversalInterviewScraper()
+    # Every stage span is written as a JSON line and summarized at the end
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timer = set_timer(StageTimer(os.path.join('logs', f'timings_{timestamp}.jsonl')))
+    
+    scraper = UniversalInterviewScraper(checkpoint_path=args.resume, bounded_memory=args.bounded_memory,
+                                        memory_limit_mb=args.max_memory_mb, base_url=args.base_url,
+                                        http_first=args.http_first, extraction_mode=args.extraction_mode)
+    if args.resume:
+        scraper.resume_from_checkpoint()
     
     try:
         # Setup driver
@@ -523,32 +725,34 @@ def main():
             print("Failed to setup Chrome driver")
             return
         
-        # Scrape the interview page
-        print(f"\nScraping interview page: {args.url}")
-        data = scraper.scrape_interview_page(args.url)
+        # Scrape the interview pages
+        print(f"\nScraping {len(args.urls)} interview page(s)")
+        pages = scraper.scrape_urls(args.urls, parse_workers=args.parse_workers)
         
-        if data:
-            print(f"Successfully scraped {data['total_interviews']} interview experiences")
-            print(f"Company: {data['company']}")
-            print(f"Position: {data['position']}")
-            
-            # Save to JSON
-            json_file = scraper.save_to_json()
+        for url, data in zip(args.urls, pages):
+            if data:
+                print(f"Successfully scraped {data['total_interviews']} interview experiences from {url}")
+                print(f"Company: {data['company']}")
+                print(f"Position: {data['position']}")
+            else:
+                print(f"Failed to scrape interview page: {url}")
+        
+        if not any(pages):
+            return
+        
+        # Save to JSON, one file per company/position
+        json_files = scraper.save_shards()
+        
+        for json_file in json_files.values():
+            # Process and generate DOCX
+            docx_file = scraper.process_and_generate_docx(json_file)
             
-            if json_file:
-                # Process and generate DOCX
-                docx_file = scraper.process_and_generate_docx(json_file)
-                
-                if docx_file:
-                    print(f"\nScraping completed successfully!")
-                    print(f"JSON file: {json_file}")
-                    print(f"DOCX file: {docx_file}")
-                else:
-                    print("Failed to generate DOCX file")
+            if docx_file:
+                print(f"\nScraping completed successfully!")
+                print(f"JSON file: {json_file}")
+                print(f"DOCX file: {docx_file}")
             else:
-                print("Failed to save JSON file")
-        else:
-            print("Failed to scrape interview page")
+                print("Failed to generate DOCX file")
             
     except Exception as e:
         print(f"Error occurred during scraping: {str(e)}")
@@ -556,6 +760,9 @@ def main():
     
     finally:
         scraper.close()
+        print(f"\nStage timings (spans in {timer.output_path}):")
+        print(timer.format_summary())
+        timer.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Canonical Glassdoor interview URLs and a deduplicating URL frontier
+Usage:
+  python url_canonicalizer.py canonicalize <url> [<url> ...]
+  python url_canonicalizer.py dedupe urls.txt [--frontier scraped_data/frontier.sqlite3]
+
+Locale domains (glassdoor.co.uk, glassdoor.de, ...), tracking and sort/filter query strings
+and fragments all name the same interview page. canonicalize_url() maps every variant to one
+https://www.glassdoor.com URL, and canonical_key() to the page's dedupe key (entity_registry's
+page_key). Result pages (_IPn, or _Pn on landing pages) hold different reviews, so the page
+number is kept and page 2+ stay distinct from page 1 everywhere: fetches, queue and cache keys. UrlFrontier answers "seen before?" from a Bloom filter for new
+URLs and only consults its exact set (in memory or SQLite) when the filter says maybe.
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import atexit
+import sqlite3
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlsplit, unquote
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_registry import POSITION_URL_PATTERN, COMPANY_URL_PATTERN, page_key
+
+CANONICAL_ORIGIN = 'https://www.glassdoor.com'
+
+# glassdoor.com, glassdoor.co.uk, glassdoor.com.au, glassdoor.de, ... with any subdomain
+GLASSDOOR_HOST_PATTERN = re.compile(r'(^|\.)glassdoor\.(com|co\.[a-z]{2}|com\.[a-z]{2}|[a-z]{2})$')
+
+def canonicalize_url(url):
+    """Canonical URL of a Glassdoor interview page (keeping its page number), or None if url isn't one"""
+    url = (url or '').strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = 'https://' + url
+
+    parts = urlsplit(url)
+    if not GLASSDOOR_HOST_PATTERN.search((parts.hostname or '').lower()):
+        return None
+
+    # Query strings and fragments only carry tracking, sorting and filters
+    path = unquote(parts.path)
+    match = POSITION_URL_PATTERN.search(path)
+    if match:
+        position = ''
+        if match.group('position_start'):
+            position = f"_KO{match.group('position_start')},{match.group('position_end')}"
+        return (f"{CANONICAL_ORIGIN}/Interview/{match.group('slug')}-Interview-Questions-EI_IE"
+                f"{match.group('employer_id')}.{match.group('company_start')},{match.group('company_end')}"
+                f"{position}{page_suffix('_IP', match.group('page'))}.htm")
+
+    match = COMPANY_URL_PATTERN.search(path)
+    if match:
+        return (f"{CANONICAL_ORIGIN}/Interview/{match.group('slug')}-Interview-Questions-E{match.group('employer_id')}"
+                f"{page_suffix('_P', match.group('page'))}.htm")
+    return None
+
+def page_suffix(prefix, page):
+    """'_IP2' for page 2 and later; page 1 is the bare URL"""
+    return f'{prefix}{int(page)}' if page and int(page) > 1 else ''
+
+def canonical_key(url):
+    """Key every variant of an interview page shares (e.g. '43129/software engineer', '...#p2'), or None"""
+    canonical = canonicalize_url(url)
+    return page_key(canonical) if canonical else None
+
+def is_glassdoor_interview_url(url):
+    return canonicalize_url(url) is not None
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+class UrlFrontier:
+    """Set of canonical page keys already submitted or discovered
+
+    With a path, the exact set is a SQLite table shared across runs and the Bloom filter is
+    rebuilt from it on open; without one, both live in memory for a single run. New keys are
+    committed in batches of commit_every (and on flush() or exit). Safe to share between threads.
+    """
+
+    def __init__(self, path=None, capacity=1000000, error_rate=0.001, commit_every=500):
+        self.path = path
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.exact = None if path else set()
+        self.commit_every = commit_every
+        self.uncommitted = 0
+        self.connection = None
+        self.lock = threading.RLock()
+        self.stats = {'added': 0, 'duplicates': 0, 'invalid': 0, 'bloom_misses': 0, 'false_positives': 0}
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            with self.connection:
+                self.connection.execute("""
+                    CREATE TABLE IF NOT EXISTS seen (
+                        key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        added_at REAL NOT NULL
+                    )
+                """)
+            for (key,) in self.connection.execute("SELECT key FROM seen"):
+                self.bloom.add(key)
+            atexit.register(self.flush)
+
+    def in_exact_set(self, key):
+        if self.exact is not None:
+            return key in self.exact
+        return self.connection.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def add_exact(self, key, url):
+        """Record a key; False if another process recorded it first"""
+        if self.exact is not None:
+            self.exact.add(key)
+            return True
+        cursor = self.connection.execute("INSERT OR IGNORE INTO seen (key, url, added_at) VALUES (?, ?, ?)",
+                                         (key, url, time.time()))
+        self.uncommitted += 1
+        if self.uncommitted >= self.commit_every:
+            self.flush()
+        return cursor.rowcount == 1
+
+    def flush(self):
+        with self.lock:
+            if self.connection is not None and self.uncommitted:
+                self.connection.commit()
+                self.uncommitted = 0
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.flush()
+                self.connection.close()
+                self.connection = None
+
+    def add(self, url):
+        """Canonical URL if this page is new to the frontier, None if seen before or not an interview URL"""
+        canonical = canonicalize_url(url)
+        key = canonical_key(canonical) if canonical else None
+        with self.lock:
+            if not key:
+                self.stats['invalid'] += 1
+                return None
+            return self.add_key(key, canonical)
+
+    def add_key(self, key, canonical):
+        if key in self.bloom:
+            if self.in_exact_set(key):
+                self.stats['duplicates'] += 1
+                return None
+            self.stats['false_positives'] += 1
+        else:
+            # A Bloom miss is a guaranteed first sighting in this process
+            self.stats['bloom_misses'] += 1
+
+        self.bloom.add(key)
+        if not self.add_exact(key, canonical):
+            self.stats['duplicates'] += 1
+            return None
+        self.stats['added'] += 1
+        return canonical
+
+    def filter(self, urls):
+        """Yield the canonical URL of each page not seen before, in order"""
+        for url in urls:
+            canonical = self.add(url)
+            if canonical:
+                yield canonical
+
+    def __contains__(self, url):
+        key = canonical_key(url)
+        if key is None:
+            return False
+        with self.lock:
+            return key in self.bloom and self.in_exact_set(key)
+
+def main():
+    parser = argparse.ArgumentParser(description='Canonicalize and deduplicate Glassdoor interview URLs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    canonicalize_parser = subparsers.add_parser('canonicalize', help='Print the canonical URL and key of each URL')
+    canonicalize_parser.add_argument('urls', nargs='+')
+
+    dedupe_parser = subparsers.add_parser('dedupe', help='Print the new canonical URLs from a file, one per line')
+    dedupe_parser.add_argument('file')
+    dedupe_parser.add_argument('--frontier', help='Remember URLs across runs in this SQLite file')
+
+    args = parser.parse_args()
+
+    if args.command == 'canonicalize':
+        for url in args.urls:
+            canonical = canonicalize_url(url)
+            print(f"{canonical_key(url)}\t{canonical}" if canonical else f"❌ Not a Glassdoor interview URL: {url}")
+
+    elif args.command == 'dedupe':
+        frontier = UrlFrontier(args.frontier)
+        with open(args.file, 'r', encoding='utf-8') as f:
+            for canonical in frontier.filter(line.strip() for line in f if line.strip()):
+                print(canonical)
+        frontier.close()
+        stats = frontier.stats
+        print(f"🧹 {stats['added']} new, {stats['duplicates']} duplicate(s), {stats['invalid']} invalid",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -6,32 +6,18 @@ Usage: python interactive_scraper.py
 
 import sys
 import os
-import re
 from datetime import datetime
 
 # Add code directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'code'))
 
 from scrape_any_link import scrape_and_generate_docx
+from driver_startup import BrowserPrewarmer
+from url_canonicalizer import UrlFrontier, canonicalize_url, is_glassdoor_interview_url
 
 def validate_glassdoor_url(url):
-    """Validate if the URL is a Glassdoor interview URL"""
-    if not url:
-        return False
-    
-    # Check if it's a Glassdoor URL
-    if 'glassdoor.com' not in url.lower():
-        return False
-    
-    # Check if it's an interview URL
-    if 'interview' not in url.lower():
-        return False
-    
-    # Check if it has the proper format
-    if not re.search(r'Interview.*Questions.*EI_IE\d+', url):
-        return False
-    
-    return True
+    """Validate if the URL is a Glassdoor interview URL (any locale domain, query string or page)"""
+    return is_glassdoor_interview_url(url)
 
 def get_user_input():
     """Get URL input from user with validation"""
@@ -80,6 +66,11 @@ def show_examples():
 
 def main():
     """Main interactive function"""
+    # Start Chrome in the background while the user is still picking a URL
+    prewarmer = BrowserPrewarmer().start()
+    # Pages scraped successfully this session, under any URL variant
+    frontier = UrlFrontier()
+    
     try:
         while True:
             print("\n" + "="*60)
@@ -92,15 +83,23 @@ def main():
             choice = input("Enter your choice (1-3): ").strip()
             
             if choice == '1':
-                url = get_user_input()
+                url = canonicalize_url(get_user_input())
+                if url in frontier:
+                    print("ℹ️  That page was already scraped in this session; its files are in 'scraped_data'.")
+                    continue
                 
                 print(f"\n🚀 Starting scrape for: {url}")
                 print("⏳ This may take a few minutes...")
                 print()
                 
-                result = scrape_and_generate_docx(url)
+                result = scrape_and_generate_docx(url, scraper=prewarmer.take())
+                
+                # Warm the next browser while the user reads the results
+                prewarmer = BrowserPrewarmer().start()
                 
                 if result:
+                    # Only a finished page counts as scraped, so a failed one can be retried
+                    frontier.add(url)
                     print(f"\n✅ Success! Files generated:")
                     print(f"   📄 DOCX: {result['docx_file']}")
                     print(f"   📊 JSON: {result['json_file']}")
@@ -133,6 +132,8 @@ def main():
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
         print("Please try again or check the logs for more details.")
+    finally:
+        prewarmer.close()
 
 if __name__ == "__main__":
     main()
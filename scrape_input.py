@@ -6,31 +6,17 @@ Usage: python scrape_input.py
 
 import sys
 import os
-import re
 
 # Add code directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'code'))
 
 from scrape_any_link import scrape_and_generate_docx
+from driver_startup import BrowserPrewarmer
+from url_canonicalizer import canonicalize_url, is_glassdoor_interview_url
 
 def validate_glassdoor_url(url):
-    """Validate if the URL is a Glassdoor interview URL"""
-    if not url:
-        return False
-    
-    # Check if it's a Glassdoor URL
-    if 'glassdoor.com' not in url.lower():
-        return False
-    
-    # Check if it's an interview URL
-    if 'interview' not in url.lower():
-        return False
-    
-    # Check if it has the proper format
-    if not re.search(r'Interview.*Questions.*EI_IE\d+', url):
-        return False
-    
-    return True
+    """Validate if the URL is a Glassdoor interview URL (any locale domain, query string or page)"""
+    return is_glassdoor_interview_url(url)
 
 def main():
     """Main function"""
@@ -41,26 +27,33 @@ def main():
     print("   Example: https://www.glassdoor.com/Interview/Tesla-Software-Engineer-Interview-Questions-EI_IE43129.0,5_KO6,23.htm")
     print()
     
+    # Start Chrome in the background while the user types
+    prewarmer = BrowserPrewarmer().start()
+    
     # Get URL from user
     url = input("🔗 URL: ").strip()
     
     if not url:
         print("❌ No URL provided. Exiting.")
+        prewarmer.close()
         sys.exit(1)
     
     # Validate URL
     if not validate_glassdoor_url(url):
+        prewarmer.close()
         print("❌ Invalid Glassdoor interview URL.")
         print("   Make sure it's a Glassdoor interview page URL")
         print("   Example: https://www.glassdoor.com/Interview/Company-Position-Interview-Questions-EI_IE12345.0,5_KO6,23.htm")
         sys.exit(1)
     
+    # Tracking parameters and locale domains map to the same page
+    url = canonicalize_url(url)
     print(f"\n🚀 Starting scrape for: {url}")
     print("⏳ This may take a few minutes...")
     print()
     
     # Scrape the URL
-    result = scrape_and_generate_docx(url)
+    result = scrape_and_generate_docx(url, scraper=prewarmer.take())
     
     if result:
         print(f"\n✅ Success! Files generated:")